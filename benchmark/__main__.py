@@ -0,0 +1,164 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from argparse import Namespace
+
+from .baseline import (
+    DEFAULT_THRESHOLD,
+    Baseline,
+    BaselineException,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+from .generators import KB, MB
+from .suite import QUICK_CONFIG, BenchmarkConfig, run_suite
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+_SIZE = re.compile(r"(?P<value>\d+)(?P<unit>[KkMm]?)[Bb]?")
+
+
+def parse_size(value: str) -> int:
+    match = _SIZE.fullmatch(value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}'")
+    factor = {"": 1, "k": KB, "m": MB}[match.group("unit").lower()]
+    return int(match.group("value")) * factor
+
+
+def parse_args(argv: list[str] | None = None) -> Namespace:
+    parser = argparse.ArgumentParser(
+        prog="benchmark", description="Runs the release-tool benchmarks"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Use small repositories and files"
+    )
+    parser.add_argument("--files", type=int, help="Number of files in the repository")
+    parser.add_argument("--commits", type=int, help="Number of commits")
+    parser.add_argument("--tags", type=int, help="Number of release tags")
+    parser.add_argument(
+        "--cmake-sizes",
+        type=parse_size,
+        nargs="+",
+        help="CMakeLists.txt sizes, e.g. 1K 10M",
+    )
+    parser.add_argument("--repeat", type=int, help="Runs per benchmark (best is used)")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=DEFAULT_BASELINE,
+        help="Baseline file (default: benchmark/baselines.json)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Allowed slowdown factor compared to the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def create_config(args: Namespace) -> BenchmarkConfig:
+    config = QUICK_CONFIG if args.quick else BenchmarkConfig()
+    overrides = {
+        "files": args.files,
+        "commits": args.commits,
+        "tags": args.tags,
+        "cmake_sizes": tuple(args.cmake_sizes) if args.cmake_sizes else None,
+        "repeat": args.repeat,
+    }
+    return config._replace(
+        **{name: value for name, value in overrides.items() if value is not None}
+    )
+
+
+def config_data(config: BenchmarkConfig) -> dict:
+    return {**config._asdict(), "cmake_sizes": list(config.cmake_sizes)}
+
+
+def format_results(results: dict[str, float], baseline: Baseline | None) -> str:
+    lines = [f"{'benchmark':<45} {'time (ms)':>12} {'baseline':>12} {'ratio':>7}"]
+    for name, seconds in results.items():
+        expected = baseline.results.get(name) if baseline else None
+        if expected:
+            lines.append(
+                f"{name:<45} {seconds * 1000:>12.3f} {expected * 1000:>12.3f} "
+                f"{seconds / expected:>7.2f}"
+            )
+        else:
+            lines.append(f"{name:<45} {seconds * 1000:>12.3f} {'-':>12} {'-':>7}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    args = parse_args()
+    config = create_config(args)
+
+    try:
+        baseline = load_baseline(args.baseline)
+        if (
+            baseline
+            and baseline.config != config_data(config)
+            and not args.save_baseline
+        ):
+            raise BaselineException(
+                f"'{args.baseline}' was recorded with a different configuration"
+            )
+
+        with tempfile.TemporaryDirectory(prefix="release-tool-benchmark") as workdir:
+            results = run_suite(config, workdir)
+    except BaselineException as ex:
+        print(f"ERROR: {ex}")
+        sys.exit(1)
+
+    if args.save_baseline:
+        default = baseline.threshold if baseline else DEFAULT_THRESHOLD
+        thresholds = baseline.thresholds if baseline else {}
+        save_baseline(
+            args.baseline,
+            Baseline(
+                config_data(config), results, thresholds, args.threshold or default
+            ),
+        )
+        print(format_results(results, None))
+        return
+
+    print(format_results(results, baseline))
+    regressions = (
+        find_regressions(results, baseline, args.threshold) if baseline else []
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION: {regression.name} took {regression.ratio:.2f}x the "
+            f"baseline (threshold {regression.threshold:.2f}x)"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
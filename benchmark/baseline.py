@@ -0,0 +1,80 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from typing import NamedTuple
+
+DEFAULT_THRESHOLD = 1.5
+MIN_DIFFERENCE = 0.001
+
+
+class BaselineException(Exception):
+    pass
+
+
+class Baseline(NamedTuple):
+    config: dict
+    results: dict[str, float]
+    thresholds: dict[str, float]
+    threshold: float = DEFAULT_THRESHOLD
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline: float
+    result: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.result / self.baseline
+
+
+def load_baseline(filename: str) -> Baseline | None:
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError as ex:
+        raise BaselineException(f"Invalid baseline file '{filename}'") from ex
+    return Baseline(
+        data.get("config", {}),
+        data.get("results", {}),
+        data.get("thresholds", {}),
+        data.get("threshold", DEFAULT_THRESHOLD),
+    )
+
+
+def save_baseline(filename: str, baseline: Baseline) -> None:
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(baseline._asdict(), file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(
+    results: dict[str, float], baseline: Baseline, threshold: float | None = None
+) -> list[Regression]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.results.get(name)
+        if expected is None:
+            continue
+        limit = baseline.thresholds.get(name, threshold or baseline.threshold)
+        if result > expected * limit and result - expected > MIN_DIFFERENCE:
+            regressions.append(Regression(name, expected, result, limit))
+    return regressions
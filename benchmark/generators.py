@@ -0,0 +1,120 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import subprocess
+
+KB = 1024
+MB = 1024 * KB
+
+_HEADER = "cmake_minimum_required(VERSION 3.14)\n\n"
+_PROJECT = "project({name} VERSION {version} LANGUAGES CXX)\n"
+_TARGET = """
+# Target {index}
+option(ENABLE_TARGET_{index} "Build target {index}" ON)
+set(TARGET_{index}_SOURCES
+    src/target_{index}/main.cpp
+    src/target_{index}/util.cpp
+    "src/target_{index}/with space.cpp"
+    )
+if (ENABLE_TARGET_{index})
+    add_library(target_{index} ${{TARGET_{index}_SOURCES}})
+    target_compile_options(target_{index} PRIVATE -Wall -Wextra [=[-DNAME="x(y)"]=])
+endif()
+"""
+
+
+def generate_cmake_content(
+    size: int, version: str = "1.0.0", name: str = "Bench"
+) -> str:
+    # The targets are placed in front of project() so the whole file is tokenized
+    parts = [_HEADER]
+    length = len(_HEADER) + len(_PROJECT.format(name=name, version=version))
+    index = 0
+    while length < size:
+        target = _TARGET.format(index=index)
+        parts.append(target)
+        length += len(target)
+        index += 1
+    parts.append("\n" + _PROJECT.format(name=name, version=version))
+    return "".join(parts)
+
+
+def create_repository(
+    path: str,
+    files: int,
+    commits: int,
+    tags: int,
+    *,
+    cmake_size: int = KB,
+) -> None:
+    subprocess.run(["git", "init", "-q", "-b", "master", path], check=True)
+    for key, value in (("user.name", "Benchmark"), ("user.email", "bench@example.com")):
+        subprocess.run(["git", "-C", path, "config", key, value], check=True)
+
+    stream = _fast_import_stream(files, commits, tags, cmake_size)
+    subprocess.run(
+        ["git", "-C", path, "fast-import", "--quiet"], input=stream, check=True
+    )
+    subprocess.run(["git", "-C", path, "checkout", "-q", "-f", "master"], check=True)
+
+
+def _fast_import_stream(files: int, commits: int, tags: int, cmake_size: int) -> bytes:
+    commands = []
+    tag_interval = max(commits // tags, 1) if tags else 0
+    for mark in range(1, max(commits, 1) + 1):
+        changes = []
+        if mark == 1:
+            changes.append(("CMakeLists.txt", generate_cmake_content(cmake_size)))
+            changes += [(_file_name(i), f"file {i}\n") for i in range(files)]
+        elif files:
+            index = mark % files
+            changes.append((_file_name(index), f"file {index} revision {mark}\n"))
+        commands.append(_commit(mark, _commit_message(mark), changes))
+
+        if tag_interval and mark % tag_interval == 0 and mark // tag_interval <= tags:
+            commands.append(
+                f"reset refs/tags/v0.{mark // tag_interval}.0\nfrom :{mark}\n\n".encode()
+            )
+    return b"".join(commands)
+
+
+def _commit(mark: int, message: str, changes: list[tuple[str, str]]) -> bytes:
+    data = message.encode()
+    lines = [
+        b"commit refs/heads/master\n",
+        f"mark :{mark}\n".encode(),
+        f"committer Benchmark <bench@example.com> {1_600_000_000 + mark} +0000\n".encode(),
+        f"data {len(data)}\n".encode() + data + b"\n",
+    ]
+    if mark > 1:
+        lines.append(f"from :{mark - 1}\n".encode())
+    for filename, content in changes:
+        blob = content.encode()
+        lines.append(
+            f"M 100644 inline {filename}\ndata {len(blob)}\n".encode() + blob + b"\n"
+        )
+    lines.append(b"\n")
+    return b"".join(lines)
+
+
+def _commit_message(mark: int) -> str:
+    kinds = ("feat", "fix", "docs", "refactor", "chore")
+    return f"{kinds[mark % len(kinds)]}(bench): change {mark}\n"
+
+
+def _file_name(index: int) -> str:
+    return f"src/dir_{index % 100}/file_{index}.txt"
@@ -0,0 +1,144 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import math
+import os
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from release_tool.cmake import CMakeProject
+from release_tool.profiling import Profiler
+from release_tool.release_cycle import (
+    ChangelogStep,
+    CommitAndTagStep,
+    PreconditionStep,
+    ReleaseCycle,
+    SetNextVersion,
+    TagPreconditionStep,
+    UpdateVersionStep,
+)
+from release_tool.tags import tag_name
+
+from .generators import KB, MB, create_repository, generate_cmake_content
+
+RELEASE_VERSION = "2.0.0"
+NEXT_VERSION = "2.1.0"
+
+
+class BenchmarkConfig(NamedTuple):
+    files: int = 1000
+    commits: int = 500
+    tags: int = 50
+    cmake_sizes: tuple[int, ...] = (KB, 100 * KB, MB, 10 * MB)
+    repeat: int = 5
+
+
+QUICK_CONFIG = BenchmarkConfig(
+    files=50, commits=20, tags=5, cmake_sizes=(KB, 100 * KB), repeat=3
+)
+
+
+def format_size(size: int) -> str:
+    for unit, factor in (("MB", MB), ("KB", KB)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(config: BenchmarkConfig, workdir: str) -> dict[str, float]:
+    results = {}
+    for size in config.cmake_sizes:
+        results.update(_cmake_benchmarks(workdir, size, config.repeat))
+    results.update(_release_benchmarks(workdir, config))
+    return results
+
+
+def _cmake_benchmarks(workdir: str, size: int, repeat: int) -> dict[str, float]:
+    directory = os.path.join(workdir, f"cmake-{size}")
+    os.makedirs(directory)
+    with open(
+        os.path.join(directory, CMakeProject.PROJECT_CONFIG), "w", encoding="utf-8"
+    ) as file:
+        file.write(generate_cmake_content(size))
+
+    same_length = itertools.cycle(("1.0.1", "1.0.2"))
+    other_length = itertools.cycle(("1.0.10", "1.0.1"))
+    label = format_size(size)
+    return {
+        f"cmake.parse[{label}]": measure(
+            lambda: CMakeProject(directory).version, repeat
+        ),
+        f"cmake.set_new_version[{label}]": measure(
+            lambda: CMakeProject(directory).set_new_version(next(same_length)), repeat
+        ),
+        f"cmake.set_new_version_resize[{label}]": measure(
+            lambda: CMakeProject(directory).set_new_version(next(other_length)),
+            repeat,
+        ),
+    }
+
+
+def _release_benchmarks(workdir: str, config: BenchmarkConfig) -> dict[str, float]:
+    path = os.path.join(workdir, "repository")
+    create_repository(path, config.files, config.commits, config.tags)
+
+    results: dict[str, float] = {}
+    for _ in range(config.repeat):
+        profiler = Profiler()
+        cycle = ReleaseCycle.from_path(path, _release_steps(), profiler)
+        initial_head = cycle.repository.head.commit.hexsha
+        try:
+            start = time.perf_counter()
+            cycle.create_release(RELEASE_VERSION)
+            _keep_best(results, "release.full", time.perf_counter() - start)
+            for event in profiler.events:
+                if event.category == "step":
+                    _keep_best(results, f"release.step.{event.name}", event.duration)
+        finally:
+            repo = cycle.repository
+            repo.git.reset("--hard", initial_head)
+            if tag_name(RELEASE_VERSION) in repo.tags:
+                repo.delete_tag(tag_name(RELEASE_VERSION))
+            cycle.close()
+    return results
+
+
+def _release_steps() -> list:
+    changelog = ChangelogStep()
+    return [
+        PreconditionStep(),
+        TagPreconditionStep(),
+        UpdateVersionStep(),
+        changelog,
+        CommitAndTagStep(changelog=changelog),
+        SetNextVersion(NEXT_VERSION),
+    ]
+
+
+def _keep_best(results: dict[str, float], name: str, seconds: float) -> None:
+    results[name] = min(results.get(name, math.inf), seconds)
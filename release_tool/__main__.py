@@ -16,29 +16,48 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import argparse
+import functools
 import os
 import sys
 from argparse import Namespace
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, TextIO
 
-from release_tool.release_cycle import (
-    CommitAndTagStep,
-    PreconditionStep,
-    ReleaseCycle,
-    SetNextVersion,
-    Step,
-    UpdateVersionStep,
+from release_tool.batch import (
+    BatchRelease,
+    ReleaseJob,
+    ReleaseResult,
+    format_result,
+    format_summary,
+    parse_subproject,
+    read_manifest,
 )
+from release_tool.maintenance import (
+    BranchJob,
+    MaintenanceRelease,
+    parse_branch_job,
+)
+from release_tool.profiling import Profiler
 from release_tool.release_exception import ReleaseException
 from release_tool.version import __version__
+from release_tool.worktree import DirtyCheckScope
+
+if TYPE_CHECKING:
+    import git
+
+    from release_tool.release_cycle import Step
+
+# GitPython (via release_cycle) is imported only once a release actually runs,
+# so --help, --version and argument errors stay fast.
 
 
-def parse_args() -> Namespace:
+def parse_args(argv: list[str] | None = None, cwd: str | None = None) -> Namespace:
     parser = argparse.ArgumentParser(
         prog="release-tool", description="Performs releases"
     )
     required = parser.add_argument_group("arguments")
     required.add_argument(
-        "--release-version", "-r", type=str, required=True, help="Version to release"
+        "--release-version", "-r", type=str, help="Version to release"
     )
     parser.add_argument(
         "--version",
@@ -47,34 +66,441 @@ def parse_args() -> Namespace:
         version=f"%(prog)s {__version__}",
         help="Shows the program version",
     )
-    parser.add_argument("path", nargs="?", default=os.getcwd())
+    parser.add_argument("path", nargs="*", default=[cwd or os.getcwd()])
     parser.add_argument(
         "--message",
         "-m",
         type=str,
-        help="Commit and Tag message (use '$v' for version)",
+        help="Commit and Tag message (use '$v' for version, '$changelog' for the "
+        "changelog)",
     )
     parser.add_argument("--next-version", "-n", type=str, help="Set next version")
+    parser.add_argument(
+        "--changelog",
+        "-c",
+        type=str,
+        nargs="?",
+        const="CHANGELOG.md",
+        help="Add the commits since the previous release to a changelog file "
+        "(default: CHANGELOG.md, use '$changelog' in the message to include them)",
+    )
+    parser.add_argument(
+        "--changelog-ungrouped",
+        action="store_true",
+        help="Don't group changelog entries by conventional commit type",
+    )
+    parser.add_argument(
+        "--hooks",
+        type=str,
+        nargs="?",
+        const=".release-hooks.json",
+        metavar="FILE",
+        help="Run the commands of a JSON hooks file (relative to the project, "
+        "default: .release-hooks.json) before the release commit",
+    )
+    parser.add_argument(
+        "--hook-jobs",
+        type=int,
+        help="Number of hooks run in parallel (default: CPUs)",
+    )
+    parser.add_argument(
+        "--artifacts",
+        type=str,
+        nargs="?",
+        const="dist",
+        metavar="DIR",
+        help="Create source archives and checksums of the release tag in DIR "
+        "(relative to the project, default: dist)",
+    )
+    parser.add_argument(
+        "--artifact-format",
+        choices=("tar.gz", "tar.xz", "zip"),
+        action="append",
+        help="Archive format for --artifacts, can be given several times "
+        "(default: tar.gz, tar.xz and zip)",
+    )
+    parser.add_argument(
+        "--push",
+        type=str,
+        nargs="?",
+        action="append",
+        const="origin",
+        metavar="REMOTE",
+        help="Push the branch and release tag atomically to REMOTE (default: "
+        "origin), can be given for several remotes",
+    )
+    parser.add_argument(
+        "--version-files",
+        action="store_true",
+        help="Also update the version in vcpkg.json, conanfile.py, version.h(.in), "
+        "Doxyfile and sub-project CMakeLists.txt files",
+    )
+    parser.add_argument(
+        "--dirty-check",
+        choices=[scope.value for scope in DirtyCheckScope],
+        default=DirtyCheckScope.REPOSITORY.value,
+        help="Scope of the uncommitted changes check: the whole repository, "
+        "the project directory or only the files changed by the release",
+    )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--direct-commit",
+        action="store_true",
+        help="Build release commits from HEAD's tree instead of the index "
+        "(faster in large repositories)",
+    )
 
+    planning = parser.add_argument_group("release plan")
+    planning.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the file changes, commits, tags and ref updates of the release "
+        "without changing anything",
+    )
+    planning.add_argument(
+        "--atomic",
+        action="store_true",
+        help="Plan the release in memory and apply it at once: files are replaced "
+        "by renames and all refs are updated in one transaction",
+    )
+
+    journal = parser.add_argument_group("interrupted releases")
+    recovery = journal.add_mutually_exclusive_group()
+    recovery.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted release after its last completed step",
+    )
+    recovery.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Undo the commits and tags of an interrupted release",
+    )
+
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent in each step and git command",
+    )
+    profiling.add_argument(
+        "--trace-file", type=str, help="Write a Chrome trace-event JSON file"
+    )
+
+    batch = parser.add_argument_group("batch release")
+    batch.add_argument(
+        "--manifest",
+        "-f",
+        type=str,
+        help="File of '<path> <release-version> [<next-version>]' lines to release",
+    )
+    batch.add_argument(
+        "--jobs", "-j", type=int, help="Number of parallel releases (default: CPUs)"
+    )
+    batch.add_argument(
+        "--keep-going",
+        "-k",
+        action="store_true",
+        help="Continue releasing other projects after a failure",
+    )
+
+    maintenance = parser.add_argument_group("maintenance releases")
+    maintenance.add_argument(
+        "--branch",
+        "-b",
+        type=_branch_job,
+        action="append",
+        metavar="BRANCH=VERSION[,NEXT_VERSION]",
+        help="Release BRANCH in a temporary worktree, can be given several times "
+        "to release branches in parallel",
+    )
+
+    monorepo = parser.add_argument_group("monorepo releases")
+    monorepo.add_argument(
+        "--subproject",
+        "-s",
+        type=_subproject_job,
+        action="append",
+        metavar="DIR=VERSION",
+        help="Release the project in DIR (relative to path), can be given several "
+        "times to release subprojects in one commit tagged '<name>/v<version>'",
+    )
+
+    args = parser.parse_args(argv)
+    _check_args(parser, args)
+    if cwd:
+        args.path = [os.path.join(cwd, path) for path in args.path]
+        for name in ("manifest", "trace_file"):
+            if getattr(args, name):
+                setattr(args, name, os.path.join(cwd, getattr(args, name)))
+    return args
+
+
+def _check_args(parser: argparse.ArgumentParser, args: Namespace) -> None:
+    if args.branch:
+        _check_branch_args(parser, args)
+    elif args.subproject:
+        _check_subproject_args(parser, args)
+    elif not args.manifest and not args.release_version and not args.rollback:
+        parser.error("the following arguments are required: --release-version/-r")
+    if args.manifest and args.release_version:
+        parser.error("--manifest can't be combined with --release-version/-r")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.hook_jobs is not None and args.hook_jobs < 1:
+        parser.error("--hook-jobs must be at least 1")
+    if args.rollback and args.release_version:
+        parser.error("--rollback can't be combined with --release-version/-r")
+    if (args.resume or args.rollback) and (args.manifest or len(args.path) > 1):
+        parser.error("--resume and --rollback support single releases only")
+    if (args.profile or args.trace_file) and (args.manifest or len(args.path) > 1):
+        parser.error("--profile and --trace-file support single releases only")
+    single = not (args.branch or args.manifest or len(args.path) > 1)
+    if (args.dry_run or args.atomic) and (not single or args.resume or args.rollback):
+        parser.error("--dry-run and --atomic support new single releases only")
+    if args.atomic and args.hooks:
+        parser.error("--atomic can't run --hooks, the planned files aren't on disk")
+
+
+def _check_branch_args(parser: argparse.ArgumentParser, args: Namespace) -> None:
+    if args.release_version or args.manifest or len(args.path) > 1:
+        parser.error(
+            "--branch can't be combined with --release-version/-r, --manifest "
+            "or several paths"
+        )
+    if args.resume or args.rollback or args.profile or args.trace_file:
+        parser.error("--branch doesn't support --resume, --rollback or profiling")
 
-def main():
-    args = parse_args()
-    new_version = args.release_version
 
+def _check_subproject_args(parser: argparse.ArgumentParser, args: Namespace) -> None:
+    if args.release_version or args.manifest or len(args.path) > 1:
+        parser.error(
+            "--subproject can't be combined with --release-version/-r, --manifest "
+            "or several paths"
+        )
+    if args.next_version or args.changelog or args.hooks or args.version_files:
+        parser.error(
+            "--subproject doesn't support --next-version, --changelog, --hooks or "
+            "--version-files"
+        )
+    if args.push or args.resume or args.rollback or args.profile or args.trace_file:
+        parser.error(
+            "--subproject doesn't support --push, --resume, --rollback or profiling"
+        )
+    if args.artifacts:
+        parser.error("--subproject doesn't support --artifacts")
+
+
+def _subproject_job(value: str) -> ReleaseJob:
+    try:
+        return parse_subproject(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(str(ex)) from ex
+
+
+def _branch_job(value: str) -> BranchJob:
+    try:
+        return parse_branch_job(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(str(ex)) from ex
+
+
+def create_steps(args: Namespace, job: ReleaseJob) -> list["Step"]:
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.release_cycle import (
+        ChangelogStep,
+        CommitAndTagStep,
+        HookStep,
+        PreconditionStep,
+        SetNextVersion,
+        TagPreconditionStep,
+        UpdateVersionStep,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.version_files import VersionFiles
+
+    version_files = VersionFiles() if args.version_files else None
     steps: list[Step] = [
-        PreconditionStep(),
-        UpdateVersionStep(),
-        CommitAndTagStep(args.message),
+        PreconditionStep(DirtyCheckScope(args.dirty_check)),
+        TagPreconditionStep(),
+        UpdateVersionStep(version_files),
     ]
 
-    if args.next_version:
-        steps.append(SetNextVersion(args.next_version))
+    changelog = None
+    if args.changelog:
+        changelog = ChangelogStep(args.changelog, not args.changelog_ungrouped)
+        steps.append(changelog)
+    if args.hooks:
+        steps.append(HookStep(args.hooks, args.hook_jobs))
+    steps.append(
+        CommitAndTagStep(args.message, args.direct_commit, changelog, version_files)
+    )
+
+    if job.next_version:
+        steps.append(
+            SetNextVersion(job.next_version, args.direct_commit, version_files)
+        )
+    return steps + _publish_steps(args)
+
+
+def _publish_steps(args: Namespace) -> list["Step"]:
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.artifacts import ARCHIVE_FORMATS
+
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.release_cycle import ArtifactStep, PushStep
+
+    steps: list[Step] = []
+    if args.artifacts:
+        formats = tuple(args.artifact_format or ARCHIVE_FORMATS)
+        steps.append(ArtifactStep(args.artifacts, formats))
+    return steps + [PushStep(remote) for remote in args.push or []]
+
+
+def release_batch(args: Namespace, jobs: list[ReleaseJob]) -> None:
+    batch = BatchRelease(
+        functools.partial(create_steps, args), args.jobs, args.keep_going
+    )
+    report_results(batch.run(jobs))
+
+
+def release_branches(args: Namespace) -> None:
+    release = MaintenanceRelease(
+        args.path[0], functools.partial(create_steps, args), args.jobs, args.keep_going
+    )
+    report_results(release.run(args.branch))
+
+
+def release_subprojects(
+    args: Namespace, repo: "git.Repo | None" = None, out: TextIO | None = None
+) -> None:
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.monorepo import MonorepoRelease
+
+    with MonorepoRelease(
+        args.path[0],
+        args.subproject,
+        args.message,
+        DirtyCheckScope(args.dirty_check),
+        repo,
+    ) as release:
+        plan = release.plan()
+        if not args.dry_run:
+            plan.apply()
+    print(
+        plan.format() if args.dry_run else _format_tags(plan.tags),
+        file=out or sys.stdout,
+    )
+
+
+def _format_tags(tags: list) -> str:
+    return "\n".join(f"Tagged {tag.name} ({tag.target[:7]})" for tag in tags)
+
+
+def report_results(release_results: Iterable[ReleaseResult]) -> None:
+    results = []
+    for result in release_results:
+        print(format_result(result), flush=True)
+        results.append(result)
+    print(format_summary(results))
+    if not all(result.success for result in results):
+        sys.exit(1)
+
+
+def release_single(
+    args: Namespace,
+    job: ReleaseJob,
+    repo: "git.Repo | None" = None,
+    out: TextIO | None = None,
+) -> None:
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.release_cycle import ArtifactStep, PushStep, ReleaseCycle
+
+    profiler = Profiler() if args.profile or args.trace_file else None
+    steps = create_steps(args, job)
+    cycle = ReleaseCycle.from_path(job.path, steps, profiler, journal=True, repo=repo)
+    try:
+        if args.dry_run:
+            print(cycle.plan_release(job.version).format(), file=out or sys.stdout)
+            return
+        if args.atomic:
+            cycle.apply_plan(cycle.plan_release(job.version), job.version)
+        else:
+            cycle.create_release(job.version, args.resume)
+        for step in steps:
+            if isinstance(step, (ArtifactStep, PushStep)):
+                print(step.report(), file=out or sys.stdout)
+    finally:
+        cycle.close()
+        if profiler:
+            report_profile(args, profiler, out or sys.stderr)
+
+
+def rollback(path: str, repo: "git.Repo | None" = None) -> str:
+    # pylint: disable-next=import-outside-toplevel
+    import git
+
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.journal import ReleaseJournal
+
+    if repo is None:
+        with git.Repo(path) as owned:
+            state = ReleaseJournal(owned).rollback()
+    else:
+        state = ReleaseJournal(repo).rollback()
+    return (
+        f"Rolled back release {state['version']} to {state['head'][:7]} "
+        f"({len(state['completed'])} of {len(state['steps'])} steps were completed)"
+    )
+
+
+def report_profile(args: Namespace, profiler: Profiler, out: TextIO) -> None:
+    if args.profile:
+        print(profiler.summary(), file=out)
+    if args.trace_file:
+        profiler.write_chrome_trace(args.trace_file)
+
+
+def main():
+    if sys.argv[1:2] == ["status"]:
+        # pylint: disable-next=import-outside-toplevel
+        from release_tool import status
+
+        status.main(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["history"]:
+        # pylint: disable-next=import-outside-toplevel
+        from release_tool import history
+
+        history.main(sys.argv[2:])
+        return
+
+    args = parse_args()
 
     try:
-        cycle = ReleaseCycle.from_path(args.path, steps)
-        cycle.create_release(new_version)
+        if args.rollback:
+            print(rollback(args.path[0]))
+        elif args.branch:
+            release_branches(args)
+        elif args.subproject:
+            release_subprojects(args)
+        elif args.manifest:
+            release_batch(args, read_manifest(args.manifest))
+        elif len(args.path) > 1:
+            release_batch(
+                args,
+                [
+                    ReleaseJob(path, args.release_version, args.next_version)
+                    for path in args.path
+                ],
+            )
+        else:
+            release_single(
+                args,
+                ReleaseJob(args.path[0], args.release_version, args.next_version),
+            )
     except ReleaseException as ex:
         print(f"ERROR: {ex}")
         sys.exit(1)
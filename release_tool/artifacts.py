@@ -0,0 +1,269 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import hashlib
+import lzma
+import os
+import queue
+import shutil
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from typing import IO, TYPE_CHECKING, NamedTuple
+
+from release_tool.release_exception import ReleaseException
+
+if TYPE_CHECKING:
+    import git
+
+ARCHIVE_FORMATS = ("tar.gz", "tar.xz", "zip")
+CHUNK_SIZE = 1024 * 1024
+QUEUE_SIZE = 8
+
+
+class ArtifactException(ReleaseException):
+    pass
+
+
+class Artifact(NamedTuple):
+    filename: str
+    size: int
+    sha256: str
+    sha512: str
+
+
+class _HashingWriter:
+    def __init__(self, file: IO[bytes]) -> None:
+        self.__file = file
+        self.__sha256 = hashlib.sha256()
+        self.__sha512 = hashlib.sha512()
+        self.__size = 0
+
+    def write(self, data) -> int:
+        self.__file.write(data)
+        self.__sha256.update(data)
+        self.__sha512.update(data)
+        self.__size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.__size
+
+    def flush(self) -> None:
+        self.__file.flush()
+
+    def artifact(self, filename: str) -> Artifact:
+        return Artifact(
+            filename,
+            self.__size,
+            self.__sha256.hexdigest(),
+            self.__sha512.hexdigest(),
+        )
+
+
+class _ChunkReader:
+    def __init__(self, chunks: queue.Queue[bytes | None]) -> None:
+        self.__chunks = chunks
+        self.__chunk = b""
+        self.__offset = 0
+        self.__done = False
+
+    def read(self, size: int = -1) -> bytes:
+        parts = []
+        while size and self.__next_chunk():
+            end = len(self.__chunk)
+            if size > 0:
+                end = min(end, self.__offset + size)
+                size -= end - self.__offset
+            parts.append(self.__chunk[self.__offset : end])
+            self.__offset = end
+        return b"".join(parts)
+
+    def drain(self) -> None:
+        while not self.__done:
+            self.__done = self.__chunks.get() is None
+
+    def __next_chunk(self) -> bool:
+        while self.__offset >= len(self.__chunk):
+            if self.__done:
+                return False
+            chunk = self.__chunks.get()
+            if chunk is None:
+                self.__done = True
+                return False
+            self.__chunk, self.__offset = chunk, 0
+        return True
+
+
+def _write_gzip(source: _ChunkReader, out: _HashingWriter) -> None:
+    with gzip.GzipFile(filename="", mode="wb", fileobj=out, mtime=0) as compressed:
+        shutil.copyfileobj(source, compressed, CHUNK_SIZE)
+
+
+def _write_xz(source: _ChunkReader, out: _HashingWriter) -> None:
+    with lzma.LZMAFile(out, "wb") as compressed:
+        shutil.copyfileobj(source, compressed, CHUNK_SIZE)
+
+
+def _write_zip(source: _ChunkReader, out: _HashingWriter) -> None:
+    with (
+        tarfile.open(fileobj=source, mode="r|") as tar,
+        zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive,
+    ):
+        for member in tar:
+            if member.type == tarfile.XGLTYPE or member.name == "pax_global_header":
+                continue
+            name = member.name + ("/" if member.isdir() else "")
+            info = zipfile.ZipInfo(name, _zip_time(member.mtime))
+            info.external_attr = (_file_type(member) | member.mode) << 16
+            if member.isfile():
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with tar.extractfile(member) as data, archive.open(info, "w") as entry:
+                    shutil.copyfileobj(data, entry, CHUNK_SIZE)
+            else:
+                archive.writestr(info, member.linkname if member.issym() else b"")
+
+
+def _file_type(member: tarfile.TarInfo) -> int:
+    if member.isdir():
+        return stat.S_IFDIR
+    return stat.S_IFLNK if member.issym() else stat.S_IFREG
+
+
+def _zip_time(mtime: float) -> tuple:
+    return max(time.gmtime(mtime)[:6], (1980, 1, 1, 0, 0, 0))
+
+
+WRITERS = {"tar.gz": _write_gzip, "tar.xz": _write_xz, "zip": _write_zip}
+
+
+class _Writer:
+    def __init__(self, archive_format: str, filename: str) -> None:
+        self.__format = archive_format
+        self.__filename = filename
+        self.__chunks: queue.Queue[bytes | None] = queue.Queue(QUEUE_SIZE)
+        self.__thread = threading.Thread(
+            target=self.__run, name=f"artifact-{archive_format}"
+        )
+        self.artifact: Artifact | None = None
+        self.error: Exception | None = None
+
+    @property
+    def filename(self) -> str:
+        return self.__filename
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def put(self, chunk: bytes | None) -> None:
+        self.__chunks.put(chunk)
+
+    def join(self) -> None:
+        self.__thread.join()
+
+    def __run(self) -> None:
+        source = _ChunkReader(self.__chunks)
+        try:
+            with open(self.__filename, "wb") as file:
+                out = _HashingWriter(file)
+                WRITERS[self.__format](source, out)
+            self.artifact = out.artifact(self.__filename)
+        except (OSError, EOFError, tarfile.TarError, lzma.LZMAError) as ex:
+            self.error = ex
+        finally:
+            source.drain()
+
+
+class ArchiveBuilder:
+    def __init__(
+        self,
+        repo: "git.Repo",
+        output_dir: str,
+        formats: tuple[str, ...] = ARCHIVE_FORMATS,
+    ) -> None:
+        unknown = [name for name in formats if name not in WRITERS]
+        if unknown:
+            raise ValueError(f"Unsupported archive formats: {', '.join(unknown)}")
+        self.__repo = repo
+        self.__output_dir = output_dir
+        self.__formats = formats
+
+    def build(self, revision: str, basename: str) -> list[Artifact]:
+        # pylint: disable-next=import-outside-toplevel
+        from git.exc import GitError
+
+        os.makedirs(self.__output_dir, exist_ok=True)
+        writers = [
+            _Writer(name, os.path.join(self.__output_dir, f"{basename}.{name}"))
+            for name in self.__formats
+        ]
+        for writer in writers:
+            writer.start()
+        error = None
+        try:
+            self.__stream(revision, basename, writers)
+        except GitError as ex:
+            error = f"git archive of {revision} failed: {_git_error(ex)}"
+        finally:
+            for writer in writers:
+                writer.put(None)
+            for writer in writers:
+                writer.join()
+
+        failed = [writer for writer in writers if writer.artifact is None]
+        if error or failed:
+            for writer in writers:
+                _remove(writer.filename)
+            raise ArtifactException(
+                error
+                or "; ".join(f"{w.filename}: {w.error or 'failed'}" for w in failed)
+            )
+        artifacts = [writer.artifact for writer in writers if writer.artifact]
+        _write_checksums(self.__output_dir, basename, artifacts)
+        return artifacts
+
+    def __stream(self, revision: str, basename: str, writers: list[_Writer]) -> None:
+        proc = self.__repo.git.archive(
+            "--format=tar", f"--prefix={basename}/", revision, as_process=True
+        )
+        while chunk := proc.stdout.read(CHUNK_SIZE):
+            for writer in writers:
+                writer.put(chunk)
+        proc.wait()
+
+
+def _write_checksums(output_dir: str, basename: str, artifacts: list[Artifact]):
+    for algorithm in ("sha256", "sha512"):
+        filename = os.path.join(output_dir, f"{basename}.{algorithm}")
+        with open(filename, "w", encoding="utf-8") as file:
+            for artifact in artifacts:
+                digest = getattr(artifact, algorithm)
+                file.write(f"{digest}  {os.path.basename(artifact.filename)}\n")
+
+
+def _git_error(ex: Exception) -> str:
+    return str(getattr(ex, "stderr", "") or ex).strip().removeprefix("stderr: ")
+
+
+def _remove(filename: str) -> None:
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
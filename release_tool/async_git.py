@@ -0,0 +1,45 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import git
+
+from release_tool.profiling import git_span
+
+
+async def run_git(repo: git.Repo, *args: str) -> str:
+    command = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", *args]
+    with git_span(command):
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=repo.working_tree_dir or repo.git_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode:
+        raise git.GitCommandError(command, process.returncode, stderr, stdout)
+    return stdout.decode("utf-8", "replace")
+
+
+async def is_dirty(repo: git.Repo, paths: list[str] | None = None) -> bool:
+    args = ["--abbrev=40", "--full-index", "--raw", "--", *(paths or [])]
+    staged, unstaged = await asyncio.gather(
+        run_git(repo, "diff", "--cached", *args), run_git(repo, "diff", *args)
+    )
+    return bool(staged) or bool(unstaged)
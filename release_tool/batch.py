@@ -0,0 +1,141 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, NamedTuple
+
+from release_tool.release_exception import ReleaseException
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+class ManifestException(ReleaseException):
+    pass
+
+
+class ReleaseJob(NamedTuple):
+    path: str
+    version: str
+    next_version: str | None = None
+
+
+class ReleaseResult(NamedTuple):
+    job: ReleaseJob
+    success: bool
+    error: str | None = None
+    duration: float = 0.0
+    skipped: bool = False
+
+
+def read_manifest(filename: str) -> list[ReleaseJob]:
+    jobs = []
+    with open(filename, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            if len(fields) not in (2, 3):
+                raise ManifestException(
+                    f"{filename}:{line_number}: expected "
+                    f"'<path> <release-version> [<next-version>]'"
+                )
+            path = os.path.join(os.path.dirname(filename), fields[0])
+            jobs.append(ReleaseJob(path, *fields[1:]))
+    return jobs
+
+
+def parse_subproject(value: str) -> ReleaseJob:
+    path, separator, version = value.partition("=")
+    if not separator or not path.strip() or not version.strip():
+        raise ValueError(f"'{value}' is not 'DIR=VERSION'")
+    return ReleaseJob(path.strip(), version.strip())
+
+
+def run_job(job: ReleaseJob, create_steps: Callable) -> ReleaseResult:
+    # pylint: disable-next=import-outside-toplevel
+    from git.exc import GitError
+
+    # pylint: disable-next=import-outside-toplevel
+    from release_tool.release_cycle import ReleaseCycle
+
+    start = time.perf_counter()
+    try:
+        with ReleaseCycle.from_path(job.path, create_steps(job)) as cycle:
+            cycle.create_release(job.version)
+    except (ReleaseException, GitError, OSError, ValueError) as ex:
+        return ReleaseResult(
+            job, False, str(ex) or type(ex).__name__, time.perf_counter() - start
+        )
+    return ReleaseResult(job, True, None, time.perf_counter() - start)
+
+
+class BatchRelease:
+    def __init__(
+        self, create_steps: Callable, jobs: int | None = None, keep_going: bool = False
+    ) -> None:
+        self.__create_steps = create_steps
+        self.__jobs = jobs
+        self.__keep_going = keep_going
+
+    def run(
+        self, release_jobs: Iterable[ReleaseJob], executor: "Executor | None" = None
+    ) -> Iterable[ReleaseResult]:
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        if executor is None:
+            executor = ProcessPoolExecutor(self.__jobs)
+        with executor as pool:
+            pending = {
+                pool.submit(run_job, job, self.__create_steps): job
+                for job in release_jobs
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    result = future.result()
+                    yield result
+                    if not result.success and not self.__keep_going:
+                        yield from self.__cancel(pending)
+                        return
+
+    @staticmethod
+    def __cancel(pending: dict) -> Iterable[ReleaseResult]:
+        for future, job in pending.items():
+            if future.cancel():
+                yield ReleaseResult(job, False, "Cancelled", skipped=True)
+            else:
+                yield future.result()
+
+
+def format_result(result: ReleaseResult) -> str:
+    if result.skipped:
+        return f"SKIP {result.job.path}"
+    if result.success:
+        return f"OK   {result.job.path} ({result.job.version}) {result.duration:.2f}s"
+    return f"FAIL {result.job.path} ({result.job.version}): {result.error}"
+
+
+def format_summary(results: list[ReleaseResult]) -> str:
+    released = sum(1 for r in results if r.success)
+    skipped = sum(1 for r in results if r.skipped)
+    failed = len(results) - released - skipped
+    return f"{released} released, {failed} failed, {skipped} skipped"
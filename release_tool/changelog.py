@@ -0,0 +1,125 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import re
+import shutil
+from collections.abc import Iterable, Iterator
+from typing import IO, NamedTuple
+
+import git
+
+from release_tool.tags import TagIndex, tag_name, version_key
+from release_tool.worktree import atomic_write, open_file
+
+GROUP_TITLES = {
+    "breaking": "Breaking Changes",
+    "feat": "Features",
+    "fix": "Bug Fixes",
+    "perf": "Performance Improvements",
+    "refactor": "Refactoring",
+    "revert": "Reverts",
+    "docs": "Documentation",
+    "build": "Build System",
+    "ci": "Continuous Integration",
+    "test": "Tests",
+}
+OTHER_GROUP = "Other Changes"
+
+_CONVENTIONAL_COMMIT = re.compile(
+    r"(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?(?P<breaking>!)?:\s*(?P<text>.+)"
+)
+
+
+class ChangelogEntry(NamedTuple):
+    sha: str
+    subject: str
+
+
+def iter_commits(repo: git.Repo, revision: str) -> Iterator[ChangelogEntry]:
+    proc = repo.git.log("--no-merges", "--format=%H%x00%s", revision, as_process=True)
+    for line in proc.stdout:
+        sha, _, subject = line.decode("utf-8", "replace").rstrip("\n").partition("\0")
+        yield ChangelogEntry(sha, subject)
+    proc.wait()
+
+
+def format_changelog(entries: Iterable[ChangelogEntry], grouped: bool = True) -> str:
+    groups: dict[str, list[str]] = {}
+    for entry in entries:
+        title, line = _classify(entry) if grouped else (OTHER_GROUP, _line(entry))
+        groups.setdefault(title, []).append(line)
+
+    if not grouped:
+        return "\n".join(groups.get(OTHER_GROUP, []))
+
+    order = [*GROUP_TITLES.values(), OTHER_GROUP]
+    return "\n\n".join(
+        f"### {title}\n\n" + "\n".join(groups[title])
+        for title in order
+        if title in groups
+    )
+
+
+def _classify(entry: ChangelogEntry) -> tuple[str, str]:
+    match = _CONVENTIONAL_COMMIT.fullmatch(entry.subject)
+    if not match:
+        return (OTHER_GROUP, _line(entry))
+    text = match.group("text")
+    if match.group("scope"):
+        text = f"**{match.group('scope')}:** {text}"
+    kind = "breaking" if match.group("breaking") else match.group("type").lower()
+    return (GROUP_TITLES.get(kind, OTHER_GROUP), _line(entry._replace(subject=text)))
+
+
+def _line(entry: ChangelogEntry) -> str:
+    return f"- {entry.subject} ({entry.sha[:7]})"
+
+
+def previous_release(repo: git.Repo, new_version: str) -> str | None:
+    index = TagIndex.for_git_dir(repo.common_dir)
+    below = new_version if version_key(new_version) is not None else None
+    version = index.latest_version(below=below)
+    return tag_name(version) if version else None
+
+
+def prepend_section(filename: str, section: str) -> None:
+    with atomic_write(filename) as out:
+        _write_with_section(filename, section, out)
+
+
+def _write_with_section(filename: str, section: str, out: IO[str]) -> None:
+    try:
+        existing = open_file(filename)
+    except FileNotFoundError:
+        out.write(section + "\n")
+        return
+
+    with existing:
+        line = existing.readline()
+        if line.startswith("# "):
+            out.write(line.rstrip("\n") + "\n\n")
+            line = existing.readline()
+            while line and not line.strip():
+                line = existing.readline()
+        out.write(section + ("\n\n" if line else "\n"))
+        out.write(line)
+        shutil.copyfileobj(existing, out)
+
+
+def release_heading(new_version: str) -> str:
+    return f"## {tag_name(new_version)} ({datetime.datetime.now(datetime.timezone.utc).date()})"
@@ -0,0 +1,83 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import socket
+import sys
+import tempfile
+
+from release_tool.__main__ import parse_args
+from release_tool.release_exception import ReleaseException
+
+# The client only forwards requests, it must stay free of GitPython imports.
+
+SOCKET_ENV = "RELEASE_TOOL_SOCKET"
+COMMANDS = ("ping", "stats", "project", "shutdown")
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "release-tool.sock")
+    return os.path.join(tempfile.gettempdir(), f"release-tool-{os.getuid()}.sock")
+
+
+def socket_path() -> str:
+    return os.environ.get(SOCKET_ENV) or default_socket_path()
+
+
+def send_request(request: dict, path: str | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path or socket_path())
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ReleaseException("The release daemon closed the connection")
+    return json.loads(line)
+
+
+def create_request(argv: list[str]) -> dict:
+    if argv and argv[0] in COMMANDS:
+        return {"command": argv[0], "args": argv[1:], "cwd": os.getcwd()}
+    parse_args(argv)
+    return {"command": "release", "args": argv, "cwd": os.getcwd()}
+
+
+def main():
+    request = create_request(sys.argv[1:])
+
+    try:
+        response = send_request(request)
+    except ReleaseException as ex:
+        print(f"ERROR: {ex}")
+        sys.exit(1)
+    except OSError as ex:
+        print(f"ERROR: Release daemon not reachable at '{socket_path()}': {ex}")
+        sys.exit(1)
+
+    if response.get("output"):
+        print(response["output"].rstrip("\n"))
+    if response.get("error"):
+        print(f"ERROR: {response['error']}")
+    if response.get("status", 1):
+        sys.exit(response.get("status", 1))
+
+
+if __name__ == "__main__":
+    main()
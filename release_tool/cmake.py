@@ -16,20 +16,31 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import re
+
+from release_tool.cmake_syntax import Argument, ArgumentKind, Command, iter_commands
+from release_tool.cmake_variables import (
+    COMMANDS,
+    Definition,
+    Stamp,
+    Value,
+    VariableScope,
+    file_stamp,
+    is_literal,
+)
+from release_tool.projects import UnsupportedProjectException
+from release_tool.worktree import overlay_active, read_file, replace_file
 
 
 class CMakeProject:
-    __PATTERN = r"project\s*\((.+?)\)"
     PROJECT_CONFIG = "CMakeLists.txt"
 
     def __init__(self, proj_dir: str) -> None:
         self.__proj_dir = proj_dir
-        project_args = self.__parse_project_arguments(
-            _load_file(self.__proj_dir, self.PROJECT_CONFIG)
+        self.__name, version, self.__files = _resolve_project(
+            proj_dir, self.PROJECT_CONFIG
         )
-        self.__name = project_args[0].strip()
-        self.__version = project_args[_index_of(project_args, "VERSION") + 1].strip()
+        self.__version = version.text.strip()
+        self.__definition = version.definition
 
     @property
     def name(self) -> str:
@@ -39,45 +50,148 @@ class CMakeProject:
     def version(self) -> str:
         return self.__version
 
+    @property
+    def directory(self) -> str:
+        return self.__proj_dir
+
+    @property
+    def version_file(self) -> str:
+        if self.__definition is None:
+            return self.PROJECT_CONFIG
+        return self.__definition.filename
+
+    @property
+    def files(self) -> dict[str, Stamp | None]:
+        return dict(self.__files)
+
     def set_new_version(self, new_version: str) -> None:
-        content = _load_file(self.__proj_dir, self.PROJECT_CONFIG)
-        project_args = self.__parse_project_arguments(content, True)
+        if not self.__is_current():
+            self.__name, version, self.__files = _resolve_project(
+                self.__proj_dir, self.PROJECT_CONFIG
+            )
+            self.__definition = version.definition
+        if self.__definition is None:
+            raise ValueError(
+                f"The version of {self.__name} is composed of several variables "
+                "and can't be updated"
+            )
         self.__version = new_version
 
-        idx = _index_of(project_args, "VERSION") + 1
-        suffix = "\n" if project_args[idx].endswith(("\n", "\r")) else ""
-        project_args[idx] = self.__version + suffix
+        filename, content, version = self.__definition
+        if version.value == new_version:
+            return
+
+        result = (
+            content[: version.value_start] + new_version + content[version.value_end :]
+        )
+        data = new_version.encode("utf-8")
+        if len(data) == len(version.value.encode("utf-8")) and not overlay_active():
+            offset = version.value_start
+            if not content.isascii():
+                offset = len(content[:offset].encode("utf-8"))
+            _write_region(self.__proj_dir, filename, offset, data)
+        else:
+            _write_file(self.__proj_dir, filename, result)
+
+        self.__definition = Definition(
+            filename,
+            result,
+            version._replace(
+                value=new_version,
+                end=version.end + len(new_version) - len(version.value),
+            ),
+        )
+        self.__files[filename] = _file_stamp(self.__proj_dir, filename)
+
+    def __is_current(self) -> bool:
+        return all(
+            stamp is not None and stamp == _file_stamp(self.__proj_dir, filename)
+            for filename, stamp in self.__files.items()
+        )
+
 
-        result = re.sub(
-            self.__PATTERN,
-            f"project({' '.join(project_args)})",
-            content,
-            flags=re.DOTALL,
+def parse_project(content: str) -> tuple[str, str]:
+    command = _find_project(content)
+    if not is_literal(_version_argument(command)) and any(
+        iter_commands(content[: command.start], names=("include",))
+    ):
+        raise UnsupportedProjectException(
+            "Project versions set through include(...) can only be read from a checkout"
         )
-        _write_file(self.__proj_dir, self.PROJECT_CONFIG, result)
+    name, version, _ = _resolve(
+        ".", CMakeProject.PROJECT_CONFIG, content, command, names=("set",)
+    )
+    return (name, version.text.strip())
+
+
+def _resolve_project(
+    path: str, filename: str
+) -> tuple[str, Value, dict[str, Stamp | None]]:
+    stamp = _file_stamp(path, filename)
+    content = _load_file(path, filename)
+    name, version, files = _resolve(path, filename, content, _find_project(content))
+    return (name, version, {filename: stamp, **files})
+
+
+def _resolve(
+    path: str,
+    filename: str,
+    content: str,
+    command: Command,
+    names: tuple[str, ...] = COMMANDS,
+) -> tuple[str, Value, dict[str, Stamp | None]]:
+    if not command.arguments:
+        raise ValueError("Invalid project(...): no project name")
+    name = command.arguments[0]
+    version = _version_argument(command)
+    if is_literal(name) and is_literal(version):
+        return (
+            name.value.strip(),
+            Value(version.value, Definition(filename, content, version)),
+            {},
+        )
+
+    scope = VariableScope(path)
+    scope.evaluate(
+        filename, content, iter_commands(content[: command.start], names=names)
+    )
+    resolved = scope.resolve(filename, content, version)
+    if not resolved.text.strip():
+        raise ValueError(f"Can't resolve the project version '{version.value}'")
+    return (
+        scope.resolve(filename, content, name).text.strip(),
+        resolved,
+        scope.files,
+    )
 
-    def __parse_project_arguments(
-        self, input_string: str, keep_whitespaces: bool = False
-    ) -> list[str]:
-        match = re.search(self.__PATTERN, input_string, re.DOTALL)
-        if not match:
-            raise ValueError(f"Invalid project(...): '{input_string}'")
-        args = match.group(1).split(" ")
-        return args if keep_whitespaces else [token for token in args if token.strip()]
 
+def _find_project(content: str) -> Command:
+    for command in iter_commands(content, names=("project",)):
+        return command
+    raise ValueError("No project(...) found")
 
-def _index_of(args, name: str):
-    for element in args:
-        if element.strip() == name:
-            return args.index(element)
-    raise ValueError(f"No element '{name}' found in '{args}'")
+
+def _version_argument(command: Command) -> Argument:
+    arguments = command.arguments
+    for idx, argument in enumerate(arguments[:-1]):
+        if argument.kind == ArgumentKind.UNQUOTED and argument.value == "VERSION":
+            return arguments[idx + 1]
+    raise ValueError("No element 'VERSION' found in project(...)")
+
+
+def _file_stamp(path: str, filename: str) -> Stamp | None:
+    return file_stamp(os.path.join(path, filename))
 
 
 def _load_file(path: str, filename: str) -> str:
-    with open(os.path.join(path, filename), "r", encoding="utf-8") as file:
-        return file.read()
+    return read_file(os.path.join(path, filename))
+
+
+def _write_region(path: str, filename: str, offset: int, data: bytes) -> None:
+    with open(os.path.join(path, filename), "r+b") as file:
+        file.seek(offset)
+        file.write(data)
 
 
 def _write_file(path: str, filename: str, content: str) -> None:
-    with open(os.path.join(path, filename), "w", encoding="utf-8") as file:
-        file.write(content)
+    replace_file(os.path.join(path, filename), content)
@@ -0,0 +1,151 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import enum
+import re
+from collections.abc import Collection, Iterator
+from typing import NamedTuple
+
+_ELEMENT = re.compile(
+    r"""
+     [ \t\r\n]+
+    |\#\[(?P<eq>=*)\[.*?\](?P=eq)\]
+    |\#[^\n]*
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*)[ \t]*\(
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_ARGUMENT = re.compile(
+    r"""
+     (?P<space>[ \t\r\n]+)
+    |(?P<comment>\#\[(?P<ceq>=*)\[.*?\](?P=ceq)\]|\#[^\n]*)
+    |(?P<open>\()
+    |(?P<close>\))
+    |(?P<bracket>\[(?P<beq>=*)\[(?P<bracket_value>.*?)\](?P=beq)\])
+    |(?P<quoted>"(?P<quoted_value>(?:[^"\\]|\\.)*)")
+    |(?P<unquoted>(?:[^\s()\#"\\]|\\.|"(?:[^"\\]|\\.)*")+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SIMPLE_ARGUMENTS = re.compile(
+    r"""
+    (?:[^()"\#\[\\]
+      |"(?:[^"\\]|\\.)*"
+      |\\.
+      |\#(?!\[=*\[)[^\n]*(?=\n|\Z)
+    )*\)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class ArgumentKind(enum.Enum):
+    UNQUOTED = "unquoted"
+    QUOTED = "quoted"
+    BRACKET = "bracket"
+
+
+class Argument(NamedTuple):
+    value: str
+    kind: ArgumentKind
+    start: int
+    end: int
+
+    @property
+    def value_start(self) -> int:
+        return self.start + (self.end - self.start - len(self.value)) // 2
+
+    @property
+    def value_end(self) -> int:
+        return self.value_start + len(self.value)
+
+
+class Command(NamedTuple):
+    name: str
+    arguments: list[Argument]
+    start: int
+    end: int
+
+
+def iter_commands(
+    content: str, pos: int = 0, names: Collection[str] | None = None
+) -> Iterator[Command]:
+    length = len(content)
+    while pos < length:
+        match = _ELEMENT.match(content, pos)
+        if not match:
+            raise ValueError(f"Invalid CMake syntax at offset {pos}")
+        name = match.group("name")
+        if not name:
+            pos = match.end()
+        elif names is not None and name.lower() not in names:
+            pos = _skip_command(content, match)
+        else:
+            command = _parse_command(content, match)
+            pos = command.end
+            yield command
+
+
+def _skip_command(content: str, head: re.Match) -> int:
+    simple = _SIMPLE_ARGUMENTS.match(content, head.end())
+    if simple:
+        return simple.end()
+    return _parse_command(content, head).end
+
+
+def _parse_command(content: str, head: re.Match) -> Command:
+    arguments = []
+    depth = 0
+    pos = head.end()
+    while True:
+        match = _ARGUMENT.match(content, pos)
+        if not match:
+            raise ValueError(
+                f"Unterminated {head.group('name')}(...) at offset {head.start()}"
+            )
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == "close":
+            if depth == 0:
+                return Command(head.group("name"), arguments, head.start(), pos)
+            depth -= 1
+        elif kind == "open":
+            depth += 1
+        elif kind == "unquoted":
+            arguments.append(
+                Argument(match.group(), ArgumentKind.UNQUOTED, match.start(), pos)
+            )
+        elif kind == "quoted":
+            arguments.append(
+                Argument(
+                    match.group("quoted_value"),
+                    ArgumentKind.QUOTED,
+                    match.start(),
+                    pos,
+                )
+            )
+        elif kind == "bracket":
+            arguments.append(
+                Argument(
+                    match.group("bracket_value"),
+                    ArgumentKind.BRACKET,
+                    match.start(),
+                    pos,
+                )
+            )
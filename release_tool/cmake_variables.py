@@ -0,0 +1,211 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from release_tool.cmake_syntax import Argument, ArgumentKind, Command, iter_commands
+
+COMMANDS = ("project", "set", "include")
+MAX_INCLUDE_DEPTH = 32
+
+_REFERENCE = re.compile(r"\$(?P<env>ENV)?\{(?P<name>[^${}]*)\}")
+_SINGLE_REFERENCE = re.compile(r"\$\{(?P<name>[^${}]*)\}")
+_DIRECTORY_VARIABLES = (
+    "CMAKE_SOURCE_DIR",
+    "CMAKE_CURRENT_SOURCE_DIR",
+    "CMAKE_CURRENT_LIST_DIR",
+    "PROJECT_SOURCE_DIR",
+)
+
+Stamp = tuple[int, int, int]
+
+CACHE_SIZE = 256
+
+_files: OrderedDict[str, tuple[Stamp | None, str, str]] = OrderedDict()
+_parsed: OrderedDict[str, tuple[Command, ...]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class Definition(NamedTuple):
+    filename: str
+    content: str
+    argument: Argument
+
+
+class Value(NamedTuple):
+    text: str
+    definition: Definition | None = None
+
+
+def file_stamp(filename: str) -> Stamp | None:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def is_literal(argument: Argument) -> bool:
+    return argument.kind == ArgumentKind.BRACKET or "$" not in argument.value
+
+
+class VariableScope:
+    def __init__(self, proj_dir: str) -> None:
+        self.__directory = os.path.abspath(proj_dir)
+        self.__variables = {
+            name: Value(self.__directory) for name in _DIRECTORY_VARIABLES
+        }
+        self.__files: dict[str, Stamp | None] = {}
+        self.__stack: list[str] = []
+
+    @property
+    def files(self) -> dict[str, Stamp | None]:
+        return self.__files
+
+    def evaluate(
+        self, filename: str, content: str, commands: Iterable[Command]
+    ) -> None:
+        for command in commands:
+            name = command.name.lower()
+            if name == "set":
+                self.__set(filename, content, command.arguments)
+            elif name == "include":
+                self.__include(command.arguments)
+
+    def resolve(self, filename: str, content: str, argument: Argument) -> Value:
+        if is_literal(argument):
+            return Value(argument.value, Definition(filename, content, argument))
+        match = _SINGLE_REFERENCE.fullmatch(argument.value.strip())
+        if match:
+            return self.__variables.get(self.expand(match.group("name")), Value(""))
+        return Value(self.expand(argument.value))
+
+    def expand(self, value: str) -> str:
+        for _ in range(value.count("{") + 1):
+            expanded = _REFERENCE.sub(self.__lookup, value)
+            if expanded == value:
+                break
+            value = expanded
+        return value
+
+    def __lookup(self, match: re.Match) -> str:
+        if match.group("env"):
+            return os.environ.get(match.group("name"), "")
+        return self.__variables.get(match.group("name"), Value("")).text
+
+    def __set(self, filename: str, content: str, arguments: list[Argument]) -> None:
+        if not arguments:
+            return
+        name = self.expand(arguments[0].value)
+        values = arguments[1:]
+        for idx, argument in enumerate(values):
+            if argument.kind == ArgumentKind.UNQUOTED and argument.value == "CACHE":
+                if name in self.__variables:
+                    return
+                values = values[:idx]
+                break
+
+        if not values:
+            self.__variables.pop(name, None)
+        elif len(values) == 1:
+            self.__variables[name] = self.resolve(filename, content, values[0])
+        else:
+            self.__variables[name] = Value(
+                ";".join(self.expand(value.value) for value in values)
+            )
+
+    def __include(self, arguments: list[Argument]) -> None:
+        if not arguments:
+            return
+        filename = self.__find_include(self.expand(arguments[0].value))
+        if (
+            filename is None
+            or filename in self.__stack
+            or len(self.__stack) >= MAX_INCLUDE_DEPTH
+        ):
+            return
+
+        stamp, content, commands = _read(filename)
+        relative = os.path.relpath(filename, self.__directory).replace(os.sep, "/")
+        self.__files[relative] = stamp
+        list_dir = self.__variables["CMAKE_CURRENT_LIST_DIR"]
+        self.__variables["CMAKE_CURRENT_LIST_DIR"] = Value(os.path.dirname(filename))
+        self.__stack.append(filename)
+        try:
+            self.evaluate(relative, content, commands)
+        finally:
+            self.__stack.pop()
+            self.__variables["CMAKE_CURRENT_LIST_DIR"] = list_dir
+
+    def __find_include(self, target: str) -> str | None:
+        if not target:
+            return None
+        source_dir = self.__variables["CMAKE_CURRENT_SOURCE_DIR"].text
+        if target.endswith(".cmake"):
+            candidates = [os.path.join(source_dir, target)]
+        else:
+            module_path = self.__variables.get("CMAKE_MODULE_PATH", Value("")).text
+            candidates = [
+                os.path.join(source_dir, directory, target + ".cmake")
+                for directory in module_path.split(";")
+                if directory
+            ]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+        return None
+
+
+def _read(filename: str) -> tuple[Stamp | None, str, tuple[Command, ...]]:
+    stamp = file_stamp(filename)
+    cached = _cached(_files, filename)
+    if stamp is None or cached is None or cached[0] != stamp:
+        with open(filename, "r", encoding="utf-8", newline="") as file:
+            content = file.read()
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        cached = (stamp, content, digest)
+        if stamp is not None:
+            _store(_files, filename, cached)
+    _, content, digest = cached
+
+    commands = _cached(_parsed, digest)
+    if commands is None:
+        commands = tuple(iter_commands(content, names=COMMANDS))
+        _store(_parsed, digest, commands)
+    return (stamp, content, commands)
+
+
+def _cached(cache: OrderedDict, key: str):
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _store(cache: OrderedDict, key: str, value) -> None:
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
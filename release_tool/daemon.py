@@ -0,0 +1,205 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from argparse import Namespace
+from collections.abc import Callable
+
+from git.exc import GitError
+
+from release_tool.__main__ import (
+    ReleaseJob,
+    parse_args,
+    release_single,
+    release_subprojects,
+    rollback,
+)
+from release_tool.client import SOCKET_ENV, default_socket_path
+from release_tool.projects import open_project
+from release_tool.release_exception import ReleaseException
+from release_tool.repo_pool import DEFAULT_CAPACITY, RepoPool
+from release_tool.resources import format_usage, resource_usage
+from release_tool.tags import TagIndex, tag_name
+
+
+class DaemonException(ReleaseException):
+    pass
+
+
+def handle_request(request: dict, pool: RepoPool) -> dict:
+    handler = _HANDLERS.get(request.get("command", ""))
+    if handler is None:
+        return {"status": 1, "error": f"Unknown command '{request.get('command')}'"}
+
+    try:
+        output = handler(pool, request.get("args", []), request.get("cwd", "/"))
+    except (ReleaseException, GitError, OSError, ValueError) as ex:
+        return {"status": 1, "error": str(ex) or type(ex).__name__}
+    except SystemExit:
+        return {"status": 2, "error": "Invalid arguments"}
+    # pylint: disable-next=broad-exception-caught
+    except Exception as ex:  # noqa: BLE001
+        return {"status": 1, "error": f"Unexpected error: {type(ex).__name__}: {ex}"}
+    return {"status": 0, "output": output}
+
+
+def _ping(_pool: RepoPool, _argv: list[str], _cwd: str) -> str:
+    return "pong"
+
+
+def _stats(pool: RepoPool, _argv: list[str], _cwd: str) -> str:
+    stats = pool.stats()
+    return (
+        f"{stats.open} of {stats.capacity} repositories open ({stats.in_use} in use, "
+        f"{stats.opened} opened, {stats.closed} closed)\n"
+        f"{format_usage(resource_usage())}"
+    )
+
+
+def _project(pool: RepoPool, argv: list[str], cwd: str) -> str:
+    path = os.path.join(cwd, argv[0] if argv else "")
+    with pool.acquire(path) as repo:
+        proj = open_project(path)
+        latest = TagIndex.for_git_dir(repo.common_dir).latest_version()
+    release = tag_name(latest) if latest else "none"
+    return f"{proj.name} {proj.version} (latest release: {release})"
+
+
+def _release(pool: RepoPool, argv: list[str], cwd: str) -> str:
+    args = parse_args(argv, cwd)
+    if args.branch:
+        raise DaemonException("The daemon doesn't support --branch")
+    if args.manifest or len(args.path) > 1:
+        raise DaemonException("The daemon releases a single project per request")
+
+    path = args.path[0]
+    with pool.acquire(path) as repo:
+        if args.rollback:
+            return rollback(path, repo)
+        out = io.StringIO()
+        if args.subproject:
+            release_subprojects(args, repo, out)
+            return out.getvalue()
+        job = ReleaseJob(path, args.release_version, args.next_version)
+        release_single(args, job, repo, out)
+        return out.getvalue()
+
+
+def _shutdown(_pool: RepoPool, _argv: list[str], _cwd: str) -> str:
+    return "Shutting down"
+
+
+_HANDLERS: dict[str, Callable[[RepoPool, list[str], str], str]] = {
+    "ping": _ping,
+    "stats": _stats,
+    "project": _project,
+    "release": _release,
+    "shutdown": _shutdown,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server = self.server
+        assert isinstance(server, ReleaseServer)
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = {}
+            response = handle_request(request, server.pool)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if request.get("command") == "shutdown":
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+
+
+class ReleaseServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, socket_path: str, pool: RepoPool) -> None:
+        self.pool = pool
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise DaemonException(f"A release daemon is already running at '{socket_path}'")
+
+
+def parse_daemon_args(argv: list[str] | None = None) -> Namespace:
+    parser = argparse.ArgumentParser(
+        prog="release-tool-daemon",
+        description="Serves releases with warm repositories over a Unix socket",
+    )
+    parser.add_argument(
+        "--socket", type=str, default=None, help="Socket path to listen on"
+    )
+    parser.add_argument(
+        "--max-repos",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f"Number of repositories kept open (default: {DEFAULT_CAPACITY})",
+    )
+    args = parser.parse_args(argv)
+    if args.max_repos < 1:
+        parser.error("--max-repos must be at least 1")
+    return args
+
+
+def main():
+    args = parse_daemon_args()
+    socket_path = args.socket or os.environ.get(SOCKET_ENV)
+    socket_path = socket_path or default_socket_path()
+
+    pool = RepoPool(args.max_repos)
+    try:
+        with ReleaseServer(socket_path, pool) as server:
+            print(f"Listening on {socket_path}", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(socket_path)
+    except DaemonException as ex:
+        print(f"ERROR: {ex}")
+        sys.exit(1)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+from argparse import Namespace
+from collections.abc import Iterable, Iterator
+
+import git
+from git.exc import GitCommandError
+from gitdb.exc import BadName
+
+from release_tool.cmake import CMakeProject, parse_project
+from release_tool.projects import UnsupportedProjectException
+from release_tool.release_exception import ReleaseException
+from release_tool.worktree import state_path
+
+
+class _CatFile:
+    def __init__(self, repo: git.Repo) -> None:
+        self.__proc = repo.git.cat_file(
+            "--batch-command", "--buffer", as_process=True, istream=subprocess.PIPE
+        )
+
+    def blob_ids(self, objects: list[str]) -> list[str | None]:
+        self.__request("info", objects)
+        result = []
+        for _ in objects:
+            sha, kind, *_ = self.__proc.stdout.readline().decode().split()
+            result.append(sha if kind == "blob" else None)
+        return result
+
+    def contents(self, objects: list[str]) -> Iterator[bytes]:
+        self.__request("contents", objects)
+        for _ in objects:
+            _, _, size = self.__proc.stdout.readline().decode().split()
+            data = self.__proc.stdout.read(int(size) + 1)
+            yield data[:-1]
+
+    def close(self) -> None:
+        self.__proc.stdin.close()
+        self.__proc.wait()
+
+    def __request(self, command: str, objects: list[str]) -> None:
+        self.__proc.stdin.write(
+            "".join(f"{command} {name}\n" for name in objects).encode() + b"flush\n"
+        )
+        self.__proc.stdin.flush()
+
+
+class VersionHistory:
+    FILENAME = "version-history.json"
+    CHUNK_SIZE = 512
+    MAX_TIPS = 16
+
+    def __init__(self, repo: git.Repo, proj_dir: str) -> None:
+        self.__repo = repo
+        path = os.path.relpath(
+            os.path.realpath(os.path.join(proj_dir, CMakeProject.PROJECT_CONFIG)),
+            os.path.realpath(repo.working_tree_dir),
+        )
+        self.__path = path.replace(os.sep, "/")
+        self.__filename = state_path(repo, self.FILENAME)
+        self.__state = self.__load()
+        self.__index = self.__state.setdefault(
+            self.__path, {"tips": [], "commits": {}, "blobs": {}}
+        )
+
+    def update(self, rev: str = "HEAD") -> int:
+        sha = self.__repo.rev_parse(rev).hexsha
+        commits = self.__index["commits"]
+        if sha in commits:
+            return 0
+
+        try:
+            count = self.__add(self.__new_commits(sha, self.__index["tips"]))
+        except GitCommandError:
+            count = self.__add(self.__new_commits(sha, []))
+        tips = [sha, *(tip for tip in self.__index["tips"] if tip != sha)]
+        self.__index["tips"] = tips[: self.MAX_TIPS]
+        return count
+
+    def version_at(self, rev: str = "HEAD") -> str | None:
+        self.update(rev)
+        return self.__version(self.__repo.rev_parse(rev).hexsha)
+
+    def first_commit(self, version: str, rev: str = "HEAD") -> str | None:
+        self.update(rev)
+        for sha in self.__repo.git.rev_list("--reverse", "--topo-order", rev).split():
+            if self.__version(sha) == version:
+                return sha
+        return None
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+        tmp_name = self.__filename + ".tmp"
+        with open(tmp_name, "w", encoding="utf-8") as file:
+            json.dump(self.__state, file)
+        os.replace(tmp_name, self.__filename)
+
+    def __version(self, sha: str) -> str | None:
+        blob = self.__index["commits"].get(sha)
+        version = self.__index["blobs"].get(blob) if blob else None
+        if version is _UNSUPPORTED:
+            raise UnsupportedProjectException(
+                f"The project version at {sha[:7]} is set through include(...), "
+                "which the version history doesn't support"
+            )
+        return version
+
+    def __new_commits(self, sha: str, tips: list[str]) -> list[str]:
+        args = [sha, "--not", *tips] if tips else [sha]
+        proc = self.__repo.git.rev_list(*args, as_process=True)
+        commits = [line.decode().strip() for line in proc.stdout]
+        proc.wait()
+        return commits
+
+    def __add(self, new_commits: Iterable[str]) -> int:
+        commits, blobs = self.__index["commits"], self.__index["blobs"]
+        pending = (sha for sha in new_commits if sha not in commits)
+        cat_file = _CatFile(self.__repo)
+        count = 0
+        try:
+            while chunk := list(itertools.islice(pending, self.CHUNK_SIZE)):
+                blob_ids = cat_file.blob_ids([f"{sha}:{self.__path}" for sha in chunk])
+                unknown = list(
+                    dict.fromkeys(b for b in blob_ids if b and b not in blobs)
+                )
+                for blob, data in zip(unknown, cat_file.contents(unknown)):
+                    blobs[blob] = _parse_version(data)
+                commits.update(zip(chunk, blob_ids))
+                count += len(chunk)
+        finally:
+            cat_file.close()
+        return count
+
+    def __load(self) -> dict:
+        try:
+            with open(self.__filename, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+# Stored for CMakeLists.txt blobs whose version comes from included files,
+# which the blob alone can't resolve.
+_UNSUPPORTED = False
+
+
+def _parse_version(data: bytes) -> str | bool | None:
+    try:
+        return parse_project(data.decode("utf-8", "replace"))[1] or None
+    except UnsupportedProjectException:
+        return _UNSUPPORTED
+    except ValueError:
+        return None
+
+
+def parse_history_args(argv: list[str] | None = None) -> Namespace:
+    parser = argparse.ArgumentParser(
+        prog="release-tool history",
+        description="Queries the project version across the git history",
+    )
+    parser.add_argument(
+        "--path", "-C", default=os.getcwd(), help="Project directory (default: .)"
+    )
+    queries = parser.add_subparsers(dest="query", required=True)
+    at = queries.add_parser("at", help="Print the version of a revision")
+    at.add_argument("rev", nargs="?", default="HEAD")
+    first = queries.add_parser("first", help="Print the first commit with the version")
+    first.add_argument("version")
+    first.add_argument(
+        "--rev", default="HEAD", help="History to search (default: HEAD)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_history_args(argv)
+    try:
+        with git.Repo(args.path, search_parent_directories=True) as repo:
+            history = VersionHistory(repo, args.path)
+            if args.query == "at":
+                result = history.version_at(args.rev)
+                error = f"No project version found at {args.rev}"
+            else:
+                result = history.first_commit(args.version, args.rev)
+                error = f"No commit with version {args.version} found"
+            history.save()
+    except (ReleaseException, git.GitError, BadName, OSError, ValueError) as ex:
+        result, error = None, str(ex)
+    if result is None:
+        print(f"ERROR: {error}")
+        sys.exit(1)
+    print(result)
@@ -0,0 +1,175 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import json
+import os
+import signal
+import sys
+from typing import NamedTuple, TextIO
+
+from release_tool.release_exception import ReleaseException
+
+DEFAULT_FILENAME = ".release-hooks.json"
+LINE_LIMIT = 1024 * 1024
+
+
+class HookException(ReleaseException):
+    pass
+
+
+class Hook(NamedTuple):
+    name: str
+    command: str | list[str]
+    needs: tuple[str, ...] = ()
+
+
+def read_hooks(filename: str) -> list[Hook]:
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            config = json.load(file)
+    except OSError as ex:
+        raise HookException(
+            f"Can't read hooks file '{filename}': {ex.strerror}"
+        ) from ex
+    except ValueError as ex:
+        raise HookException(f"Invalid hooks file '{filename}': {ex}") from ex
+    if not isinstance(config, dict):
+        raise HookException(f"Invalid hooks file '{filename}': expected an object")
+
+    hooks = [_parse_hook(name, entry) for name, entry in config.items()]
+    _check_dependencies(hooks)
+    return hooks
+
+
+def _parse_hook(name: str, entry) -> Hook:
+    if isinstance(entry, (str, list)):
+        entry = {"run": entry}
+    command = entry.get("run") if isinstance(entry, dict) else None
+    needs = entry.get("needs", []) if isinstance(entry, dict) else None
+    if not command or not isinstance(command, (str, list)):
+        raise HookException(f"Hook '{name}' has no command ('run')")
+    if not isinstance(needs, list):
+        raise HookException(f"Hook '{name}': 'needs' must be a list of hook names")
+    return Hook(name, command, tuple(needs))
+
+
+def _check_dependencies(hooks: list[Hook]) -> None:
+    names = {hook.name for hook in hooks}
+    for hook in hooks:
+        unknown = [need for need in hook.needs if need not in names]
+        if unknown:
+            raise HookException(
+                f"Hook '{hook.name}' needs unknown hooks: {', '.join(unknown)}"
+            )
+
+    done: set[str] = set()
+    remaining = list(hooks)
+    while remaining:
+        ready = [hook for hook in remaining if set(hook.needs) <= done]
+        if not ready:
+            raise HookException(
+                "Cyclic hook dependencies: "
+                + ", ".join(hook.name for hook in remaining)
+            )
+        done.update(hook.name for hook in ready)
+        remaining = [hook for hook in remaining if hook.name not in done]
+
+
+class HookRunner:
+    def __init__(
+        self, hooks: list[Hook], jobs: int | None = None, out: TextIO | None = None
+    ) -> None:
+        self.__hooks = hooks
+        self.__jobs = jobs or os.cpu_count() or 1
+        self.__out = out
+        self.__width = max((len(hook.name) for hook in hooks), default=0)
+
+    async def run(self, cwd: str, env: dict[str, str] | None = None) -> None:
+        done: set[str] = set()
+        pending = list(self.__hooks)
+        running: dict[asyncio.Task, Hook] = {}
+        try:
+            while pending or running:
+                for hook in [hook for hook in pending if set(hook.needs) <= done]:
+                    if len(running) >= self.__jobs:
+                        break
+                    pending.remove(hook)
+                    task = asyncio.create_task(self.__run_hook(hook, cwd, env))
+                    running[task] = hook
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    hook = running.pop(task)
+                    task.result()
+                    done.add(hook.name)
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def __run_hook(self, hook: Hook, cwd: str, env: dict[str, str] | None):
+        options = {
+            "cwd": cwd,
+            "env": env,
+            "stdin": asyncio.subprocess.DEVNULL,
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.STDOUT,
+            "limit": LINE_LIMIT,
+            "start_new_session": True,
+        }
+        try:
+            if isinstance(hook.command, str):
+                proc = await asyncio.create_subprocess_shell(hook.command, **options)
+            else:
+                proc = await asyncio.create_subprocess_exec(*hook.command, **options)
+        except OSError as ex:
+            raise HookException(f"Hook '{hook.name}' failed: {ex}") from ex
+
+        try:
+            async for line in proc.stdout:
+                self.__write(hook.name, line.decode("utf-8", "replace").rstrip("\r\n"))
+            status = await proc.wait()
+        except asyncio.CancelledError:
+            _terminate(proc)
+            await proc.wait()
+            self.__write(hook.name, "cancelled")
+            raise
+        except (ValueError, asyncio.LimitOverrunError) as ex:
+            _terminate(proc)
+            await proc.wait()
+            raise HookException(
+                f"Hook '{hook.name}' printed a line longer than {LINE_LIMIT} bytes"
+            ) from ex
+        if status:
+            raise HookException(f"Hook '{hook.name}' failed with exit code {status}")
+
+    def __write(self, name: str, line: str) -> None:
+        out = self.__out or sys.stdout
+        out.write(f"[{name:<{self.__width}}] {line}\n")
+        out.flush()
+
+
+def _terminate(proc: "asyncio.subprocess.Process") -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:
+            proc.terminate()
+    except ProcessLookupError:
+        pass
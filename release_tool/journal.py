@@ -0,0 +1,173 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+
+import git
+
+from release_tool.release_exception import ReleaseException
+from release_tool.tags import TagIndex
+from release_tool.worktree import state_path
+
+
+class JournalException(ReleaseException):
+    pass
+
+
+class ReleaseJournal:
+    FILENAME = "journal.json"
+
+    def __init__(self, repo: git.Repo) -> None:
+        self.__repo = repo
+        self.__filename = state_path(repo, self.FILENAME)
+        self.__state: dict | None = None
+
+    def load(self) -> dict | None:
+        try:
+            with open(self.__filename, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError as ex:
+            raise JournalException(
+                f"Corrupt release journal '{self.__filename}'"
+            ) from ex
+
+    def begin(
+        self,
+        version: str,
+        steps: list[str],
+        resume: bool,
+        paths: list[str] | None = None,
+    ) -> int:
+        state = self.load()
+        if not resume:
+            if state is not None:
+                raise JournalException(
+                    f"An incomplete release of {state['version']} exists, "
+                    "use --resume or --rollback"
+                )
+            self.__state = {
+                "version": version,
+                "head": self.__repo.head.commit.hexsha,
+                "steps": steps,
+                "paths": paths or [],
+                "completed": [],
+            }
+            self.__save()
+            return 0
+
+        if state is None:
+            raise JournalException("No incomplete release to resume")
+        if state["version"] != version or state["steps"] != steps:
+            raise JournalException(
+                f"The incomplete release of {state['version']} used different "
+                "arguments, resume with the same arguments or use --rollback"
+            )
+        self.__state = state
+        checkpoint = self.__checkpoint()
+        if self.__repo.head.commit.hexsha != checkpoint:
+            self.__repo.head.reset(checkpoint, index=False, working_tree=False)
+        return len(state["completed"])
+
+    def complete(
+        self, step: str, tags: list[str], checkpoint: dict | None = None
+    ) -> None:
+        state = self.__active_state()
+        entry = {"step": step, "head": self.__repo.head.commit.hexsha, "tags": tags}
+        if checkpoint:
+            entry["checkpoint"] = checkpoint
+        state["completed"].append(entry)
+        self.__save()
+
+    def checkpoints(self) -> list[dict]:
+        return [
+            entry.get("checkpoint", {}) for entry in self.__active_state()["completed"]
+        ]
+
+    def finish(self) -> None:
+        self.__state = None
+        self.clear()
+
+    def abort(self) -> None:
+        if self.__state is not None and not self.__state["completed"]:
+            self.finish()
+
+    def rollback(self) -> dict:
+        state = self.load()
+        if state is None:
+            raise JournalException("No incomplete release to roll back")
+        tags = [tag for entry in state["completed"] for tag in entry["tags"]]
+        index = TagIndex.for_git_dir(self.__repo.common_dir)
+        existing = [tag for tag in tags if tag in index]
+        if existing:
+            self.__repo.delete_tag(*existing)
+        paths = [
+            *state.get("paths", []),
+            *self.__repo.git.diff("--name-only", state["head"], "HEAD").splitlines(),
+        ]
+        self.__repo.head.reset(state["head"], index=False, working_tree=False)
+        self.__restore(state["head"], list(dict.fromkeys(paths)))
+        self.clear()
+        return state
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.__filename)
+        except FileNotFoundError:
+            pass
+
+    def __restore(self, head: str, paths: list[str]) -> None:
+        tree = self.__repo.commit(head).tree
+        existing = [path for path in paths if _in_tree(tree, path)]
+        if existing:
+            self.__repo.git.checkout(head, "--", *existing)
+        for path in paths:
+            if path in existing:
+                continue
+            self.__repo.git.rm("--cached", "--quiet", "--ignore-unmatch", "--", path)
+            try:
+                os.remove(os.path.join(self.__repo.working_tree_dir, path))
+            except FileNotFoundError:
+                pass
+
+    def __checkpoint(self) -> str:
+        state = self.__active_state()
+        if state["completed"]:
+            return state["completed"][-1]["head"]
+        return state["head"]
+
+    def __active_state(self) -> dict:
+        if self.__state is None:
+            raise JournalException("No release in progress")
+        return self.__state
+
+    def __save(self) -> None:
+        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+        tmp_name = self.__filename + ".tmp"
+        with open(tmp_name, "w", encoding="utf-8") as file:
+            json.dump(self.__state, file, indent=2)
+        os.replace(tmp_name, self.__filename)
+
+
+def _in_tree(tree: git.Tree, path: str) -> bool:
+    try:
+        tree.join(path)
+    except KeyError:
+        return False
+    return True
@@ -0,0 +1,121 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from release_tool.batch import BatchRelease, ReleaseJob, ReleaseResult
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import git
+
+
+class BranchJob(NamedTuple):
+    branch: str
+    version: str
+    next_version: str | None = None
+
+
+def parse_branch_job(value: str) -> BranchJob:
+    branch, separator, versions = value.partition("=")
+    version, _, next_version = versions.partition(",")
+    if not separator or not branch.strip() or not version.strip():
+        raise ValueError(f"'{value}' is not 'BRANCH=VERSION[,NEXT_VERSION]'")
+    return BranchJob(branch.strip(), version.strip(), next_version.strip() or None)
+
+
+class MaintenanceRelease:
+    def __init__(
+        self,
+        path: str,
+        create_steps: Callable,
+        jobs: int | None = None,
+        keep_going: bool = False,
+    ) -> None:
+        self.__path = path
+        self.__create_steps = create_steps
+        self.__jobs = jobs
+        self.__keep_going = keep_going
+
+    def run(
+        self, branch_jobs: Iterable[BranchJob], executor: "Executor | None" = None
+    ) -> Iterator[ReleaseResult]:
+        # pylint: disable-next=import-outside-toplevel
+        import git
+
+        repo = git.Repo(self.__path)
+        workdir = tempfile.mkdtemp(prefix="release-tool-worktrees-")
+        worktrees: dict[str, BranchJob] = {}
+        try:
+            failures = _add_worktrees(repo, workdir, branch_jobs, worktrees)
+            yield from failures
+            if failures and not self.__keep_going:
+                for job in worktrees.values():
+                    yield ReleaseResult(
+                        _release_job(job), False, "Cancelled", skipped=True
+                    )
+                return
+
+            batch = BatchRelease(self.__create_steps, self.__jobs, self.__keep_going)
+            release_jobs = [
+                ReleaseJob(target, job.version, job.next_version)
+                for target, job in worktrees.items()
+            ]
+            for result in batch.run(release_jobs, executor):
+                yield result._replace(job=_release_job(worktrees[result.job.path]))
+        finally:
+            for target in worktrees:
+                repo.git.worktree("remove", "--force", target)
+            repo.git.worktree("prune")
+            shutil.rmtree(workdir, ignore_errors=True)
+            repo.close()
+
+
+def _add_worktrees(
+    repo: "git.Repo",
+    workdir: str,
+    branch_jobs: Iterable[BranchJob],
+    worktrees: dict[str, BranchJob],
+) -> list[ReleaseResult]:
+    # pylint: disable-next=import-outside-toplevel
+    from git.exc import GitCommandError
+
+    failures = []
+    for index, job in enumerate(branch_jobs):
+        target = os.path.join(workdir, f"{index}-{_directory_name(job.branch)}")
+        try:
+            repo.git.worktree("add", "--quiet", target, job.branch)
+        except GitCommandError as ex:
+            error = str(ex.stderr).strip().removeprefix("stderr: ").strip("'")
+            failures.append(ReleaseResult(_release_job(job), False, error.strip()))
+            continue
+        worktrees[target] = job
+    return failures
+
+
+def _release_job(job: BranchJob) -> ReleaseJob:
+    return ReleaseJob(job.branch, job.version, job.next_version)
+
+
+def _directory_name(branch: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", branch)
@@ -0,0 +1,136 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import git
+
+from release_tool.batch import ReleaseJob
+from release_tool.plan import ReleasePlan
+from release_tool.projects import open_project
+from release_tool.release_cycle import (
+    ConditionFailedException,
+    commit_paths,
+    project_path,
+)
+from release_tool.tags import TagIndex, project_tag_name
+from release_tool.worktree import CleanSnapshot, DirtyCheckScope, is_dirty, overlay
+
+
+class MonorepoRelease:
+    def __init__(
+        self,
+        path: str,
+        jobs: list[ReleaseJob],
+        message: str | None = None,
+        scope: DirtyCheckScope = DirtyCheckScope.REPOSITORY,
+        repo: git.Repo | None = None,
+    ) -> None:
+        self.__path = path
+        self.__jobs = jobs
+        self.__message = message
+        self.__scope = scope
+        self.__owned_repo = (
+            git.Repo(path, search_parent_directories=True) if repo is None else None
+        )
+        self.__repo = repo or self.__owned_repo
+
+    def __enter__(self) -> "MonorepoRelease":  # noqa: PYI034 (typing.Self needs 3.11)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def repository(self) -> git.Repo:
+        return self.__repo
+
+    def close(self) -> None:
+        if self.__owned_repo is not None:
+            self.__owned_repo.close()
+            self.__owned_repo = None
+
+    def plan(self) -> ReleasePlan:
+        projects = [
+            (open_project(os.path.join(self.__path, job.path)), job.version)
+            for job in self.__jobs
+        ]
+        self.__check(projects)
+
+        releases = ", ".join(f"{proj.name} v{version}" for proj, version in projects)
+        message = (self.__message or "Release $v").replace("$v", releases)
+        plan = ReleasePlan(self.__repo)
+        with overlay(plan.files):
+            for proj, version in projects:
+                proj.set_new_version(version)
+        plan.commit(
+            [
+                path
+                for proj, _ in projects
+                for path in commit_paths(proj, self.__repo, [])
+            ],
+            message,
+        )
+        for proj, version in projects:
+            plan.tag(project_tag_name(proj.name, version), message)
+        return plan
+
+    def release(self) -> ReleasePlan:
+        plan = self.plan()
+        plan.apply()
+        return plan
+
+    def __check(self, projects: list) -> None:
+        if not projects:
+            raise ConditionFailedException("No subprojects to release")
+        names = [proj.name for proj, _ in projects]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ConditionFailedException(
+                f"Subprojects released more than once: {', '.join(duplicates)}"
+            )
+        if self.__is_dirty([proj for proj, _ in projects]):
+            raise ConditionFailedException("The project contains uncommited changes")
+
+        current = [proj.name for proj, version in projects if proj.version == version]
+        if current:
+            raise ConditionFailedException(
+                f"Version already up-to-date: {', '.join(current)}"
+            )
+        index = TagIndex.for_git_dir(self.__repo.common_dir)
+        existing = [
+            project_tag_name(proj.name, version)
+            for proj, version in projects
+            if project_tag_name(proj.name, version) in index
+        ]
+        if existing:
+            raise ConditionFailedException(f"Tags already exist: {', '.join(existing)}")
+
+    def __is_dirty(self, projects: list) -> bool:
+        if self.__scope == DirtyCheckScope.PROJECT:
+            return is_dirty(
+                self.__repo, [project_path(proj, self.__repo) for proj in projects]
+            )
+        if self.__scope == DirtyCheckScope.FILES:
+            return not CleanSnapshot(self.__repo).is_clean(
+                [
+                    path
+                    for proj in projects
+                    for path in commit_paths(proj, self.__repo, [])
+                ]
+            )
+        return self.__repo.is_dirty()
@@ -0,0 +1,241 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import difflib
+import hashlib
+import os
+import tempfile
+import time
+from io import BytesIO
+from typing import NamedTuple
+
+import git
+from git.exc import GitCommandError
+from gitdb import IStream, OStream
+
+from release_tool.release_exception import ReleaseException
+from release_tool.tree_commit import hash_blob, write_object, write_tree
+from release_tool.worktree import FileOverlay, replace_file
+
+
+class PlanException(ReleaseException):
+    pass
+
+
+class PlannedCommit(NamedTuple):
+    sha: str
+    tree: bytes
+    message: str
+    paths: list[str]
+
+
+class PlannedTag(NamedTuple):
+    name: str
+    sha: str
+    target: str
+
+
+class ObjectOverlay:
+    def __init__(self, repo: git.Repo) -> None:
+        self.__repo = repo
+        self.__objects: dict[bytes, tuple[bytes, bytes]] = {}
+        self.__blobs: dict[bytes, tuple[str, bytes]] = {}
+
+    @property
+    def objects(self) -> dict[bytes, tuple[bytes, bytes]]:
+        return dict(self.__objects)
+
+    @property
+    def blobs(self) -> dict[bytes, tuple[str, bytes]]:
+        return dict(self.__blobs)
+
+    def store_blob(self, path: str, data: bytes) -> bytes:
+        binsha = hash_blob(self.__repo, path, data)
+        self.__blobs[binsha] = (path, data)
+        return binsha
+
+    def store(self, istream: IStream) -> IStream:
+        data = istream.stream.read()
+        header = istream.type + b" " + str(len(data)).encode() + b"\0"
+        istream.binsha = hashlib.sha1(header + data).digest()
+        self.__objects[istream.binsha] = (istream.type, data)
+        return istream
+
+    def stream(self, binsha: bytes) -> OStream:
+        if binsha in self.__objects:
+            kind, data = self.__objects[binsha]
+            return OStream(binsha, kind, len(data), BytesIO(data))
+        return self.__repo.odb.stream(binsha)
+
+
+class ReleasePlan:  # pylint: disable=too-many-instance-attributes
+    def __init__(self, repo: git.Repo) -> None:
+        self.__repo = repo
+        self.__files = FileOverlay()
+        self.__odb = ObjectOverlay(repo)
+        self.__base = repo.head.commit
+        self.__commits: list[PlannedCommit] = []
+        self.__tags: list[PlannedTag] = []
+        self.__deferred: list = []
+        self.__skipped: list[str] = []
+
+    @property
+    def files(self) -> FileOverlay:
+        return self.__files
+
+    @property
+    def commits(self) -> list[PlannedCommit]:
+        return list(self.__commits)
+
+    @property
+    def tags(self) -> list[PlannedTag]:
+        return list(self.__tags)
+
+    @property
+    def deferred(self) -> list:
+        return list(self.__deferred)
+
+    @property
+    def head(self) -> str:
+        return self.__commits[-1].sha if self.__commits else self.__base.hexsha
+
+    def commit(self, paths: list[str], message: str) -> str:
+        blobs = {
+            path: self.__odb.store_blob(path, self.__content(path)) for path in paths
+        }
+        parent_tree = (
+            self.__commits[-1].tree if self.__commits else self.__base.tree.binsha
+        )
+        tree = write_tree(self.__repo, parent_tree, blobs, self.__odb)
+        author = _signature(git.Actor.author(self.__repo.config_reader()))
+        committer = _signature(git.Actor.committer(self.__repo.config_reader()))
+        data = (
+            f"tree {tree.hex()}\nparent {self.head}\n"
+            f"author {author}\ncommitter {committer}\n\n{message}"
+        )
+        sha = write_object(self.__repo, b"commit", data.encode("utf-8"), self.__odb)
+        self.__commits.append(PlannedCommit(sha.hex(), tree, message, paths))
+        return sha.hex()
+
+    def tag(self, name: str, message: str) -> str:
+        tagger = _signature(git.Actor.committer(self.__repo.config_reader()))
+        data = (
+            f"object {self.head}\ntype commit\ntag {name}\ntagger {tagger}\n\n"
+            f"{message.rstrip()}\n"
+        )
+        sha = write_object(self.__repo, b"tag", data.encode("utf-8"), self.__odb)
+        self.__tags.append(PlannedTag(name, sha.hex(), self.head))
+        return sha.hex()
+
+    def defer(self, step) -> None:
+        self.__deferred.append(step)
+
+    def skip(self, description: str) -> None:
+        self.__skipped.append(description)
+
+    def format(self) -> str:
+        lines = []
+        for filename, content in sorted(self.__files.files.items()):
+            path = self.__path(filename)
+            original = _read_original(filename)
+            lines += difflib.unified_diff(
+                (original or "").splitlines(),
+                content.splitlines(),
+                f"a/{path}" if original is not None else "/dev/null",
+                f"b/{path}",
+                lineterm="",
+            )
+        lines += [
+            f"commit {c.sha[:7]} {c.message.splitlines()[0]}" for c in self.__commits
+        ]
+        lines += [f"tag {t.name} -> {t.target[:7]}" for t in self.__tags]
+        if self.head != self.__base.hexsha:
+            lines.append(
+                f"update {self.__head_ref()} {self.__base.hexsha[:7]} -> {self.head[:7]}"
+            )
+        lines += [f"create refs/tags/{tag.name}" for tag in self.__tags]
+        lines += [f"after apply: {type(step).__name__}" for step in self.__deferred]
+        lines += [f"skipped: {description}" for description in self.__skipped]
+        return "\n".join(lines)
+
+    def apply(self) -> None:
+        for path, data in self.__odb.blobs.values():
+            hash_blob(self.__repo, path, data, write=True)
+        for kind, data in self.__odb.objects.values():
+            write_object(self.__repo, kind, data)
+        self.__update_refs()
+        for filename, content in self.__files.files.items():
+            replace_file(filename, content)
+        paths = sorted({path for commit in self.__commits for path in commit.paths})
+        if paths:
+            self.__repo.git.update_index("--add", "--", *paths)
+
+    def __update_refs(self) -> None:
+        updates = []
+        if self.head != self.__base.hexsha:
+            updates.append(f"update HEAD {self.head} {self.__base.hexsha}\n")
+        updates += [f"create refs/tags/{tag.name} {tag.sha}\n" for tag in self.__tags]
+        if not updates:
+            return
+        with tempfile.TemporaryFile() as stdin:
+            stdin.write("".join(updates).encode("utf-8"))
+            stdin.seek(0)
+            try:
+                self.__repo.git.update_ref(
+                    "-m", "release-tool: apply release plan", "--stdin", istream=stdin
+                )
+            except GitCommandError as ex:
+                raise PlanException(
+                    f"Updating the references failed: {ex.stderr.strip()}"
+                ) from ex
+
+    def __content(self, path: str) -> bytes:
+        filename = os.path.join(self.__repo.working_tree_dir, path)
+        content = self.__files.read(filename)
+        if content is not None:
+            return content.encode("utf-8")
+        with open(filename, "rb") as file:
+            return file.read()
+
+    def __path(self, filename: str) -> str:
+        path = os.path.relpath(
+            os.path.realpath(filename), os.path.realpath(self.__repo.working_tree_dir)
+        )
+        return path.replace(os.sep, "/")
+
+    def __head_ref(self) -> str:
+        if self.__repo.head.is_detached:
+            return "HEAD"
+        return self.__repo.head.ref.path
+
+
+def _signature(actor: git.Actor) -> str:
+    now = int(time.time())
+    offset = time.localtime(now).tm_gmtoff // 60
+    sign = "-" if offset < 0 else "+"
+    return (
+        f"{actor.name} <{actor.email}> {now} "
+        f"{sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+    )
+
+
+def _read_original(filename: str) -> str | None:
+    try:
+        with open(filename, "r", encoding="utf-8", newline="") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,160 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+
+class ProfileEvent(NamedTuple):
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.__events: list[ProfileEvent] = []
+        self.__lock = threading.Lock()
+        self.__origin = time.perf_counter()
+
+    @property
+    def events(self) -> list[ProfileEvent]:
+        with self.__lock:
+            return list(self.__events)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = ProfileEvent(
+                name,
+                category,
+                start - self.__origin,
+                time.perf_counter() - start,
+                threading.get_ident(),
+            )
+            with self.__lock:
+                self.__events.append(event)
+
+    @contextlib.contextmanager
+    def trace_git(self) -> Iterator[None]:
+        _GIT_HOOK.acquire()
+        token = _active_profiler.set(self)
+        try:
+            yield
+        finally:
+            _active_profiler.reset(token)
+            _GIT_HOOK.release()
+
+    def summary(self) -> str:
+        totals: dict[tuple[str, str], list[float]] = {}
+        for event in self.events:
+            totals.setdefault((event.category, event.name), []).append(event.duration)
+
+        lines = [f"{'category':<8} {'name':<40} {'calls':>5} {'total ms':>10}"]
+        for (category, name), durations in sorted(
+            totals.items(), key=lambda item: -sum(item[1])
+        ):
+            lines.append(
+                f"{category:<8} {name:<40} {len(durations):>5} "
+                f"{sum(durations) * 1000:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, filename: str) -> None:
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": event.start * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": pid,
+                    "tid": event.thread_id,
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
+
+
+_active_profiler: contextvars.ContextVar[Profiler | None] = contextvars.ContextVar(
+    "release_tool_profiler", default=None
+)
+
+
+# Git.execute is patched once for all tracing profilers and routes each call to
+# the profiler of the calling context, so overlapping traces (daemon requests)
+# neither see each other's calls nor leave the patch behind.
+class _GitHook:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__users = 0
+        self.__original = None
+
+    def acquire(self) -> None:
+        # pylint: disable-next=import-outside-toplevel
+        from git.cmd import Git
+
+        with self.__lock:
+            if not self.__users:
+                self.__original = Git.execute
+                Git.execute = _traced(Git.execute)
+            self.__users += 1
+
+    def release(self) -> None:
+        # pylint: disable-next=import-outside-toplevel
+        from git.cmd import Git
+
+        with self.__lock:
+            self.__users -= 1
+            if not self.__users:
+                Git.execute = self.__original
+                self.__original = None
+
+
+def git_span(command) -> contextlib.AbstractContextManager[None]:
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+    name = " ".join(command[:2]) if isinstance(command, list) else str(command)
+    return profiler.span(name, "git")
+
+
+def _traced(execute):
+    def traced_execute(self, command, *args, **kwargs):
+        with git_span(command):
+            return execute(self, command, *args, **kwargs)
+
+    return traced_execute
+
+
+_GIT_HOOK = _GitHook()
@@ -0,0 +1,103 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import importlib
+import os
+import threading
+from typing import NamedTuple
+
+from release_tool.release_exception import ReleaseException
+
+ENTRY_POINT_GROUP = "release_tool.projects"
+
+
+class UnsupportedProjectException(ReleaseException):
+    pass
+
+
+class ProjectHandler(NamedTuple):
+    marker: str
+    target: str
+
+    def load(self) -> type:
+        module, _, attr = self.target.partition(":")
+        return getattr(importlib.import_module(module), attr)
+
+
+BUILTIN_HANDLERS = (
+    ProjectHandler("CMakeLists.txt", "release_tool.cmake:CMakeProject"),
+)
+
+
+class ProjectRegistry:
+    def __init__(
+        self,
+        builtin: tuple[ProjectHandler, ...] = BUILTIN_HANDLERS,
+        group: str = ENTRY_POINT_GROUP,
+    ) -> None:
+        self.__builtin = builtin
+        self.__group = group
+        self.__plugins: tuple[ProjectHandler, ...] | None = None
+        self.__cache: dict[str, tuple[int, ProjectHandler | None]] = {}
+        self.__lock = threading.Lock()
+
+    def detect(self, path: str) -> ProjectHandler | None:
+        key = os.path.abspath(path)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            return None
+        with self.__lock:
+            cached = self.__cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        names = set(os.listdir(key))
+        handler = _match(self.__builtin, names) or _match(self.plugins(), names)
+        with self.__lock:
+            self.__cache[key] = (mtime, handler)
+        return handler
+
+    def open(self, path: str):
+        handler = self.detect(path)
+        if handler is None:
+            raise UnsupportedProjectException(f"'{path}' no supported project found")
+        return handler.load()(path)
+
+    def plugins(self) -> tuple[ProjectHandler, ...]:
+        if self.__plugins is None:
+            # pylint: disable-next=import-outside-toplevel
+            from importlib.metadata import entry_points
+
+            self.__plugins = tuple(
+                ProjectHandler(entry.name, entry.value)
+                for entry in entry_points(group=self.__group)
+            )
+        return self.__plugins
+
+
+def _match(
+    handlers: tuple[ProjectHandler, ...], names: set[str]
+) -> ProjectHandler | None:
+    return next((handler for handler in handlers if handler.marker in names), None)
+
+
+_registry = ProjectRegistry()
+
+
+def open_project(path: str):
+    return _registry.open(path)
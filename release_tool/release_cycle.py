@@ -16,76 +16,413 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import abc
+import asyncio
 import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import NamedTuple, TextIO
 
 import git
 
-from release_tool.cmake import CMakeProject
+from release_tool import async_git
+from release_tool.artifacts import ARCHIVE_FORMATS, ArchiveBuilder, Artifact
+from release_tool.changelog import (
+    format_changelog,
+    iter_commits,
+    prepend_section,
+    previous_release,
+    release_heading,
+)
+from release_tool.hooks import DEFAULT_FILENAME, HookRunner, read_hooks
+from release_tool.journal import ReleaseJournal
+from release_tool.plan import ReleasePlan
+from release_tool.profiling import Profiler
+
+# UnsupportedProjectException stays importable from here for existing callers.
+# pylint: disable-next=unused-import
+from release_tool.projects import (
+    UnsupportedProjectException,  # noqa: F401
+    open_project,
+)
 from release_tool.release_exception import ReleaseException
+from release_tool.tags import TagIndex, tag_name
+from release_tool.tree_commit import commit_working_tree_files
+from release_tool.version_files import VersionFiles
+from release_tool.worktree import CleanSnapshot, DirtyCheckScope, overlay
+
+NEXT_VERSION_MESSAGE = "Prepare next iteration"
 
 
-class UnsupportedProjectException(ReleaseException):
+class ConditionFailedException(ReleaseException):
     pass
 
 
-class ConditionFailedException(ReleaseException):
+class PushFailedException(ReleaseException):
     pass
 
 
 class Step(abc.ABC):
+    read_only = False
+
     @abc.abstractmethod
     def execute(self, proj, repo: git.Repo, new_version: str) -> None:
         raise NotImplementedError
 
+    async def execute_async(self, proj, repo: git.Repo, new_version: str) -> None:
+        await asyncio.to_thread(self.execute, proj, repo, new_version)
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:  # pylint: disable=unused-argument
+        self.execute(proj, repo, new_version)
+
+    def created_tags(self, new_version: str) -> list[str]:  # pylint: disable=unused-argument
+        return []
+
+    def touched_files(self, proj, repo: git.Repo) -> list[str]:  # pylint: disable=unused-argument
+        return []
+
+    def checkpoint(self) -> dict:
+        return {}
+
+    def restore(self, checkpoint: dict) -> None:
+        pass
+
 
 class PreconditionStep(Step):
+    read_only = True
+
+    def __init__(self, scope: DirtyCheckScope = DirtyCheckScope.REPOSITORY) -> None:
+        self.__scope = scope
+
     def execute(self, proj, repo: git.Repo, new_version: str) -> None:
-        if repo.is_dirty():
-            raise ConditionFailedException("The project contains uncommited changes")
-        if proj.version == new_version:
-            raise ConditionFailedException("Version already up-to-date")
+        _check_preconditions(self.__is_dirty(proj, repo), proj.version, new_version)
+
+    async def execute_async(self, proj, repo: git.Repo, new_version: str) -> None:
+        dirty = await self.__is_dirty_async(proj, repo)
+        _check_preconditions(dirty, proj.version, new_version)
+
+    def __is_dirty(self, proj, repo: git.Repo) -> bool:
+        if self.__scope == DirtyCheckScope.PROJECT:
+            return repo.is_dirty(path=project_path(proj, repo))
+        if self.__scope == DirtyCheckScope.FILES:
+            return not CleanSnapshot(repo).is_clean(
+                [project_path(proj, repo, path) for path in _project_files(proj)]
+            )
+        return repo.is_dirty()
+
+    async def __is_dirty_async(self, proj, repo: git.Repo) -> bool:
+        if self.__scope == DirtyCheckScope.PROJECT:
+            return await async_git.is_dirty(repo, [project_path(proj, repo)])
+        if self.__scope == DirtyCheckScope.FILES:
+            return await asyncio.to_thread(self.__is_dirty, proj, repo)
+        return await async_git.is_dirty(repo)
+
+
+def _check_preconditions(dirty: bool, version: str, new_version: str) -> None:
+    if dirty:
+        raise ConditionFailedException("The project contains uncommited changes")
+    if version == new_version:
+        raise ConditionFailedException("Version already up-to-date")
+
+
+class TagPreconditionStep(Step):
+    read_only = True
+
+    def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        if TagIndex.for_git_dir(repo.common_dir).has_version(new_version):
+            raise ConditionFailedException(
+                f"Tag '{tag_name(new_version)}' already exists"
+            )
 
 
 class UpdateVersionStep(Step):
+    def __init__(self, version_files: VersionFiles | None = None) -> None:
+        self.__version_files = version_files
+
+    def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        _set_version(proj, repo, new_version, self.__version_files)
+
+    def touched_files(self, proj, repo: git.Repo) -> list[str]:
+        return _version_files(proj, repo, self.__version_files)
+
+
+class ChangelogStep(Step):
+    def __init__(self, filename: str = "CHANGELOG.md", grouped: bool = True) -> None:
+        self.__filename = filename
+        self.__grouped = grouped
+        self.__text = ""
+
+    @property
+    def filename(self) -> str:
+        return self.__filename
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    def touched_files(self, proj, repo: git.Repo) -> list[str]:
+        return [self.__filename]
+
+    def checkpoint(self) -> dict:
+        return {"text": self.__text}
+
+    def restore(self, checkpoint: dict) -> None:
+        self.__text = checkpoint.get("text", "")
+
     def execute(self, proj, repo: git.Repo, new_version: str) -> None:
-        proj.set_new_version(new_version)
+        previous = previous_release(repo, new_version)
+        revision = f"{previous}..HEAD" if previous else "HEAD"
+        self.__text = format_changelog(iter_commits(repo, revision), self.__grouped)
+        section = release_heading(new_version)
+        if self.__text:
+            section += "\n\n" + self.__text
+        prepend_section(os.path.join(proj.directory, self.__filename), section)
 
 
 class CommitAndTagStep(Step):
-    def __init__(self, message: str | None = None) -> None:
+    def __init__(
+        self,
+        message: str | None = None,
+        direct: bool = False,
+        changelog: ChangelogStep | None = None,
+        version_files: VersionFiles | None = None,
+    ) -> None:
         self.__message = message if message else "Release v$v"
+        self.__direct = direct
+        self.__changelog = changelog
+        self.__version_files = version_files
 
     def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        commit_message, files = self.__prepare(proj, repo, new_version)
+        _commit(proj, repo, commit_message, self.__direct, files)
+        repo.create_tag(tag_name(new_version), message=commit_message)
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:
+        commit_message, files = self.__prepare(proj, repo, new_version)
+        plan.commit(commit_paths(proj, repo, files), commit_message)
+        plan.tag(tag_name(new_version), commit_message)
+
+    def __prepare(
+        self, proj, repo: git.Repo, new_version: str
+    ) -> tuple[str, list[str]]:
         commit_message = self.__message.replace("$v", new_version)
-        repo.index.add([proj.PROJECT_CONFIG])
-        repo.index.commit(commit_message)
-        repo.create_tag(f"v{new_version}", message=commit_message)
+        files = []
+        if self.__changelog:
+            commit_message = commit_message.replace("$changelog", self.__changelog.text)
+            files.append(self.__changelog.filename)
+        if self.__version_files:
+            files += self.__version_files.find(proj, repo, new_version)
+        return (commit_message, files)
+
+    def created_tags(self, new_version: str) -> list[str]:
+        return [tag_name(new_version)]
 
 
 class SetNextVersion(Step):
-    def __init__(self, next_version: str) -> None:
+    def __init__(
+        self,
+        next_version: str,
+        direct: bool = False,
+        version_files: VersionFiles | None = None,
+    ) -> None:
         self.__next_version = next_version
+        self.__direct = direct
+        self.__version_files = version_files
+
+    def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        files = _set_version(proj, repo, self.__next_version, self.__version_files)
+        _commit(proj, repo, NEXT_VERSION_MESSAGE, self.__direct, files)
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:
+        files = _set_version(proj, repo, self.__next_version, self.__version_files)
+        plan.commit(commit_paths(proj, repo, files), NEXT_VERSION_MESSAGE)
+
+    def touched_files(self, proj, repo: git.Repo) -> list[str]:
+        return _version_files(proj, repo, self.__version_files)
+
+
+class HookStep(Step):
+    def __init__(
+        self,
+        filename: str = DEFAULT_FILENAME,
+        jobs: int | None = None,
+        out: TextIO | None = None,
+    ) -> None:
+        self.__filename = filename
+        self.__jobs = jobs
+        self.__out = out
+
+    def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        asyncio.run(self.execute_async(proj, repo, new_version))
+
+    async def execute_async(self, proj, repo: git.Repo, new_version: str) -> None:
+        hooks = read_hooks(os.path.join(proj.directory, self.__filename))
+        env = {**os.environ, "RELEASE_VERSION": new_version}
+        await HookRunner(hooks, self.__jobs, self.__out).run(proj.directory, env)
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:
+        hooks = read_hooks(os.path.join(proj.directory, self.__filename))
+        plan.skip(f"hooks {', '.join(hook.name for hook in hooks)}")
+
+
+class ArtifactStep(Step):
+    def __init__(
+        self, output_dir: str = "dist", formats: tuple[str, ...] = ARCHIVE_FORMATS
+    ) -> None:
+        self.__output_dir = output_dir
+        self.__formats = formats
+        self.__artifacts: list[Artifact] = []
+
+    @property
+    def artifacts(self) -> list[Artifact]:
+        return list(self.__artifacts)
+
+    def execute(self, proj, repo: git.Repo, new_version: str) -> None:
+        output_dir = os.path.join(proj.directory, self.__output_dir)
+        builder = ArchiveBuilder(repo, output_dir, self.__formats)
+        self.__artifacts = builder.build(
+            tag_name(new_version), f"{proj.name}-{new_version}"
+        )
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:
+        plan.defer(self)
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{artifact.filename} ({artifact.size} bytes)\n  sha256 {artifact.sha256}"
+            for artifact in self.__artifacts
+        )
+
+
+class PushResult(NamedTuple):
+    ref: str
+    flag: str
+    summary: str
+
+    @property
+    def success(self) -> bool:
+        return self.flag != "!"
+
+
+class PushStep(Step):
+    def __init__(self, remote: str = "origin") -> None:
+        self.__remote = remote
+        self.__results: list[PushResult] = []
+        self.__duration = 0.0
+
+    @property
+    def remote(self) -> str:
+        return self.__remote
+
+    @property
+    def results(self) -> list[PushResult]:
+        return list(self.__results)
+
+    @property
+    def duration(self) -> float:
+        return self.__duration
 
     def execute(self, proj, repo: git.Repo, new_version: str) -> None:
-        proj.set_new_version(self.__next_version)
-        repo.index.add([proj.PROJECT_CONFIG])
-        repo.index.commit("Prepare next iteration")
+        if repo.head.is_detached:
+            raise ConditionFailedException("Can't push a detached HEAD")
+        branch = repo.active_branch
+        tracking = branch.tracking_branch()
+        target = branch.name
+        if tracking is not None and tracking.remote_name == self.__remote:
+            target = tracking.remote_head
+        refspecs = [f"HEAD:refs/heads/{target}", f"refs/tags/{tag_name(new_version)}"]
+
+        start = time.perf_counter()
+        status, stdout, stderr = repo.git.push(
+            "--atomic",
+            "--porcelain",
+            self.__remote,
+            *refspecs,
+            with_extended_output=True,
+            with_exceptions=False,
+        )
+        self.__duration = time.perf_counter() - start
+        self.__results = _parse_push_output(stdout)
+
+        if status or not all(result.success for result in self.__results):
+            details = "; ".join(
+                f"{result.ref} {result.summary}"
+                for result in self.__results
+                if not result.success
+            )
+            raise PushFailedException(
+                f"Push to '{self.__remote}' failed: {details or stderr.strip()}"
+            )
+
+    def plan(self, proj, repo: git.Repo, new_version: str, plan: ReleasePlan) -> None:
+        plan.defer(self)
+
+    def report(self) -> str:
+        lines = [f"Pushed to '{self.__remote}' in {self.__duration * 1000:.0f} ms"]
+        lines += [f"  {result.ref}: {result.summary}" for result in self.__results]
+        return "\n".join(lines)
+
+
+def _parse_push_output(output: str) -> list[PushResult]:
+    results = []
+    for line in output.splitlines():
+        fields = line.split("\t")
+        if len(fields) != 3:
+            continue
+        flag, refspec, summary = fields
+        results.append(PushResult(refspec.partition(":")[2], flag, summary))
+    return results
 
 
 class ReleaseCycle:
-    def __init__(self, proj, repo: git.Repo, steps: list) -> None:
+    def __init__(
+        self,
+        proj,
+        repo: git.Repo,
+        steps: list,
+        profiler: Profiler | None = None,
+        journal: ReleaseJournal | None = None,
+    ) -> None:
         self.__proj = proj
         self.__repo = repo
         self.__steps = steps
+        self.__profiler = profiler
+        self.__journal = journal
+        self.__owned_repo: git.Repo | None = None
 
-    @classmethod
-    def from_path(cls, path: str, steps: list):
-        repo = git.Repo(path)
+    def __enter__(self) -> "ReleaseCycle":  # noqa: PYI034 (typing.Self needs 3.11)
+        return self
 
-        if os.path.isfile(os.path.join(path, CMakeProject.PROJECT_CONFIG)):
-            proj = CMakeProject(path)
-            return cls(proj, repo, steps)
-        raise UnsupportedProjectException(f"'{path}' no supported project found")
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.__owned_repo is not None:
+            self.__owned_repo.close()
+            self.__owned_repo = None
+
+    # Called by from_path on the new instance, which pylint doesn't track.
+    def __own_repository(self) -> None:  # pylint: disable=unused-private-member
+        self.__owned_repo = self.__repo
+
+    @classmethod
+    def from_path(
+        cls,
+        path: str,
+        steps: list,
+        profiler: Profiler | None = None,
+        journal: bool = False,
+        repo: git.Repo | None = None,
+    ):
+        proj = open_project(path)
+        owns_repo = repo is None
+        repo = git.Repo(path) if repo is None else repo
+        cycle = cls(
+            proj, repo, steps, profiler, ReleaseJournal(repo) if journal else None
+        )
+        if owns_repo:
+            cycle.__own_repository()
+        return cycle
 
     def number_of_steps(self) -> int:
         return len(self.__steps)
@@ -98,7 +435,154 @@ class ReleaseCycle:
     def project(self):
         return self.__proj
 
-    def create_release(self, new_version: str):
+    def create_release(self, new_version: str, resume: bool = False):
+        version = new_version.strip()
+        first = 0
+        if self.__journal:
+            names = [type(step).__name__ for step in self.__steps]
+            paths = [] if resume else self.__touched_paths()
+            first = self.__journal.begin(version, names, resume, paths)
+            for step, checkpoint in zip(self.__steps, self.__journal.checkpoints()):
+                if isinstance(step, Step):
+                    step.restore(checkpoint)
+
+        try:
+            with self.__profiler.trace_git() if self.__profiler else nullcontext():
+                for group in _group_steps(self.__steps[first:]):
+                    if len(group) > 1:
+                        asyncio.run(self.__execute_concurrently(group, version))
+                    else:
+                        self.__execute(group[0], version)
+        except BaseException:
+            if self.__journal:
+                self.__journal.abort()
+            raise
+
+        if self.__journal:
+            self.__journal.finish()
+
+    def plan_release(self, new_version: str) -> ReleasePlan:
         version = new_version.strip()
-        for step in self.__steps:
+        plan = ReleasePlan(self.__repo)
+        with overlay(plan.files):
+            for step in self.__steps:
+                with self.__span(step):
+                    step.plan(self.__proj, self.__repo, version, plan)
+        return plan
+
+    def apply_plan(self, plan: ReleasePlan, new_version: str) -> None:
+        plan.apply()
+        for step in plan.deferred:
+            with self.__span(step):
+                step.execute(self.__proj, self.__repo, new_version.strip())
+
+    def __execute(self, step, version: str) -> None:
+        with self.__span(step):
             step.execute(self.__proj, self.__repo, version)
+        self.__complete(step, version)
+
+    async def __execute_concurrently(self, steps: list[Step], version: str) -> None:
+        results = await asyncio.gather(
+            *(self.__execute_async(step, version) for step in steps),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for step in steps:
+            self.__complete(step, version)
+
+    async def __execute_async(self, step: Step, version: str) -> None:
+        with self.__span(step):
+            await step.execute_async(self.__proj, self.__repo, version)
+
+    def __touched_paths(self) -> list[str]:
+        files = [
+            filename
+            for step in self.__steps
+            if isinstance(step, Step)
+            for filename in step.touched_files(self.__proj, self.__repo)
+        ]
+        return commit_paths(self.__proj, self.__repo, files)
+
+    def __span(self, step):
+        if self.__profiler:
+            return self.__profiler.span(type(step).__name__, "step")
+        return nullcontext()
+
+    def __complete(self, step, version: str) -> None:
+        if self.__journal:
+            self.__journal.complete(
+                type(step).__name__,
+                step.created_tags(version),
+                step.checkpoint() if isinstance(step, Step) else None,
+            )
+
+
+def _group_steps(steps: list) -> list[list]:
+    groups: list[list] = []
+    for step in steps:
+        if _is_read_only(step) and groups and _is_read_only(groups[-1][-1]):
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def _is_read_only(step) -> bool:
+    return isinstance(step, Step) and step.read_only
+
+
+# IndexFile.add changes the process working directory while it runs, so releases
+# in concurrent threads (daemon, worktrees) must not stage at the same time.
+_INDEX_ADD_LOCK = threading.Lock()
+
+
+def project_path(proj, repo: git.Repo, filename: str = "") -> str:
+    path = os.path.relpath(
+        os.path.realpath(os.path.join(proj.directory, filename)),
+        os.path.realpath(repo.working_tree_dir),
+    )
+    return path.replace(os.sep, "/")
+
+
+def _project_files(proj) -> list[str]:
+    return list(dict.fromkeys([proj.PROJECT_CONFIG, proj.version_file]))
+
+
+def commit_paths(proj, repo: git.Repo, files: list[str]) -> list[str]:
+    return [
+        project_path(proj, repo, filename)
+        for filename in dict.fromkeys([*_project_files(proj), *files])
+    ]
+
+
+def _set_version(
+    proj, repo: git.Repo, new_version: str, version_files: VersionFiles | None
+) -> list[str]:
+    old_version = proj.version
+    proj.set_new_version(new_version)
+    if version_files is None:
+        return []
+    return version_files.update(proj, repo, old_version, new_version)
+
+
+def _version_files(
+    proj, repo: git.Repo, version_files: VersionFiles | None
+) -> list[str]:
+    if version_files is None:
+        return []
+    return version_files.find(proj, repo, proj.version)
+
+
+def _commit(
+    proj, repo: git.Repo, message: str, direct: bool, files: list[str] | None = None
+) -> git.Commit:
+    if direct:
+        return commit_working_tree_files(
+            repo, commit_paths(proj, repo, files or []), message
+        )
+    files = list(dict.fromkeys([*_project_files(proj), *(files or [])]))
+    with _INDEX_ADD_LOCK:
+        repo.index.add(files)
+    return repo.index.commit(message)
@@ -0,0 +1,121 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+import git
+
+DEFAULT_CAPACITY = 8
+
+
+class _PoolEntry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.repo: git.Repo | None = None
+        self.users = 0
+
+    def close(self) -> None:
+        if self.repo:
+            self.repo.close()
+            self.repo = None
+
+
+class PoolStats(NamedTuple):
+    open: int
+    in_use: int
+    capacity: int
+    opened: int
+    closed: int
+
+
+class RepoPool:
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        factory: Callable[[str], git.Repo] = git.Repo,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("The pool capacity must be at least 1")
+        self.__capacity = capacity
+        self.__factory = factory
+        self.__entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__opened = 0
+        self.__closed = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return sum(1 for entry in self.__entries.values() if entry.repo)
+
+    def stats(self) -> PoolStats:
+        with self.__lock:
+            return PoolStats(
+                sum(1 for entry in self.__entries.values() if entry.repo),
+                sum(1 for entry in self.__entries.values() if entry.users),
+                self.__capacity,
+                self.__opened,
+                self.__closed,
+            )
+
+    @contextlib.contextmanager
+    def acquire(self, path: str) -> Iterator[git.Repo]:
+        key = os.path.realpath(path)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = _PoolEntry()
+                self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            entry.users += 1
+
+        try:
+            with entry.lock:
+                if entry.repo is None:
+                    entry.repo = self.__factory(key)
+                    with self.__lock:
+                        self.__opened += 1
+                yield entry.repo
+        finally:
+            with self.__lock:
+                entry.users -= 1
+                self.__evict()
+
+    def close(self) -> None:
+        with self.__lock:
+            for entry in self.__entries.values():
+                self.__close(entry)
+            self.__entries.clear()
+
+    def __evict(self) -> None:
+        idle = [key for key, entry in self.__entries.items() if not entry.users]
+        excess = len(self.__entries) - self.__capacity
+        for key in idle[: max(excess, 0)]:
+            self.__close(self.__entries.pop(key))
+
+    def __close(self, entry: _PoolEntry) -> None:
+        if entry.repo:
+            entry.close()
+            self.__closed += 1
@@ -0,0 +1,82 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import resource
+import sys
+from typing import NamedTuple
+
+_PROC_SELF = "/proc/self"
+_MIB = 1024 * 1024
+
+
+class ResourceUsage(NamedTuple):
+    rss: int | None
+    peak_rss: int
+    open_files: int | None
+    child_processes: int | None
+
+
+def resource_usage() -> ResourceUsage:
+    return ResourceUsage(_rss(), _peak_rss(), _count_entries("fd"), _child_processes())
+
+
+def format_usage(usage: ResourceUsage) -> str:
+    parts = [f"peak rss {usage.peak_rss / _MIB:.1f} MiB"]
+    if usage.rss is not None:
+        parts.insert(0, f"rss {usage.rss / _MIB:.1f} MiB")
+    if usage.open_files is not None:
+        parts.append(f"{usage.open_files} open files")
+    if usage.child_processes is not None:
+        parts.append(f"{usage.child_processes} child processes")
+    return ", ".join(parts)
+
+
+def _rss() -> int | None:
+    try:
+        with open(os.path.join(_PROC_SELF, "statm"), "r", encoding="utf-8") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def _peak_rss() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _count_entries(name: str) -> int | None:
+    try:
+        return len(os.listdir(os.path.join(_PROC_SELF, name)))
+    except OSError:
+        return None
+
+
+def _child_processes() -> int | None:
+    tasks = os.path.join(_PROC_SELF, "task")
+    if not os.path.exists(os.path.join(tasks, str(os.getpid()), "children")):
+        return None
+    children = 0
+    for task in os.listdir(tasks):
+        try:
+            with open(
+                os.path.join(tasks, task, "children"), "r", encoding="utf-8"
+            ) as file:
+                children += len(file.read().split())
+        except FileNotFoundError:
+            continue
+    return children
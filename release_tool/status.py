@@ -0,0 +1,207 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from argparse import Namespace
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import git
+from git.exc import GitError
+
+from release_tool.cmake import CMakeProject
+from release_tool.cmake_variables import file_stamp
+from release_tool.release_exception import ReleaseException
+from release_tool.tags import TagIndex, tag_name
+
+CACHE_FILENAME = "status-cache.json"
+
+
+class RepoStatus(NamedTuple):
+    path: str
+    name: str | None = None
+    version: str | None = None
+    latest_tag: str | None = None
+    commits_since_tag: int | None = None
+    dirty: bool | None = None
+    error: str | None = None
+
+
+def default_cache_path() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "release-tool", CACHE_FILENAME)
+
+
+class ProjectCache:
+    def __init__(self, filename: str | None = None) -> None:
+        self.__filename = filename
+        self.__entries: dict[str, dict] = {}
+        self.__lock = threading.Lock()
+        if filename:
+            try:
+                with open(filename, "r", encoding="utf-8") as file:
+                    self.__entries = json.load(file)
+            except (OSError, ValueError):
+                pass
+
+    def project(self, directory: str) -> tuple[str | None, str | None]:
+        filename = os.path.join(directory, CMakeProject.PROJECT_CONFIG)
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return (None, None)
+        stamp = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+        with self.__lock:
+            entry = self.__entries.get(filename)
+        if entry and entry["stamp"] == stamp and _includes_current(directory, entry):
+            return (entry["name"], entry["version"])
+
+        with open(filename, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        if entry and entry["hash"] == digest and _includes_current(directory, entry):
+            name, version = entry["name"], entry["version"]
+            includes = entry.get("includes", {})
+        else:
+            proj = CMakeProject(directory)
+            name, version = proj.name, proj.version
+            includes = {
+                path: list(include_stamp) if include_stamp else None
+                for path, include_stamp in proj.files.items()
+                if path != CMakeProject.PROJECT_CONFIG
+            }
+        with self.__lock:
+            self.__entries[filename] = {
+                "stamp": stamp,
+                "hash": digest,
+                "includes": includes,
+                "name": name,
+                "version": version,
+            }
+        return (name, version)
+
+    def save(self) -> None:
+        if not self.__filename:
+            return
+        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+        tmp_name = self.__filename + ".tmp"
+        with self.__lock, open(tmp_name, "w", encoding="utf-8") as file:
+            json.dump(self.__entries, file)
+        os.replace(tmp_name, self.__filename)
+
+
+def _includes_current(directory: str, entry: dict) -> bool:
+    return all(
+        stamp is not None
+        and list(file_stamp(os.path.join(directory, path)) or []) == stamp
+        for path, stamp in entry.get("includes", {}).items()
+    )
+
+
+def find_repositories(root: str) -> Iterator[str]:
+    if os.path.exists(os.path.join(root, ".git")):
+        yield root
+        return
+    try:
+        entries = sorted(os.scandir(root), key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+            yield from find_repositories(entry.path)
+
+
+def repository_status(path: str, cache: ProjectCache) -> RepoStatus:
+    try:
+        name, version = cache.project(path)
+        command = git.Git(path)
+        latest = TagIndex(_common_dir(path)).latest_version()
+        latest_tag = tag_name(latest) if latest else None
+        revision = f"{latest_tag}..HEAD" if latest_tag else "HEAD"
+        commits = int(command.rev_list("--count", revision))
+        dirty = bool(command.status("--porcelain", "--untracked-files=no"))
+    except (ReleaseException, GitError, OSError, ValueError) as ex:
+        return RepoStatus(path, error=str(ex) or type(ex).__name__)
+    return RepoStatus(path, name, version, latest_tag, commits, dirty)
+
+
+def scan(
+    paths: Iterable[str], cache: ProjectCache, jobs: int | None = None
+) -> Iterator[RepoStatus]:
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    max_pending = workers * 2
+    with ThreadPoolExecutor(workers) as executor:
+        pending: set[Future] = set()
+        for path in paths:
+            pending.add(executor.submit(repository_status, path, cache))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+
+
+def _common_dir(path: str) -> str:
+    git_dir = os.path.join(path, ".git")
+    if os.path.isfile(git_dir):
+        with open(git_dir, "r", encoding="utf-8") as file:
+            content = file.read().strip()
+        if not content.startswith("gitdir:"):
+            raise ValueError(f"Invalid .git file in '{path}'")
+        git_dir = os.path.join(path, content[len("gitdir:") :].strip())
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as file:
+            git_dir = os.path.join(git_dir, file.read().strip())
+    except FileNotFoundError:
+        pass
+    return os.path.normpath(git_dir)
+
+
+def parse_status_args(argv: list[str] | None = None) -> Namespace:
+    parser = argparse.ArgumentParser(
+        prog="release-tool status",
+        description="Reports the version status of all repositories below ROOT",
+    )
+    parser.add_argument("root", nargs="*", default=[os.getcwd()])
+    parser.add_argument("--jobs", "-j", type=int, help="Number of parallel scans")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Don't use the project metadata cache"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_status_args(argv)
+    cache = ProjectCache(None if args.no_cache else default_cache_path())
+    paths = (path for root in args.root for path in find_repositories(root))
+    try:
+        for status in scan(paths, cache, args.jobs):
+            sys.stdout.write(json.dumps(status._asdict()) + "\n")
+            sys.stdout.flush()
+    finally:
+        cache.save()
@@ -0,0 +1,155 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import bisect
+import os
+import re
+import threading
+from collections import OrderedDict
+
+TAG_PREFIX = "v"
+TAGS_REF = "refs/tags/"
+CACHE_SIZE = 64
+
+_VERSION = re.compile(
+    r"(?P<release>\d+(?:\.\d+)*)(?:-(?P<pre>[0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?"
+)
+
+_cache: OrderedDict[str, "TagIndex"] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def tag_name(version: str) -> str:
+    return f"{TAG_PREFIX}{version}"
+
+
+def project_tag_name(name: str, version: str) -> str:
+    return f"{name}/{tag_name(version)}"
+
+
+def version_key(version: str) -> tuple | None:
+    match = _VERSION.fullmatch(version)
+    if not match:
+        return None
+    release = tuple(int(part) for part in match.group("release").split("."))
+    release += (0,) * (3 - len(release))
+    pre = match.group("pre")
+    if pre is None:
+        return (release, 1, ())
+    identifiers = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in pre.split(".")
+    )
+    return (release, 0, identifiers)
+
+
+class TagIndex:
+    def __init__(self, git_dir: str) -> None:
+        self.__git_dir = git_dir
+        self.__stamp = _refs_stamp(git_dir)
+        self.__tags = _read_packed_tags(git_dir)
+        self.__tags.update(_read_loose_tags(git_dir))
+        versions = []
+        for name in self.__tags:
+            if name.startswith(TAG_PREFIX):
+                key = version_key(name[len(TAG_PREFIX) :])
+                if key is not None:
+                    versions.append((key, name[len(TAG_PREFIX) :]))
+        versions.sort()
+        self.__all = ([key for key, _ in versions], [v for _, v in versions])
+        releases = [(key, v) for key, v in versions if key[1] == 1]
+        self.__releases = ([key for key, _ in releases], [v for _, v in releases])
+
+    @classmethod
+    def for_git_dir(cls, git_dir: str) -> "TagIndex":
+        git_dir = os.path.abspath(git_dir)
+        with _cache_lock:
+            index = _cache.get(git_dir)
+            if index is None or not index.is_current():
+                index = cls(git_dir)
+                _cache[git_dir] = index
+            _cache.move_to_end(git_dir)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+            return index
+
+    def is_current(self) -> bool:
+        return self.__stamp == _refs_stamp(self.__git_dir)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__tags
+
+    def __len__(self) -> int:
+        return len(self.__tags)
+
+    def sha(self, name: str) -> str | None:
+        return self.__tags.get(name)
+
+    def has_version(self, version: str) -> bool:
+        return tag_name(version) in self.__tags
+
+    def latest_version(
+        self, below: str | None = None, prereleases: bool = False
+    ) -> str | None:
+        keys, versions = self.__all if prereleases else self.__releases
+        end = len(keys)
+        if below is not None:
+            key = version_key(below)
+            if key is None:
+                raise ValueError(f"Invalid version '{below}'")
+            end = bisect.bisect_left(keys, key)
+        return versions[end - 1] if end > 0 else None
+
+
+def _read_packed_tags(git_dir: str) -> dict[str, str]:
+    tags = {}
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, ref = line.rstrip("\n").partition(" ")
+                if ref.startswith(TAGS_REF):
+                    tags[ref[len(TAGS_REF) :]] = sha
+    except FileNotFoundError:
+        pass
+    return tags
+
+
+def _read_loose_tags(git_dir: str) -> dict[str, str]:
+    tags = {}
+    root = os.path.join(git_dir, TAGS_REF)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "r", encoding="utf-8") as file:
+                tags[os.path.relpath(path, root).replace(os.sep, "/")] = (
+                    file.read().strip()
+                )
+    return tags
+
+
+def _refs_stamp(git_dir: str) -> tuple:
+    stamp = []
+    try:
+        stat = os.stat(os.path.join(git_dir, "packed-refs"))
+        stamp.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    except FileNotFoundError:
+        stamp.append(None)
+    for dirpath, _, _ in os.walk(os.path.join(git_dir, TAGS_REF)):
+        stamp.append((dirpath, os.stat(dirpath).st_mtime_ns))
+    return tuple(stamp)
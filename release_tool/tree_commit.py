@@ -0,0 +1,102 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import tempfile
+from io import BytesIO
+
+import git
+from git.exc import GitCommandError
+from git.objects.fun import tree_entries_from_data
+from gitdb import IStream
+
+from release_tool.release_exception import ReleaseException
+
+BLOB_MODE = 0o100644
+TREE_MODE = 0o040000
+
+
+class TreeCommitException(ReleaseException):
+    pass
+
+
+def write_object(repo: git.Repo, kind: bytes, data: bytes, odb=None) -> bytes:
+    return (odb or repo.odb).store(IStream(kind, len(data), BytesIO(data))).binsha
+
+
+def write_tree(
+    repo: git.Repo, tree_sha: bytes | None, blobs: dict[str, bytes], odb=None
+) -> bytes:
+    entries = _read_tree(odb or repo.odb, tree_sha)
+
+    subtrees: dict[str, dict[str, bytes]] = {}
+    for path, binsha in blobs.items():
+        name, _, rest = path.partition("/")
+        if rest:
+            subtrees.setdefault(name, {})[rest] = binsha
+        else:
+            entries[name] = (binsha, entries.get(name, (b"", BLOB_MODE))[1])
+
+    for name, sub_blobs in subtrees.items():
+        existing = entries.get(name)
+        sub_sha = existing[0] if existing and existing[1] == TREE_MODE else None
+        entries[name] = (write_tree(repo, sub_sha, sub_blobs, odb), TREE_MODE)
+
+    def sort_key(name: str) -> bytes:
+        return (name + "/" if entries[name][1] == TREE_MODE else name).encode()
+
+    data = b"".join(
+        f"{entries[name][1]:o} {name}".encode() + b"\0" + entries[name][0]
+        for name in sorted(entries, key=sort_key)
+    )
+    return write_object(repo, b"tree", data, odb)
+
+
+def _read_tree(odb, tree_sha: bytes | None) -> dict[str, tuple[bytes, int]]:
+    if tree_sha is None:
+        return {}
+    data = odb.stream(tree_sha).read()
+    return {name: (binsha, mode) for binsha, mode, name in tree_entries_from_data(data)}
+
+
+def hash_blob(repo: git.Repo, path: str, data: bytes, write: bool = False) -> bytes:
+    options = ["-w"] if write else []
+    with tempfile.TemporaryFile() as stdin:
+        stdin.write(data)
+        stdin.seek(0)
+        sha = repo.git.hash_object(*options, "--stdin", f"--path={path}", istream=stdin)
+    return bytes.fromhex(sha)
+
+
+def commit_blobs(repo: git.Repo, blobs: dict[str, bytes], message: str) -> git.Commit:
+    parent = repo.head.commit
+    tree = git.Tree(repo, write_tree(repo, parent.tree.binsha, blobs))
+    return git.Commit.create_from_tree(
+        repo, tree, message, parent_commits=[parent], head=True
+    )
+
+
+def commit_working_tree_files(
+    repo: git.Repo, paths: list[str], message: str
+) -> git.Commit:
+    try:
+        shas = repo.git.hash_object("-w", "--", *paths).split()
+        repo.git.update_index("--add", "--", *paths)
+    except GitCommandError as ex:
+        raise TreeCommitException(
+            f"Staging {', '.join(paths)} failed: {str(ex.stderr).strip()}"
+        ) from ex
+    return commit_blobs(repo, dict(zip(paths, map(bytes.fromhex, shas))), message)
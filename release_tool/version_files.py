@@ -0,0 +1,219 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import abc
+import json
+import os
+import re
+
+import git
+
+from release_tool.cmake import CMakeProject
+from release_tool.worktree import overlay_active, read_file, replace_file, state_path
+
+
+class VersionFileHandler(abc.ABC):
+    name = ""
+    filenames: tuple[str, ...] = ()
+
+    def matches(self, filename: str) -> bool:
+        return os.path.basename(filename) in self.filenames
+
+    @abc.abstractmethod
+    def contains_version(self, filename: str, version: str) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_version(self, filename: str, old_version: str, new_version: str) -> None:
+        raise NotImplementedError
+
+
+class PatternHandler(VersionFileHandler):
+    def __init__(self, name: str, filenames: tuple[str, ...], pattern: str) -> None:
+        self.name = name
+        self.filenames = filenames
+        self.__pattern = pattern
+
+    def contains_version(self, filename: str, version: str) -> bool:
+        return self.__regex(version).search(read_file(filename)) is not None
+
+    def set_version(self, filename: str, old_version: str, new_version: str) -> None:
+        content = read_file(filename)
+        result = self.__regex(old_version).sub(
+            lambda match: match.group("prefix") + new_version, content
+        )
+        if result != content:
+            replace_file(filename, result)
+
+    def __regex(self, version: str) -> re.Pattern:
+        return re.compile(
+            self.__pattern.format(version=re.escape(version)), re.MULTILINE
+        )
+
+
+class CMakeListsHandler(VersionFileHandler):
+    name = "cmake"
+    filenames = (CMakeProject.PROJECT_CONFIG,)
+
+    def contains_version(self, filename: str, version: str) -> bool:
+        try:
+            return CMakeProject(os.path.dirname(filename)).version == version
+        except ValueError:
+            return False
+
+    def set_version(self, filename: str, old_version: str, new_version: str) -> None:
+        proj = CMakeProject(os.path.dirname(filename))
+        if proj.version == old_version:
+            proj.set_new_version(new_version)
+
+
+DEFAULT_HANDLERS: tuple[VersionFileHandler, ...] = (
+    PatternHandler(
+        "vcpkg",
+        ("vcpkg.json",),
+        r'(?P<prefix>"version(?:-semver|-string)?"\s*:\s*")(?P<version>{version})(?=")',
+    ),
+    PatternHandler(
+        "conan",
+        ("conanfile.py",),
+        r"(?P<prefix>^\s*version\s*=\s*[\"'])(?P<version>{version})(?=[\"'])",
+    ),
+    PatternHandler(
+        "header",
+        ("version.h.in", "version.h", "version.hpp.in", "version.hpp"),
+        r'(?P<prefix>^\s*#\s*define\s+\w*VERSION\w*\s+"?)(?P<version>{version})(?![\w.-])',
+    ),
+    PatternHandler(
+        "doxygen",
+        ("Doxyfile", "Doxyfile.in"),
+        r'(?P<prefix>^\s*PROJECT_NUMBER\s*=\s*"?)(?P<version>{version})(?![\w.-])',
+    ),
+    CMakeListsHandler(),
+)
+
+
+class VersionFiles:
+    INDEX_FILENAME = "version-files.json"
+
+    def __init__(
+        self, handlers: tuple[VersionFileHandler, ...] = DEFAULT_HANDLERS
+    ) -> None:
+        self.__handlers = {handler.name: handler for handler in handlers}
+
+    def find(self, proj, repo: git.Repo, version: str) -> list[str]:
+        return sorted(self.__current_index(proj, repo, version)["sites"])
+
+    def update(
+        self, proj, repo: git.Repo, old_version: str, new_version: str
+    ) -> list[str]:
+        index = self.__current_index(proj, repo, old_version)
+        for path, name in index["sites"].items():
+            self.__handlers[name].set_version(
+                os.path.join(proj.directory, path), old_version, new_version
+            )
+        self.__save_index(
+            repo,
+            self.__index(proj, repo, new_version, index["files"], index["sites"]),
+        )
+        return sorted(index["sites"])
+
+    def __current_index(self, proj, repo: git.Repo, version: str) -> dict:
+        index = _load_index(state_path(repo, self.INDEX_FILENAME))
+        if not self.__is_current(index, proj, repo, version):
+            index = self.__scan(proj, repo, version)
+            self.__save_index(repo, index)
+        return index
+
+    def __is_current(
+        self, index: dict | None, proj, repo: git.Repo, version: str
+    ) -> bool:
+        return (
+            index is not None
+            and index.get("version") == version
+            and index.get("tracked") == _stamp(repo.index.path)
+            and index.get("directory") == os.path.realpath(proj.directory)
+            and index.get("handlers") == sorted(self.__handlers)
+            and all(
+                _stamp(os.path.join(proj.directory, path)) == stamp
+                for path, stamp in index["files"].items()
+            )
+        )
+
+    def __scan(self, proj, repo: git.Repo, version: str) -> dict:
+        candidates = [
+            path
+            for path in _tracked_files(proj, repo)
+            if path != proj.PROJECT_CONFIG
+            and any(handler.matches(path) for handler in self.__handlers.values())
+        ]
+        sites = {}
+        for path in candidates:
+            filename = os.path.join(proj.directory, path)
+            for handler in self.__handlers.values():
+                if handler.matches(path) and handler.contains_version(
+                    filename, version
+                ):
+                    sites[path] = handler.name
+                    break
+        return self.__index(proj, repo, version, candidates, sites)
+
+    def __index(
+        self, proj, repo: git.Repo, version: str, files, sites: dict[str, str]
+    ) -> dict:
+        return {
+            "version": version,
+            "tracked": _stamp(repo.index.path),
+            "directory": os.path.realpath(proj.directory),
+            "handlers": sorted(self.__handlers),
+            "files": {
+                path: _stamp(os.path.join(proj.directory, path)) for path in files
+            },
+            "sites": sites,
+        }
+
+    def __save_index(self, repo: git.Repo, index: dict) -> None:
+        if overlay_active():
+            return
+        filename = state_path(repo, self.INDEX_FILENAME)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+
+
+def _tracked_files(proj, repo: git.Repo) -> list[str]:
+    prefix = os.path.relpath(
+        os.path.realpath(proj.directory), os.path.realpath(repo.working_tree_dir)
+    ).replace(os.sep, "/")
+    prefix = "" if prefix == "." else prefix + "/"
+    output = repo.git.ls_files("-z", "--", prefix or ".")
+    return [path[len(prefix) :] for path in output.split("\0") if path]
+
+
+def _stamp(filename: str) -> list[int] | None:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_index(filename: str) -> dict | None:
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,165 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import contextvars
+import enum
+import io
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import git
+
+STATE_DIR = "release-tool"
+
+
+class DirtyCheckScope(enum.Enum):
+    REPOSITORY = "repository"
+    PROJECT = "project"
+    FILES = "files"
+
+
+def state_path(repo: "git.Repo", filename: str) -> str:
+    return os.path.join(repo.git_dir, STATE_DIR, filename)
+
+
+class FileOverlay:
+    def __init__(self) -> None:
+        self.__files: dict[str, str] = {}
+
+    @property
+    def files(self) -> dict[str, str]:
+        return dict(self.__files)
+
+    def read(self, filename: str) -> str | None:
+        return self.__files.get(os.path.realpath(filename))
+
+    def write(self, filename: str, content: str) -> None:
+        self.__files[os.path.realpath(filename)] = content
+
+
+_overlay: contextvars.ContextVar[FileOverlay | None] = contextvars.ContextVar(
+    "overlay", default=None
+)
+
+
+@contextlib.contextmanager
+def overlay(files: FileOverlay) -> Iterator[FileOverlay]:
+    token = _overlay.set(files)
+    try:
+        yield files
+    finally:
+        _overlay.reset(token)
+
+
+def overlay_active() -> bool:
+    return _overlay.get() is not None
+
+
+def open_file(filename: str) -> IO[str]:
+    files = _overlay.get()
+    content = files.read(filename) if files is not None else None
+    if content is not None:
+        return io.StringIO(content, newline="")
+    return open(filename, "r", encoding="utf-8", newline="")
+
+
+def read_file(filename: str) -> str:
+    with open_file(filename) as file:
+        return file.read()
+
+
+@contextlib.contextmanager
+def atomic_write(filename: str) -> Iterator[IO[str]]:
+    files = _overlay.get()
+    if files is not None:
+        buffer = io.StringIO(newline="")
+        yield buffer
+        files.write(filename, buffer.getvalue())
+        return
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+            yield file
+        if os.path.exists(filename):
+            os.chmod(tmp_name, os.stat(filename).st_mode & 0o7777)
+        os.replace(tmp_name, filename)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def replace_file(filename: str, content: str) -> None:
+    with atomic_write(filename) as file:
+        file.write(content)
+
+
+def is_dirty(repo: "git.Repo", paths: list[str]) -> bool:
+    args = ["--abbrev=40", "--full-index", "--raw", "--", *paths]
+    return bool(repo.git.diff("--cached", *args)) or bool(repo.git.diff(*args))
+
+
+class CleanSnapshot:
+    FILENAME = "clean-snapshot.json"
+
+    def __init__(self, repo: "git.Repo") -> None:
+        self.__repo = repo
+        self.__filename = state_path(repo, self.FILENAME)
+
+    def is_clean(self, paths: list[str]) -> bool:
+        state = self.__state(paths)
+        if state is not None and state == self.__load():
+            return True
+        if is_dirty(self.__repo, paths):
+            return False
+        if state is not None and not overlay_active():
+            self.__save(state)
+        return True
+
+    def __state(self, paths: list[str]) -> dict | None:
+        root = self.__repo.working_tree_dir
+        try:
+            return {
+                "head": self.__repo.head.commit.hexsha,
+                "index": _stat(os.path.join(self.__repo.git_dir, "index")),
+                "files": {path: _stat(os.path.join(root, path)) for path in paths},
+            }
+        except (OSError, ValueError):
+            return None
+
+    def __load(self) -> dict | None:
+        try:
+            with open(self.__filename, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def __save(self, state: dict) -> None:
+        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+        with open(self.__filename, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+
+
+def _stat(filename: str) -> list[int]:
+    stat = os.stat(filename)
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns]
@@ -0,0 +1,132 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from release_tool.__main__ import parse_args
+from release_tool.artifacts import ARCHIVE_FORMATS, ArchiveBuilder, ArtifactException
+from release_tool.cmake import CMakeProject
+from release_tool.release_cycle import ArtifactStep
+
+from .git_helper import RepositoryTestCase, create_repository, write_file
+
+
+class TestArchiveBuilder(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.output = os.path.join(self.tmp.name, "dist")
+        self.large = os.urandom(1024 * 1024 + 17).hex()
+        write_file(self.path, "src/large.txt", self.large)
+        os.symlink("src/large.txt", os.path.join(self.path, "link"))
+        self.repo.git.add("src", "link")
+        self.repo.git.commit("-m", "Add sources")
+        self.repo.create_tag("v0.1.0")
+
+    def repository_path(self) -> str:
+        return os.path.join(self.tmp.name, "repo")
+
+    def test_builds_archives_of_revision(self) -> None:
+        artifacts = ArchiveBuilder(self.repo, self.output).build("v0.1.0", "proj-0.1.0")
+
+        self.assertEqual(
+            [os.path.basename(artifact.filename) for artifact in artifacts],
+            ["proj-0.1.0.tar.gz", "proj-0.1.0.tar.xz", "proj-0.1.0.zip"],
+        )
+        for archive in artifacts[:2]:
+            with tarfile.open(archive.filename) as tar:
+                self.assertEqual(
+                    tar.extractfile("proj-0.1.0/src/large.txt").read().decode(),
+                    self.large,
+                )
+                self.assertEqual(
+                    tar.getmember("proj-0.1.0/link").linkname, "src/large.txt"
+                )
+        with zipfile.ZipFile(artifacts[2].filename) as archive:
+            self.assertEqual(
+                archive.read("proj-0.1.0/src/large.txt").decode(), self.large
+            )
+            self.assertEqual(
+                sorted(archive.namelist()),
+                [
+                    "proj-0.1.0/",
+                    "proj-0.1.0/CMakeLists.txt",
+                    "proj-0.1.0/link",
+                    "proj-0.1.0/src/",
+                    "proj-0.1.0/src/large.txt",
+                ],
+            )
+
+    def test_checksums_match_files(self) -> None:
+        artifacts = ArchiveBuilder(self.repo, self.output).build("v0.1.0", "proj")
+
+        for artifact in artifacts:
+            with open(artifact.filename, "rb") as file:
+                data = file.read()
+            self.assertEqual(artifact.size, len(data))
+            self.assertEqual(artifact.sha256, hashlib.sha256(data).hexdigest())
+            self.assertEqual(artifact.sha512, hashlib.sha512(data).hexdigest())
+        with open(os.path.join(self.output, "proj.sha256"), encoding="utf-8") as file:
+            self.assertIn(f"{artifacts[0].sha256}  proj.tar.gz\n", file.read())
+
+    def test_selected_formats(self) -> None:
+        builder = ArchiveBuilder(self.repo, self.output, ("zip",))
+
+        artifacts = builder.build("v0.1.0", "proj")
+
+        self.assertEqual(
+            [os.path.basename(a.filename) for a in artifacts], ["proj.zip"]
+        )
+
+    def test_unknown_revision_leaves_no_files(self) -> None:
+        with self.assertRaisesRegex(ArtifactException, "v9.9.9"):
+            ArchiveBuilder(self.repo, self.output).build("v9.9.9", "proj")
+
+        self.assertEqual(os.listdir(self.output), [])
+
+    def test_unsupported_format(self) -> None:
+        with self.assertRaises(ValueError):
+            ArchiveBuilder(self.repo, self.output, ("rar",))
+
+
+class TestArtifactStep(unittest.TestCase):
+    def test_archives_release_tag(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with create_repository(tmp) as repo:
+                repo.create_tag("v0.2.0")
+                step = ArtifactStep("out", ("tar.gz",))
+                step.execute(CMakeProject(tmp), repo, "0.2.0")
+
+            self.assertEqual(
+                [artifact.filename for artifact in step.artifacts],
+                [os.path.join(tmp, "out", "TestProj-0.2.0.tar.gz")],
+            )
+            self.assertIn("TestProj-0.2.0.tar.gz", step.report())
+
+
+class TestArtifactArguments(unittest.TestCase):
+    def test_every_format_can_be_selected(self) -> None:
+        for archive_format in ARCHIVE_FORMATS:
+            with self.subTest(archive_format=archive_format):
+                args = parse_args(
+                    ["-r", "1.0.0", "--artifacts", "--artifact-format", archive_format]
+                )
+                self.assertEqual([archive_format], args.artifact_format)
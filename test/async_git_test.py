@@ -0,0 +1,91 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from unittest.mock import MagicMock
+
+import git
+
+from release_tool import async_git
+from release_tool.profiling import Profiler
+from release_tool.release_cycle import ConditionFailedException, PreconditionStep
+from release_tool.worktree import DirtyCheckScope
+
+from .git_helper import (
+    CMAKE_CONTENT,
+    RepositoryTestCase,
+    commit_file,
+    write_file,
+)
+
+
+class TestAsyncGit(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        commit_file(self.repo, "sub/file.txt", "a", "Add file")
+
+    def test_run_git(self) -> None:
+        output = asyncio.run(async_git.run_git(self.repo, "rev-parse", "HEAD"))
+
+        self.assertEqual(self.repo.head.commit.hexsha, output.strip())
+
+    def test_run_git_raises_on_failure(self) -> None:
+        with self.assertRaises(git.GitCommandError):
+            asyncio.run(async_git.run_git(self.repo, "rev-parse", "no-such-ref"))
+
+    def test_run_git_is_traced(self) -> None:
+        profiler = Profiler()
+
+        with profiler.trace_git():
+            asyncio.run(async_git.run_git(self.repo, "rev-parse", "HEAD"))
+
+        self.assertEqual([("git rev-parse", "git")], [e[:2] for e in profiler.events])
+
+    def test_is_dirty(self) -> None:
+        self.assertFalse(asyncio.run(async_git.is_dirty(self.repo)))
+
+        write_file(self.tmp.name, "sub/file.txt", "b")
+
+        self.assertTrue(asyncio.run(async_git.is_dirty(self.repo)))
+        self.assertTrue(asyncio.run(async_git.is_dirty(self.repo, ["sub"])))
+        self.assertFalse(asyncio.run(async_git.is_dirty(self.repo, ["CMakeLists.txt"])))
+
+    def test_staged_changes_are_dirty(self) -> None:
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("0.2.0"))
+        self.repo.git.add("CMakeLists.txt")
+
+        self.assertTrue(asyncio.run(async_git.is_dirty(self.repo)))
+
+    def test_precondition_step_async(self) -> None:
+        proj = MagicMock(
+            directory=self.tmp.name, version="0.1.0", PROJECT_CONFIG="CMakeLists.txt"
+        )
+        for scope in DirtyCheckScope:
+            with self.subTest(scope=scope):
+                step = PreconditionStep(scope)
+                asyncio.run(step.execute_async(proj, self.repo, "0.2.0"))
+                with self.assertRaisesRegex(ConditionFailedException, "up-to-date"):
+                    asyncio.run(step.execute_async(proj, self.repo, "0.1.0"))
+
+    def test_precondition_step_async_fails_if_dirty(self) -> None:
+        proj = MagicMock(
+            directory=self.tmp.name, version="0.1.0", PROJECT_CONFIG="CMakeLists.txt"
+        )
+        write_file(self.tmp.name, "sub/file.txt", "b")
+
+        with self.assertRaisesRegex(ConditionFailedException, "uncommited"):
+            asyncio.run(PreconditionStep().execute_async(proj, self.repo, "0.2.0"))
@@ -0,0 +1,139 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from release_tool.batch import (
+    BatchRelease,
+    ManifestException,
+    ReleaseJob,
+    ReleaseResult,
+    format_summary,
+    parse_subproject,
+    read_manifest,
+    run_job,
+)
+from release_tool.release_cycle import ConditionFailedException, ReleaseCycle
+
+
+def _fake_run_job(job: ReleaseJob, _create_steps) -> ReleaseResult:
+    if job.path.startswith("fail"):
+        return ReleaseResult(job, False, "failed")
+    return ReleaseResult(job, True)
+
+
+class TestReadManifest(unittest.TestCase):
+    def test_reads_jobs_relative_to_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = os.path.join(tmp, "release.txt")
+            with open(manifest, "w", encoding="utf-8") as file:
+                file.write("# comment\nproj-a 1.0.0\n\nproj-b 2.0.0 2.1.0  # next\n")
+
+            jobs = read_manifest(manifest)
+
+        self.assertEqual(
+            [
+                ReleaseJob(os.path.join(tmp, "proj-a"), "1.0.0"),
+                ReleaseJob(os.path.join(tmp, "proj-b"), "2.0.0", "2.1.0"),
+            ],
+            jobs,
+        )
+
+    def test_raises_on_invalid_line(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as file:
+            file.write("proj-a\n")
+            file.flush()
+
+            with self.assertRaises(ManifestException):
+                read_manifest(file.name)
+
+
+class TestParseSubproject(unittest.TestCase):
+    def test_directory_and_version(self) -> None:
+        self.assertEqual(
+            ReleaseJob("libs/core", "1.2.0"), parse_subproject("libs/core=1.2.0")
+        )
+
+    def test_invalid(self) -> None:
+        for value in ("libs/core", "=1.0.0", "libs/core="):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_subproject(value)
+
+
+class TestRunJob(unittest.TestCase):
+    def test_reports_success(self) -> None:
+        job = ReleaseJob("proj", "1.2.3")
+        create_steps = MagicMock(return_value=[])
+
+        with patch.object(ReleaseCycle, "from_path") as from_path:
+            result = run_job(job, create_steps)
+
+        self.assertTrue(result.success)
+        create_steps.assert_called_once_with(job)
+        cycle = from_path.return_value.__enter__.return_value
+        cycle.create_release.assert_called_once_with("1.2.3")
+        from_path.return_value.__exit__.assert_called_once()
+
+    def test_reports_release_failure(self) -> None:
+        with patch.object(ReleaseCycle, "from_path") as from_path:
+            cycle = from_path.return_value.__enter__.return_value
+            cycle.create_release.side_effect = ConditionFailedException("dirty")
+            from_path.return_value.__exit__.return_value = False
+            result = run_job(ReleaseJob("proj", "1.2.3"), MagicMock())
+
+        self.assertFalse(result.success)
+        self.assertEqual("dirty", result.error)
+        from_path.return_value.__exit__.assert_called_once()
+
+
+@patch("release_tool.batch.run_job", _fake_run_job)
+class TestBatchRelease(unittest.TestCase):
+    def test_runs_all_jobs(self) -> None:
+        jobs = [ReleaseJob(f"proj-{i}", "1.0.0") for i in range(5)]
+
+        results = list(BatchRelease(MagicMock()).run(jobs, ThreadPoolExecutor(2)))
+
+        self.assertEqual(sorted(jobs), sorted(r.job for r in results))
+        self.assertTrue(all(r.success for r in results))
+
+    def test_keep_going_continues_after_failure(self) -> None:
+        jobs = [ReleaseJob("fail-0", "1.0.0")] + [
+            ReleaseJob(f"proj-{i}", "1.0.0") for i in range(3)
+        ]
+
+        results = list(
+            BatchRelease(MagicMock(), keep_going=True).run(jobs, ThreadPoolExecutor(1))
+        )
+
+        self.assertEqual("3 released, 1 failed, 0 skipped", format_summary(results))
+
+    def test_fail_fast_reports_every_job(self) -> None:
+        jobs = [ReleaseJob("fail-0", "1.0.0")] + [
+            ReleaseJob(f"proj-{i}", "1.0.0") for i in range(3)
+        ]
+
+        results = list(BatchRelease(MagicMock()).run(jobs, ThreadPoolExecutor(1)))
+
+        self.assertEqual(len(jobs), len(results))
+        self.assertFalse(results[0].success)
+        self.assertEqual(
+            len(jobs), sum(1 for r in results if r.success or r.skipped) + 1
+        )
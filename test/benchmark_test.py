@@ -0,0 +1,97 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+import git
+
+from benchmark.__main__ import parse_size
+from benchmark.baseline import Baseline, find_regressions, load_baseline, save_baseline
+from benchmark.generators import KB, MB, create_repository, generate_cmake_content
+from release_tool.cmake import CMakeProject
+from release_tool.tags import TagIndex
+
+
+class TestGenerators(unittest.TestCase):
+    def test_cmake_content_has_requested_size(self) -> None:
+        for size in (KB, 100 * KB):
+            content = generate_cmake_content(size)
+            self.assertGreaterEqual(len(content), size)
+            self.assertLess(len(content), size + KB)
+
+    def test_cmake_content_is_parsable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(
+                os.path.join(tmp, "CMakeLists.txt"), "w", encoding="utf-8"
+            ) as file:
+                file.write(generate_cmake_content(10 * KB, "3.4.5", "Generated"))
+
+            proj = CMakeProject(tmp)
+
+            self.assertEqual("Generated", proj.name)
+            self.assertEqual("3.4.5", proj.version)
+
+    def test_repository_has_files_commits_and_tags(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            create_repository(tmp, files=20, commits=10, tags=5)
+
+            with git.Repo(tmp) as repo:
+                self.assertEqual(10, len(list(repo.iter_commits())))
+                self.assertEqual(21, len(repo.git.ls_files().splitlines()))
+                self.assertFalse(repo.is_dirty(untracked_files=True))
+            index = TagIndex.for_git_dir(os.path.join(tmp, ".git"))
+            self.assertEqual(5, len(index))
+            self.assertEqual("0.5.0", index.latest_version())
+
+
+class TestBaseline(unittest.TestCase):
+    def test_regression_above_threshold(self) -> None:
+        baseline = Baseline({}, {"a": 0.010, "b": 0.010}, {}, 1.5)
+
+        regressions = find_regressions({"a": 0.016, "b": 0.014}, baseline)
+
+        self.assertEqual(["a"], [regression.name for regression in regressions])
+        self.assertAlmostEqual(1.6, regressions[0].ratio)
+
+    def test_threshold_override_and_per_benchmark_threshold(self) -> None:
+        baseline = Baseline({}, {"a": 0.010, "b": 0.010}, {"b": 3.0}, 1.5)
+
+        regressions = find_regressions({"a": 0.014, "b": 0.025}, baseline, 1.2)
+
+        self.assertEqual(["a"], [regression.name for regression in regressions])
+
+    def test_small_differences_and_unknown_benchmarks_are_ignored(self) -> None:
+        baseline = Baseline({}, {"a": 0.0001}, {}, 1.5)
+
+        self.assertEqual([], find_regressions({"a": 0.0005, "new": 1.0}, baseline))
+
+    def test_save_and_load(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "baseline.json")
+            baseline = Baseline({"repeat": 3}, {"a": 0.5}, {"a": 2.0}, 1.3)
+
+            save_baseline(filename, baseline)
+
+            self.assertEqual(baseline, load_baseline(filename))
+            self.assertIsNone(load_baseline(os.path.join(tmp, "missing.json")))
+
+    def test_parse_size(self) -> None:
+        self.assertEqual(512, parse_size("512"))
+        self.assertEqual(KB, parse_size("1K"))
+        self.assertEqual(10 * MB, parse_size("10MB"))
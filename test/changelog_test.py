@@ -0,0 +1,108 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+from release_tool.changelog import (
+    ChangelogEntry,
+    format_changelog,
+    iter_commits,
+    prepend_section,
+    previous_release,
+)
+
+from .git_helper import RepositoryTestCase, write_file
+
+
+class TestFormatChangelog(unittest.TestCase):
+    def test_groups_by_conventional_commit_type(self) -> None:
+        entries = [
+            ChangelogEntry("a" * 40, "fix(cmake): handle comments"),
+            ChangelogEntry("b" * 40, "feat: add changelog"),
+            ChangelogEntry("c" * 40, "Update README"),
+            ChangelogEntry("d" * 40, "feat!: drop Python 3.9"),
+            ChangelogEntry("e" * 40, "Fix: uppercase type"),
+        ]
+
+        self.assertEqual(
+            "### Breaking Changes\n\n- drop Python 3.9 (ddddddd)\n\n"
+            "### Features\n\n- add changelog (bbbbbbb)\n\n"
+            "### Bug Fixes\n\n- **cmake:** handle comments (aaaaaaa)\n"
+            "- uppercase type (eeeeeee)\n\n"
+            "### Other Changes\n\n- Update README (ccccccc)",
+            format_changelog(entries),
+        )
+
+    def test_ungrouped(self) -> None:
+        entries = [
+            ChangelogEntry("a" * 40, "fix: a"),
+            ChangelogEntry("b" * 40, "b"),
+        ]
+
+        self.assertEqual(
+            "- fix: a (aaaaaaa)\n- b (bbbbbbb)", format_changelog(entries, False)
+        )
+
+    def test_empty(self) -> None:
+        self.assertEqual("", format_changelog([]))
+
+
+class TestPrependSection(unittest.TestCase):
+    def test_creates_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "CHANGELOG.md")
+            prepend_section(filename, "## v1.0.0")
+
+            with open(filename, "r", encoding="utf-8") as file:
+                self.assertEqual("## v1.0.0\n", file.read())
+
+    def test_inserts_below_title(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_file(tmp, "CHANGELOG.md", "# Changelog\n\n## v1.0.0\n\n- a\n")
+            filename = os.path.join(tmp, "CHANGELOG.md")
+            prepend_section(filename, "## v1.1.0\n\n- b")
+
+            with open(filename, "r", encoding="utf-8") as file:
+                self.assertEqual(
+                    "# Changelog\n\n## v1.1.0\n\n- b\n\n## v1.0.0\n\n- a\n",
+                    file.read(),
+                )
+
+
+class TestCommitHistory(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.repo.create_tag("v1.0.0", message="Release v1.0.0")
+        for i, subject in enumerate(("feat: first", "fix: second")):
+            write_file(self.tmp.name, f"file{i}.txt", subject)
+            self.repo.git.add(".")
+            self.repo.git.commit("-m", subject)
+
+    def test_previous_release(self) -> None:
+        self.assertEqual("v1.0.0", previous_release(self.repo, "1.1.0"))
+        self.assertIsNone(previous_release(self.repo, "1.0.0"))
+
+    def test_previous_release_of_non_semver_version(self) -> None:
+        self.assertEqual("v1.0.0", previous_release(self.repo, "1.1.0rc1"))
+
+    def test_iter_commits_streams_range(self) -> None:
+        entries = list(iter_commits(self.repo, "v1.0.0..HEAD"))
+
+        self.assertEqual(["fix: second", "feat: first"], [e.subject for e in entries])
+        self.assertEqual(self.repo.head.commit.hexsha, entries[0].sha)
@@ -15,10 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
-from release_tool.cmake import CMakeProject
+from release_tool.cmake import CMakeProject, parse_project
+from release_tool.cmake_syntax import iter_commands
+from release_tool.projects import UnsupportedProjectException
 
 CMAKE_CONTENT = (
     "cmake_minimum_required(VERSION 3.14)\n\nproject(TestProj VERSION {})\n\n"
@@ -115,8 +119,8 @@ project(project-name-1
             "x", "CMakeLists.txt", CMAKE_CONTENT.format("1.9.10")
         )
 
-    @patch("release_tool.cmake._write_file")
-    def test_set_new_version_keeps_formatting(self, mock_write_file) -> None:
+    @patch("release_tool.cmake._write_region")
+    def test_set_new_version_keeps_formatting(self, mock_write_region) -> None:
         proj = _mock_load()
 
         cmake_content_extended = """
@@ -135,12 +139,15 @@ project(project-name-1
             proj.set_new_version("4.8.2")
 
         self.assertEqual(proj.version, "4.8.2")
-        mock_write_file.assert_called_with(
-            "x", "CMakeLists.txt", cmake_content_extended.format("4.8.2")
+        mock_write_region.assert_called_with(
+            "x",
+            "CMakeLists.txt",
+            cmake_content_extended.index("{}"),
+            b"4.8.2",
         )
 
-    @patch("release_tool.cmake._write_file")
-    def test_set_new_version_keeps_existing_values(self, mock_write_file):
+    @patch("release_tool.cmake._write_region")
+    def test_set_new_version_keeps_existing_values(self, mock_write_region):
         proj = _mock_load()
 
         cmake_content_extended = (
@@ -155,30 +162,213 @@ project(project-name-1
             proj.set_new_version("4.8.2")
 
         self.assertEqual(proj.version, "4.8.2")
-        mock_write_file.assert_called_with(
-            "x", "CMakeLists.txt", cmake_content_extended.format("4.8.2")
+        mock_write_region.assert_called_with(
+            "x",
+            "CMakeLists.txt",
+            cmake_content_extended.index("{}"),
+            b"4.8.2",
         )
 
+    @patch("release_tool.cmake._write_region")
     @patch("release_tool.cmake._write_file")
     @patch("release_tool.cmake._load_file", return_value=CMAKE_CONTENT.format("0.1.2"))
     def test_set_new_version_without_change_doesnt_change(
-        self, _mock_load_file, mock_write_file
+        self, _mock_load_file, mock_write_file, mock_write_region
     ) -> None:
         proj = _mock_load()
         proj.set_new_version("0.1.2")
         self.assertEqual("0.1.2", proj.version)
+        mock_write_file.assert_not_called()
+        mock_write_region.assert_not_called()
+
+    @patch("release_tool.cmake._write_file")
+    def test_set_new_version_ignores_comments_and_strings(self, mock_write_file):
+        proj = _mock_load()
+
+        cmake_content_extended = (
+            "# project(Wrong VERSION 9.9.9)\r\n"
+            'message("project(Wrong VERSION 8.8.8)")\r\n'
+            "#[[\r\nproject(Wrong VERSION 7.7.7)\r\n]]\r\n"
+            'PROJECT(TestProj DESCRIPTION "a) b" VERSION "{}" # comment )\r\n)\r\n'
+        )
+
+        with patch(
+            "release_tool.cmake._load_file",
+            return_value=cmake_content_extended.format("0.1.2"),
+        ):
+            proj.set_new_version("10.0.0")
+
+        self.assertEqual(proj.version, "10.0.0")
         mock_write_file.assert_called_with(
-            "x", "CMakeLists.txt", CMAKE_CONTENT.format("0.1.2")
+            "x", "CMakeLists.txt", cmake_content_extended.format("10.0.0")
         )
 
+    @patch(
+        "release_tool.cmake._load_file",
+        return_value="cmake_minimum_required(VERSION 3.14)\nproject(TestProj)\n",
+    )
+    def test_parse_project_config_raises_on_missing_version(
+        self, _mock_load_file
+    ) -> None:
+        with self.assertRaises(ValueError):
+            CMakeProject("abc")
+
+    def test_set_new_version_reads_file_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "CMakeLists.txt")
+            with open(filename, "w", encoding="utf-8", newline="") as file:
+                file.write("# \u00e4\r\n" + CMAKE_CONTENT.format("0.1.2"))
+
+            proj = CMakeProject(tmp)
+            with patch("release_tool.cmake._load_file") as mock_load_file:
+                proj.set_new_version("1.0.0")
+                proj.set_new_version("1.1.0-dev")
+                mock_load_file.assert_not_called()
+
+            with open(filename, "r", encoding="utf-8", newline="") as file:
+                self.assertEqual(
+                    "# \u00e4\r\n" + CMAKE_CONTENT.format("1.1.0-dev"), file.read()
+                )
+
+    def test_set_new_version_reloads_modified_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "CMakeLists.txt")
+            with open(filename, "w", encoding="utf-8") as file:
+                file.write(CMAKE_CONTENT.format("0.1.2"))
+
+            proj = CMakeProject(tmp)
+            with open(filename, "w", encoding="utf-8") as file:
+                file.write("# Changed\n" + CMAKE_CONTENT.format("0.1.2"))
+            proj.set_new_version("0.2.0")
+
+            with open(filename, "r", encoding="utf-8") as file:
+                self.assertEqual(
+                    "# Changed\n" + CMAKE_CONTENT.format("0.2.0"), file.read()
+                )
+
+    @patch("release_tool.cmake._write_region")
+    @patch(
+        "release_tool.cmake._load_file",
+        return_value='set(PROJ_VERSION "0.1.2")\nproject(TestProj VERSION ${PROJ_VERSION})\n',
+    )
+    def test_version_defined_by_variable(self, _mock_load_file, mock_write_region):
+        proj = CMakeProject("x")
+        self.assertEqual(proj.version, "0.1.2")
+        self.assertEqual(proj.version_file, "CMakeLists.txt")
+
+        proj.set_new_version("0.1.3")
+        mock_write_region.assert_called_once_with("x", "CMakeLists.txt", 18, b"0.1.3")
+
+    @patch(
+        "release_tool.cmake._load_file",
+        return_value="set(MAJOR 1)\nset(MINOR 2)\nproject(P VERSION ${MAJOR}.${MINOR})\n",
+    )
+    def test_composed_version_can_not_be_updated(self, _mock_load_file) -> None:
+        proj = CMakeProject("x")
+        self.assertEqual(proj.version, "1.2")
+
+        with self.assertRaises(ValueError):
+            proj.set_new_version("1.3")
+        self.assertEqual(proj.version, "1.2")
+
+    @patch(
+        "release_tool.cmake._load_file",
+        return_value="project(TestProj VERSION ${UNDEFINED_VERSION})\n",
+    )
+    def test_undefined_version_variable_raises(self, _mock_load_file) -> None:
+        with self.assertRaises(ValueError):
+            CMakeProject("x")
+
+    def test_set_new_version_updates_included_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            _write(
+                tmp,
+                "CMakeLists.txt",
+                "set(CMAKE_MODULE_PATH ${CMAKE_CURRENT_SOURCE_DIR}/cmake)\n"
+                "include(Version)\n"
+                "project(${PROJ_NAME} VERSION ${PROJ_VERSION})\n",
+            )
+            _write(
+                tmp,
+                "cmake/Version.cmake",
+                "include(${CMAKE_CURRENT_LIST_DIR}/name.cmake)\n"
+                "set(PROJ_VERSION ${BASE_VERSION})\n",
+            )
+            _write(
+                tmp,
+                "cmake/name.cmake",
+                'set(PROJ_NAME TestProj)\nset(BASE_VERSION 0.1.2 CACHE STRING "")\n',
+            )
+
+            proj = CMakeProject(tmp)
+            self.assertEqual(proj.name, "TestProj")
+            self.assertEqual(proj.version, "0.1.2")
+            self.assertEqual(proj.version_file, "cmake/name.cmake")
+
+            proj.set_new_version("0.2.0-dev")
+            self.assertEqual(CMakeProject(tmp).version, "0.2.0-dev")
+            with open(
+                os.path.join(tmp, "cmake", "name.cmake"), encoding="utf-8"
+            ) as file:
+                self.assertEqual(
+                    'set(PROJ_NAME TestProj)\nset(BASE_VERSION 0.2.0-dev CACHE STRING "")\n',
+                    file.read(),
+                )
+
+    def test_set_new_version_reloads_modified_included_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            _write(
+                tmp,
+                "CMakeLists.txt",
+                "include(version.cmake)\nproject(TestProj VERSION ${V})\n",
+            )
+            _write(tmp, "version.cmake", "set(V 0.1.2)\n")
+            proj = CMakeProject(tmp)
+
+            _write(tmp, "version.cmake", "# Changed\nset(V 0.1.2)\n")
+            proj.set_new_version("0.2.0")
+
+            with open(os.path.join(tmp, "version.cmake"), encoding="utf-8") as file:
+                self.assertEqual("# Changed\nset(V 0.2.0)\n", file.read())
+
     def test_current_version(self) -> None:
         proj = _mock_load()
 
         self.assertEqual(proj.version, "0.1.2")
 
 
+class TestParseProject(unittest.TestCase):
+    def test_parse_project_from_content(self) -> None:
+        self.assertEqual(
+            parse_project("set(V 1.2.3)\nproject(P VERSION ${V})"), ("P", "1.2.3")
+        )
+
+    def test_literal_project_skips_variables(self) -> None:
+        content = "set(V 1.2.3)\ninclude(other.cmake)\nproject(P VERSION 2.0.0)"
+        with patch("release_tool.cmake.iter_commands", wraps=iter_commands) as mock:
+            self.assertEqual(parse_project(content), ("P", "2.0.0"))
+
+        self.assertEqual(1, mock.call_count)
+        self.assertEqual(("project",), mock.call_args.kwargs["names"])
+
+    def test_parse_project_with_included_version_is_unsupported(self) -> None:
+        with self.assertRaises(UnsupportedProjectException):
+            parse_project("set(V 1.2.3)\ninclude(other.cmake)\nproject(P VERSION ${V})")
+        self.assertEqual(
+            parse_project("include(other.cmake)\nproject(P VERSION 1.2.3)"),
+            ("P", "1.2.3"),
+        )
+
+
 def _mock_load() -> CMakeProject:
     with patch(
         "release_tool.cmake._load_file", return_value=CMAKE_CONTENT.format("0.1.2")
     ):
         return CMakeProject("x")
+
+
+def _write(path: str, filename: str, content: str) -> None:
+    filename = os.path.join(path, filename)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(content)
@@ -0,0 +1,110 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from release_tool.cmake_syntax import ArgumentKind, iter_commands
+
+
+class TestIterCommands(unittest.TestCase):
+    def test_parses_commands_and_arguments(self) -> None:
+        content = "cmake_minimum_required(VERSION 3.14)\nproject(Abc VERSION 1.2.3)\n"
+
+        commands = list(iter_commands(content))
+
+        self.assertEqual(
+            ["cmake_minimum_required", "project"], [c.name for c in commands]
+        )
+        self.assertEqual(
+            ["Abc", "VERSION", "1.2.3"], [a.value for a in commands[1].arguments]
+        )
+
+    def test_spans_point_into_source(self) -> None:
+        content = '  project  (\n\tName\n  VERSION "1.0" [==[x)y]==])\n'
+
+        command = next(iter_commands(content))
+
+        self.assertEqual(content[command.start : command.end], content.strip())
+        for argument in command.arguments:
+            self.assertEqual(
+                argument.value, content[argument.value_start : argument.value_end]
+            )
+        version = command.arguments[2]
+        self.assertEqual('"1.0"', content[version.start : version.end])
+
+    def test_argument_kinds(self) -> None:
+        content = 'set(A b "c d" [[e f]] [=[g]]h]=])'
+
+        arguments = next(iter_commands(content)).arguments
+
+        self.assertEqual(
+            [
+                ("A", ArgumentKind.UNQUOTED),
+                ("b", ArgumentKind.UNQUOTED),
+                ("c d", ArgumentKind.QUOTED),
+                ("e f", ArgumentKind.BRACKET),
+                ("g]]h", ArgumentKind.BRACKET),
+            ],
+            [(a.value, a.kind) for a in arguments],
+        )
+
+    def test_closing_parentheses_in_strings_and_comments(self) -> None:
+        content = (
+            '# project(Wrong VERSION 0.0.0)\nmessage("a) b" # c)\n [[)]])\n'
+            "#[[ project(Wrong)\n]]\nproject(Right)"
+        )
+
+        commands = list(iter_commands(content))
+
+        self.assertEqual(["message", "project"], [c.name for c in commands])
+        self.assertEqual(["a) b", ")"], [a.value for a in commands[0].arguments])
+        self.assertEqual("Right", commands[1].arguments[0].value)
+
+    def test_nested_parentheses(self) -> None:
+        content = "if((A AND B) OR C)\nendif()"
+
+        commands = list(iter_commands(content))
+
+        self.assertEqual(["if", "endif"], [c.name for c in commands])
+        self.assertEqual(
+            ["A", "AND", "B", "OR", "C"], [a.value for a in commands[0].arguments]
+        )
+
+    def test_filters_commands_by_name(self) -> None:
+        content = 'message("(" # )\n)\nif((A) [[(]])\nendif()\nPROJECT(Abc)\nset(A B)'
+
+        commands = list(iter_commands(content, names=("project",)))
+
+        self.assertEqual(["PROJECT"], [c.name for c in commands])
+        self.assertEqual("Abc", commands[0].arguments[0].value)
+
+    def test_escape_sequences(self) -> None:
+        content = r'set(A "x\"y)" a\ b\))'
+
+        arguments = next(iter_commands(content)).arguments
+
+        self.assertEqual([r"A", r"x\"y)", r"a\ b\)"], [a.value for a in arguments])
+
+    def test_raises_on_unterminated_command(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_commands('project(Abc "VERSION 1.0)'))
+        with self.assertRaises(ValueError):
+            list(iter_commands("project(Abc VERSION 1.0"))
+
+    def test_raises_on_invalid_syntax(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_commands("project Abc"))
@@ -0,0 +1,115 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+import uuid
+from unittest.mock import patch
+
+from release_tool.cmake_syntax import Argument, iter_commands
+from release_tool.cmake_variables import VariableScope
+
+
+def _evaluate(scope: VariableScope, content: str) -> None:
+    scope.evaluate(
+        "CMakeLists.txt", content, iter_commands(content, names=("set", "include"))
+    )
+
+
+class TestVariableScope(unittest.TestCase):
+    def test_expands_nested_references(self) -> None:
+        scope = VariableScope("x")
+        _evaluate(scope, "set(SUFFIX VERSION)\nset(FOO_VERSION 1.2.3)\n")
+
+        self.assertEqual(scope.expand("v${FOO_${SUFFIX}}"), "v1.2.3")
+        self.assertEqual(scope.expand("${UNDEFINED}"), "")
+
+    @patch.dict(os.environ, {"RELEASE_TOOL_TEST": "abc"})
+    def test_expands_environment_variables(self) -> None:
+        self.assertEqual(VariableScope("x").expand("$ENV{RELEASE_TOOL_TEST}"), "abc")
+
+    def test_cache_does_not_override_normal_variable(self) -> None:
+        scope = VariableScope("x")
+        _evaluate(
+            scope, 'set(A 1)\nset(A 2 CACHE STRING "")\nset(B 3 CACHE STRING "")\n'
+        )
+
+        self.assertEqual(scope.expand("${A}.${B}"), "1.3")
+
+    def test_resolve_follows_variable_chain(self) -> None:
+        scope = VariableScope("x")
+        content = "set(A 1.0)\nset(B ${A})\nset(C ${A}.${A})\n"
+        _evaluate(scope, content)
+
+        value = scope.resolve("CMakeLists.txt", content, _argument("${B}"))
+        self.assertEqual(value.text, "1.0")
+        self.assertEqual(value.definition.argument.start, 6)
+        composed = scope.resolve("CMakeLists.txt", content, _argument("${C}"))
+        self.assertEqual(composed.text, "1.0.1.0")
+        self.assertIsNone(composed.definition)
+
+    def test_include_parses_identical_content_once(self) -> None:
+        content = f"# {uuid.uuid4()}\nset(V 1.0)\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.cmake", "b.cmake"):
+                with open(os.path.join(tmp, name), "w", encoding="utf-8") as file:
+                    file.write(content)
+
+            with patch(
+                "release_tool.cmake_variables.iter_commands", wraps=iter_commands
+            ) as mock_iter:
+                scope = VariableScope(tmp)
+                _evaluate(scope, "include(a.cmake)\ninclude(b.cmake)\n")
+                _evaluate(VariableScope(tmp), "include(a.cmake)\n")
+
+            mock_iter.assert_called_once()
+            self.assertEqual(sorted(scope.files), ["a.cmake", "b.cmake"])
+
+    @patch("release_tool.cmake_variables.CACHE_SIZE", 1)
+    def test_cache_evicts_least_recently_used_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.cmake", "b.cmake"):
+                with open(os.path.join(tmp, name), "w", encoding="utf-8") as file:
+                    file.write(f"# {uuid.uuid4()}\nset(V 1.0)\n")
+
+            with patch(
+                "release_tool.cmake_variables.iter_commands", wraps=iter_commands
+            ) as mock_iter:
+                for name in ("a.cmake", "b.cmake", "a.cmake"):
+                    _evaluate(VariableScope(tmp), f"include({name})\n")
+
+            self.assertEqual(3, mock_iter.call_count)
+
+    def test_recursive_include_is_evaluated_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "a.cmake"), "w", encoding="utf-8") as file:
+                file.write("set(N x${N})\ninclude(a.cmake)\n")
+            scope = VariableScope(tmp)
+            _evaluate(scope, "include(a.cmake)\n")
+
+            self.assertEqual(scope.expand("${N}"), "x")
+
+    def test_missing_include_is_ignored(self) -> None:
+        scope = VariableScope("x")
+        _evaluate(scope, "include(GNUInstallDirs)\ninclude(missing.cmake OPTIONAL)\n")
+
+        self.assertEqual(scope.files, {})
+
+
+def _argument(value: str) -> Argument:
+    return next(iter_commands(f"f({value})")).arguments[0]
@@ -0,0 +1,118 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from release_tool.client import send_request
+from release_tool.daemon import ReleaseServer, handle_request
+from release_tool.repo_pool import RepoPool
+
+from .git_helper import create_repository, write_file
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.tmp.name, "project")
+        create_repository(self.path).close()
+        self.pool = RepoPool(2)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def request(self, command: str, *args: str) -> dict:
+        request = {"command": command, "args": list(args), "cwd": self.path}
+        return handle_request(request, self.pool)
+
+    def test_release(self) -> None:
+        response = self.request("release", "-r", "0.2.0", "-n", "0.3.0")
+
+        self.assertEqual(0, response["status"])
+        with self.pool.acquire(self.path) as repo:
+            self.assertEqual("Prepare next iteration", repo.head.commit.message)
+            self.assertIn("v0.2.0", [tag.name for tag in repo.tags])
+
+    def test_failed_release_reports_error(self) -> None:
+        self.request("release", "-r", "0.2.0")
+        response = self.request("release", "-r", "0.2.0")
+
+        self.assertEqual(1, response["status"])
+        self.assertEqual("Version already up-to-date", response["error"])
+
+    def test_project_query(self) -> None:
+        self.request("release", "-r", "0.2.0")
+
+        response = self.request("project")
+
+        self.assertEqual("TestProj 0.2.0 (latest release: v0.2.0)", response["output"])
+
+    def test_batch_release_is_rejected(self) -> None:
+        response = self.request("release", "-r", "0.2.0", ".", ".")
+
+        self.assertEqual(1, response["status"])
+
+    def test_subproject_release(self) -> None:
+        with self.pool.acquire(self.path) as repo:
+            write_file(self.path, "sub/CMakeLists.txt", "project(Sub VERSION 1.0.0)\n")
+            repo.git.add("sub")
+            repo.git.commit("-m", "Add subproject")
+
+        response = self.request("release", "--subproject", "sub=1.1.0")
+
+        self.assertEqual(0, response["status"])
+        self.assertIn("Tagged Sub/v1.1.0", response["output"])
+
+    def test_branch_release_is_rejected(self) -> None:
+        response = self.request("release", "--branch", "main=0.2.0")
+
+        self.assertEqual(1, response["status"])
+        self.assertIn("--branch", response["error"])
+
+    @patch("release_tool.daemon.release_single", side_effect=KeyError("proj"))
+    def test_unexpected_error_is_reported(self, _mock_release) -> None:
+        response = self.request("release", "-r", "0.2.0")
+
+        self.assertEqual(1, response["status"])
+        self.assertEqual("Unexpected error: KeyError: 'proj'", response["error"])
+
+    def test_unknown_command(self) -> None:
+        self.assertEqual(1, self.request("unknown")["status"])
+
+    def test_requests_over_socket(self) -> None:
+        socket_path = os.path.join(self.tmp.name, "daemon.sock")
+        with ReleaseServer(socket_path, self.pool) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                self.assertEqual(
+                    "pong", send_request({"command": "ping"}, socket_path)["output"]
+                )
+                response = send_request({"command": "stats"}, socket_path)
+                self.assertTrue(
+                    response["output"].startswith(
+                        "0 of 2 repositories open (0 in use, 0 opened, 0 closed)\n"
+                    )
+                )
+                self.assertIn("peak rss", response["output"])
+            finally:
+                server.shutdown()
+                thread.join()
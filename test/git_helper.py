@@ -0,0 +1,64 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+import git
+
+CMAKE_CONTENT = "cmake_minimum_required(VERSION 3.14)\nproject(TestProj VERSION {})\n"
+
+
+def create_repository(path: str, version: str = "0.1.0") -> git.Repo:
+    repo = git.Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Release Tool")
+        config.set_value("user", "email", "release-tool@example.com")
+    write_file(path, "CMakeLists.txt", CMAKE_CONTENT.format(version))
+    repo.git.add("CMakeLists.txt")
+    repo.git.commit("-m", "Initial commit")
+    return repo
+
+
+class RepositoryTestCase(unittest.TestCase):
+    initial_version = "0.1.0"
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = self.repository_path()
+        self.repo = create_repository(self.path, self.initial_version)
+
+    def tearDown(self) -> None:
+        self.repo.close()
+        self.tmp.cleanup()
+
+    def repository_path(self) -> str:
+        return self.tmp.name
+
+
+def write_file(path: str, filename: str, content: str) -> None:
+    filename = os.path.join(path, filename)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+def commit_file(repo, filename: str, content: str, message: str) -> None:
+    write_file(repo.working_tree_dir, filename, content)
+    repo.git.add(filename)
+    repo.git.commit("-m", message)
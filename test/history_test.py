@@ -0,0 +1,116 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from release_tool import history
+from release_tool.history import VersionHistory
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, write_file
+
+
+class TestVersionHistory(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.commits = [self.repo.head.commit.hexsha]
+        for idx, version in enumerate(["0.1.0", "0.2.0", "0.2.0", "0.3.0"]):
+            write_file(self.path, "CMakeLists.txt", CMAKE_CONTENT.format(version))
+            write_file(self.path, "file.txt", str(idx))
+            self.repo.index.add(["CMakeLists.txt", "file.txt"])
+            self.commits.append(self.repo.index.commit(f"Commit {idx}").hexsha)
+
+    def test_version_at_revision(self) -> None:
+        index = VersionHistory(self.repo, self.path)
+
+        self.assertEqual(index.version_at("HEAD"), "0.3.0")
+        self.assertEqual(index.version_at("HEAD~2"), "0.2.0")
+        self.assertEqual(index.version_at(self.commits[0]), "0.1.0")
+
+    def test_first_commit_with_version(self) -> None:
+        index = VersionHistory(self.repo, self.path)
+
+        self.assertEqual(index.first_commit("0.1.0"), self.commits[0])
+        self.assertEqual(index.first_commit("0.2.0"), self.commits[2])
+        self.assertIsNone(index.first_commit("1.0.0"))
+
+    def test_parses_each_blob_once(self) -> None:
+        with patch(
+            "release_tool.history.parse_project", wraps=history.parse_project
+        ) as mock_parse:
+            VersionHistory(self.repo, self.path).update()
+
+        self.assertEqual(mock_parse.call_count, 3)
+
+    def test_update_is_incremental(self) -> None:
+        index = VersionHistory(self.repo, self.path)
+        self.assertEqual(index.update("HEAD~1"), 4)
+        index.save()
+
+        index = VersionHistory(self.repo, self.path)
+        self.assertEqual(index.update(), 1)
+        self.assertEqual(index.update(), 0)
+        self.assertEqual(index.version_at("HEAD~1"), "0.2.0")
+
+    def test_commits_without_project(self) -> None:
+        self.repo.index.remove(["CMakeLists.txt"], working_tree=True)
+        self.repo.index.commit("Remove project")
+        index = VersionHistory(self.repo, self.path)
+
+        self.assertIsNone(index.version_at())
+        self.assertEqual(index.version_at("HEAD~1"), "0.3.0")
+
+    def test_included_version_is_unsupported(self) -> None:
+        write_file(self.path, "cmake/version.cmake", "set(VER 1.0.0)\n")
+        write_file(
+            self.path,
+            "CMakeLists.txt",
+            "include(cmake/version.cmake)\nproject(TestProj VERSION ${VER})\n",
+        )
+        self.repo.index.add(["cmake/version.cmake", "CMakeLists.txt"])
+        self.repo.index.commit("Move version")
+        out = io.StringIO()
+
+        with redirect_stdout(out), self.assertRaises(SystemExit):
+            history.main(["-C", self.path, "at"])
+
+        self.assertIn("set through include(...)", out.getvalue())
+        self.assertEqual(
+            VersionHistory(self.repo, self.path).version_at("HEAD~1"), "0.3.0"
+        )
+
+    def test_main_prints_version(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            history.main(["-C", self.path, "at", "HEAD~1"])
+            history.main(["-C", self.path, "first", "0.3.0"])
+
+        self.assertEqual(out.getvalue(), f"0.2.0\n{self.commits[-1]}\n")
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(self.repo.git_dir, "release-tool", "version-history.json")
+            )
+        )
+
+    def test_main_fails_on_unknown_version(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out), self.assertRaises(SystemExit):
+            history.main(["-C", self.path, "first", "9.9.9"])
+
+        self.assertEqual(out.getvalue(), "ERROR: No commit with version 9.9.9 found\n")
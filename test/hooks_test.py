@@ -0,0 +1,148 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from release_tool.hooks import Hook, HookException, HookRunner, read_hooks
+from release_tool.release_cycle import HookStep
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class TestReadHooks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self.tmp.name, "hooks.json")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def __write(self, config) -> None:
+        with open(self.filename, "w", encoding="utf-8") as file:
+            json.dump(config, file)
+
+    def test_reads_hooks(self) -> None:
+        self.__write(
+            {
+                "build": "make",
+                "test": {"run": ["make", "test"], "needs": ["build"]},
+            }
+        )
+        self.assertEqual(
+            read_hooks(self.filename),
+            [Hook("build", "make"), Hook("test", ["make", "test"], ("build",))],
+        )
+
+    def test_rejects_invalid_hooks(self) -> None:
+        configs = [
+            [],
+            {"build": {"needs": []}},
+            {"build": {"run": "make", "needs": "lint"}},
+            {"build": {"run": "make", "needs": ["lint"]}},
+            {"a": {"run": "a", "needs": ["b"]}, "b": {"run": "b", "needs": ["a"]}},
+        ]
+        for config in configs:
+            with self.subTest(config=config):
+                self.__write(config)
+                with self.assertRaises(HookException):
+                    read_hooks(self.filename)
+
+    def test_missing_file_raises(self) -> None:
+        with self.assertRaises(HookException):
+            read_hooks(os.path.join(self.tmp.name, "missing.json"))
+
+
+class TestHookRunner(unittest.TestCase):
+    def test_runs_hooks_in_dependency_order(self) -> None:
+        out = io.StringIO()
+        hooks = [
+            Hook("test", _python("print('tested')"), ("build",)),
+            Hook("build", _python("import time; time.sleep(0.2); print('built')")),
+        ]
+        asyncio.run(HookRunner(hooks, out=out).run(os.getcwd()))
+
+        self.assertEqual(out.getvalue(), "[build] built\n[test ] tested\n")
+
+    def test_runs_independent_hooks_in_parallel(self) -> None:
+        hooks = [Hook(name, _python("import time; time.sleep(0.5)")) for name in "abcd"]
+        start = time.perf_counter()
+        asyncio.run(HookRunner(hooks, jobs=4, out=io.StringIO()).run(os.getcwd()))
+
+        self.assertLess(time.perf_counter() - start, 1.5)
+
+    def test_limits_concurrency(self) -> None:
+        out = io.StringIO()
+        hooks = [
+            Hook(name, _python(f"print('{name}')"), ())
+            for name in ("first", "second", "third")
+        ]
+        asyncio.run(HookRunner(hooks, jobs=1, out=out).run(os.getcwd()))
+
+        self.assertEqual(
+            out.getvalue(), "[first ] first\n[second] second\n[third ] third\n"
+        )
+
+    def test_failure_cancels_running_hooks(self) -> None:
+        out = io.StringIO()
+        hooks = [
+            Hook("slow", _python("import time; time.sleep(30)")),
+            Hook("fail", _python("import sys; sys.exit(3)")),
+            Hook("never", _python("print('never')"), ("slow",)),
+        ]
+        start = time.perf_counter()
+        with self.assertRaises(HookException) as ctx:
+            asyncio.run(HookRunner(hooks, jobs=2, out=out).run(os.getcwd()))
+
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertEqual(str(ctx.exception), "Hook 'fail' failed with exit code 3")
+        self.assertEqual(out.getvalue(), "[slow ] cancelled\n")
+
+    @patch("release_tool.hooks.LINE_LIMIT", 1024)
+    def test_overlong_line_terminates_hook(self) -> None:
+        hooks = [
+            Hook(
+                "long",
+                _python("import time; print('x' * 4096, flush=True); time.sleep(30)"),
+            )
+        ]
+        start = time.perf_counter()
+        with self.assertRaisesRegex(HookException, "longer than 1024 bytes"):
+            asyncio.run(HookRunner(hooks, out=io.StringIO()).run(os.getcwd()))
+
+        self.assertLess(time.perf_counter() - start, 10)
+
+    def test_shell_command_and_environment(self) -> None:
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            hooks = [Hook("env", "echo $RELEASE_VERSION >&2")]
+            proj = MagicMock(directory=tmp)
+            with open(os.path.join(tmp, "hooks.json"), "w", encoding="utf-8") as file:
+                json.dump({hook.name: hook.command for hook in hooks}, file)
+
+            HookStep("hooks.json", out=out).execute(proj, MagicMock(), "1.2.3")
+
+        self.assertEqual(out.getvalue(), "[env] 1.2.3\n")
@@ -0,0 +1,201 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from release_tool.journal import JournalException, ReleaseJournal
+from release_tool.release_cycle import (
+    ChangelogStep,
+    CommitAndTagStep,
+    ConditionFailedException,
+    PreconditionStep,
+    ReleaseCycle,
+    SetNextVersion,
+    Step,
+    UpdateVersionStep,
+)
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, write_file
+
+
+class FailingStep(Step):
+    def __init__(self) -> None:
+        self.failures = 1
+
+    def execute(self, proj, repo, new_version: str) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise OSError("interrupted")
+
+
+class TestReleaseJournal(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.initial_head = self.repo.head.commit.hexsha
+        self.failing = FailingStep()
+        self.steps = [
+            PreconditionStep(),
+            UpdateVersionStep(),
+            CommitAndTagStep(),
+            self.failing,
+            SetNextVersion("0.3.0"),
+        ]
+
+    def create_release(self, resume: bool = False) -> None:
+        cycle = ReleaseCycle.from_path(self.tmp.name, self.steps, journal=True)
+        cycle.create_release("0.2.0", resume)
+
+    def journal(self) -> dict | None:
+        return ReleaseJournal(self.repo).load()
+
+    def test_successful_release_removes_journal(self) -> None:
+        self.failing.failures = 0
+
+        self.create_release()
+
+        self.assertIsNone(self.journal())
+        self.assertIn("v0.2.0", [tag.name for tag in self.repo.tags])
+
+    def test_interrupted_release_keeps_journal(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        state = self.journal()
+        self.assertEqual("0.2.0", state["version"])
+        self.assertEqual(self.initial_head, state["head"])
+        self.assertEqual(
+            ["PreconditionStep", "UpdateVersionStep", "CommitAndTagStep"],
+            [entry["step"] for entry in state["completed"]],
+        )
+        self.assertEqual(["v0.2.0"], state["completed"][2]["tags"])
+
+    def test_new_release_fails_if_interrupted_release_exists(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        with self.assertRaisesRegex(JournalException, "--resume or --rollback"):
+            self.create_release()
+
+    def test_resume_runs_remaining_steps(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+        release_commit = self.repo.head.commit
+
+        self.create_release(resume=True)
+
+        self.assertIsNone(self.journal())
+        self.assertEqual(release_commit, self.repo.head.commit.parents[0])
+        self.assertEqual(release_commit, self.repo.tags["v0.2.0"].commit)
+
+    def test_resume_resets_head_to_last_checkpoint(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+        release_commit = self.repo.head.commit
+        self.repo.index.commit("Partial commit of an interrupted step")
+
+        self.create_release(resume=True)
+
+        self.assertEqual(release_commit, self.repo.head.commit.parents[0])
+
+    def test_resume_keeps_changelog_of_completed_step(self) -> None:
+        changelog = ChangelogStep()
+        self.steps[2:4] = [changelog, self.failing]
+        self.steps[4] = CommitAndTagStep("Release\n\n$changelog", changelog=changelog)
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        resumed = ChangelogStep()
+        self.steps[2] = resumed
+        self.steps[4] = CommitAndTagStep("Release\n\n$changelog", changelog=resumed)
+        self.create_release(resume=True)
+
+        self.assertEqual(changelog.text, resumed.text)
+        self.assertIn("Initial commit", self.repo.tags["v0.2.0"].tag.message)
+
+    def test_resume_with_different_version_fails(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        cycle = ReleaseCycle.from_path(self.tmp.name, self.steps, journal=True)
+        with self.assertRaisesRegex(JournalException, "different arguments"):
+            cycle.create_release("0.2.1", resume=True)
+
+    def test_resume_without_journal_fails(self) -> None:
+        with self.assertRaisesRegex(JournalException, "No incomplete release"):
+            self.create_release(resume=True)
+
+    def test_rollback_removes_commits_and_tags(self) -> None:
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        state = ReleaseJournal(self.repo).rollback()
+
+        self.assertEqual("0.2.0", state["version"])
+        self.assertIsNone(self.journal())
+        self.assertEqual(self.initial_head, self.repo.head.commit.hexsha)
+        self.assertNotIn("v0.2.0", [tag.name for tag in self.repo.tags])
+        self.assertFalse(self.repo.is_dirty())
+
+    def test_rollback_keeps_unrelated_changes(self) -> None:
+        write_file(self.tmp.name, "notes.txt", "notes\n")
+        self.repo.git.add("notes.txt")
+        self.repo.git.commit("-m", "Add notes")
+        initial_head = self.repo.head.commit.hexsha
+        with self.assertRaises(OSError):
+            self.create_release()
+        write_file(self.tmp.name, "notes.txt", "local edit\n")
+
+        ReleaseJournal(self.repo).rollback()
+
+        self.assertEqual(initial_head, self.repo.head.commit.hexsha)
+        self.assertEqual(
+            [item.a_path for item in self.repo.index.diff(None)], ["notes.txt"]
+        )
+        self.assertFalse(self.repo.index.diff("HEAD"))
+        with open(os.path.join(self.tmp.name, "notes.txt"), encoding="utf-8") as file:
+            self.assertEqual("local edit\n", file.read())
+        with open(
+            os.path.join(self.tmp.name, "CMakeLists.txt"), encoding="utf-8"
+        ) as file:
+            self.assertEqual(CMAKE_CONTENT.format("0.1.0"), file.read())
+
+    def test_rollback_removes_created_files(self) -> None:
+        changelog = ChangelogStep()
+        self.steps[2:2] = [changelog]
+        self.steps[3] = CommitAndTagStep(changelog=changelog)
+        with self.assertRaises(OSError):
+            self.create_release()
+
+        ReleaseJournal(self.repo).rollback()
+
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "CHANGELOG.md")))
+        self.assertFalse(self.repo.is_dirty(untracked_files=True))
+
+    def test_rollback_without_journal_fails(self) -> None:
+        with self.assertRaises(JournalException):
+            ReleaseJournal(self.repo).rollback()
+
+    def test_failure_before_any_step_completed_removes_journal(self) -> None:
+        with open(
+            os.path.join(self.tmp.name, "CMakeLists.txt"), "a", encoding="utf-8"
+        ) as file:
+            file.write("# local change\n")
+
+        with self.assertRaises(ConditionFailedException):
+            self.create_release()
+
+        self.assertIsNone(self.journal())
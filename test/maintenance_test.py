@@ -0,0 +1,118 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from release_tool.maintenance import BranchJob, MaintenanceRelease, parse_branch_job
+from release_tool.release_cycle import (
+    CommitAndTagStep,
+    PreconditionStep,
+    SetNextVersion,
+    TagPreconditionStep,
+    UpdateVersionStep,
+)
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, write_file
+
+
+def _create_steps(job) -> list:
+    steps = [
+        PreconditionStep(),
+        TagPreconditionStep(),
+        UpdateVersionStep(),
+        CommitAndTagStep(),
+    ]
+    if job.next_version:
+        steps.append(SetNextVersion(job.next_version))
+    return steps
+
+
+class TestParseBranchJob(unittest.TestCase):
+    def test_branch_and_version(self) -> None:
+        self.assertEqual(BranchJob("1.x", "1.4.2"), parse_branch_job("1.x=1.4.2"))
+
+    def test_next_version(self) -> None:
+        self.assertEqual(
+            BranchJob("release/2.x", "2.0.1", "2.0.2-dev"),
+            parse_branch_job("release/2.x=2.0.1,2.0.2-dev"),
+        )
+
+    def test_invalid(self) -> None:
+        for value in ("1.x", "=1.0.0", "1.x="):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_branch_job(value)
+
+
+class TestMaintenanceRelease(RepositoryTestCase):
+    initial_version = "3.0.0"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.main_branch = self.repo.active_branch.name
+        for version in ("1.0.0", "2.0.0"):
+            branch = f"{version[0]}.x"
+            self.repo.git.checkout("-q", "-b", branch)
+            write_file(self.path, "CMakeLists.txt", CMAKE_CONTENT.format(version))
+            self.repo.index.add(["CMakeLists.txt"])
+            self.repo.index.commit(f"Version {version}")
+            self.repo.git.checkout("-q", self.main_branch)
+
+    def run_release(self, *jobs: BranchJob, keep_going: bool = False) -> list:
+        release = MaintenanceRelease(self.path, _create_steps, keep_going=keep_going)
+        with ThreadPoolExecutor(2) as executor:
+            return list(release.run(jobs, executor))
+
+    def test_releases_branches_in_worktrees(self) -> None:
+        results = self.run_release(
+            BranchJob("1.x", "1.0.1", "1.0.2"), BranchJob("2.x", "2.0.1")
+        )
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(["1.x", "2.x"], sorted(result.job.path for result in results))
+        self.assertEqual(
+            self.repo.tags["v1.0.1"].commit, self.repo.commit("1.x").parents[0]
+        )
+        self.assertEqual(self.repo.tags["v2.0.1"].commit, self.repo.commit("2.x"))
+        self.assertIn("VERSION 1.0.2", self.repo.git.show("1.x:CMakeLists.txt"))
+
+    def test_worktrees_are_removed(self) -> None:
+        self.run_release(BranchJob("1.x", "1.0.1"))
+
+        self.assertEqual(1, len(self.repo.git.worktree("list").splitlines()))
+        self.assertEqual(self.main_branch, self.repo.active_branch.name)
+        self.assertIn("VERSION 3.0.0", self.repo.git.show("HEAD:CMakeLists.txt"))
+
+    def test_failed_release_is_reported(self) -> None:
+        results = self.run_release(
+            BranchJob("1.x", "1.0.0"), BranchJob("2.x", "2.0.1"), keep_going=True
+        )
+
+        by_branch = {result.job.path: result for result in results}
+        self.assertFalse(by_branch["1.x"].success)
+        self.assertTrue(by_branch["2.x"].success)
+
+    def test_checked_out_branch_fails_and_cancels(self) -> None:
+        results = self.run_release(
+            BranchJob(self.main_branch, "3.0.1"), BranchJob("1.x", "1.0.1")
+        )
+
+        self.assertFalse(results[0].success)
+        self.assertFalse(results[0].skipped)
+        self.assertTrue(results[1].skipped)
+        self.assertNotIn("v1.0.1", [tag.name for tag in self.repo.tags])
+        self.assertEqual(1, len(self.repo.git.worktree("list").splitlines()))
@@ -0,0 +1,99 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from release_tool.batch import ReleaseJob
+from release_tool.monorepo import MonorepoRelease
+from release_tool.release_cycle import ConditionFailedException
+from release_tool.worktree import DirtyCheckScope
+
+from .git_helper import RepositoryTestCase, write_file
+
+SUBPROJECT_CONTENT = "project({} VERSION {})\n"
+
+
+class TestMonorepoRelease(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for name in ("a", "b"):
+            write_file(
+                self.path,
+                f"sub/{name}/CMakeLists.txt",
+                SUBPROJECT_CONTENT.format(name.upper(), "1.0.0"),
+            )
+        self.repo.git.add("sub")
+        self.repo.git.commit("-m", "Add subprojects")
+        self.head = self.repo.head.commit.hexsha
+
+    def release(self, scope=DirtyCheckScope.REPOSITORY) -> MonorepoRelease:
+        jobs = [ReleaseJob("sub/a", "1.1.0"), ReleaseJob("sub/b", "2.0.0")]
+        return MonorepoRelease(self.path, jobs, scope=scope, repo=self.repo)
+
+    def __read(self, filename: str) -> str:
+        with open(f"{self.path}/{filename}", encoding="utf-8") as file:
+            return file.read()
+
+    def test_releases_subprojects_in_one_commit(self) -> None:
+        self.release().release()
+
+        commit = self.repo.head.commit
+        self.assertEqual(commit.parents[0].hexsha, self.head)
+        self.assertEqual(commit.message, "Release A v1.1.0, B v2.0.0")
+        self.assertEqual(
+            sorted(commit.stats.files),
+            ["sub/a/CMakeLists.txt", "sub/b/CMakeLists.txt"],
+        )
+        self.assertEqual(
+            {tag.name: tag.commit.hexsha for tag in self.repo.tags},
+            {"A/v1.1.0": commit.hexsha, "B/v2.0.0": commit.hexsha},
+        )
+        self.assertEqual(
+            self.__read("sub/b/CMakeLists.txt"), SUBPROJECT_CONTENT.format("B", "2.0.0")
+        )
+        self.assertFalse(self.repo.is_dirty(untracked_files=True))
+
+    def test_plan_does_not_change_anything(self) -> None:
+        plan = self.release().plan()
+
+        self.assertEqual(len(plan.commits), 1)
+        self.assertEqual([tag.name for tag in plan.tags], ["A/v1.1.0", "B/v2.0.0"])
+        self.assertEqual(self.repo.head.commit.hexsha, self.head)
+        self.assertEqual(self.repo.tags, [])
+        self.assertEqual(
+            self.__read("sub/a/CMakeLists.txt"), SUBPROJECT_CONTENT.format("A", "1.0.0")
+        )
+
+    def test_fails_if_dirty(self) -> None:
+        write_file(self.path, "CMakeLists.txt", "project(Changed VERSION 0.1.0)\n")
+
+        with self.assertRaises(ConditionFailedException):
+            self.release().release()
+        self.release(DirtyCheckScope.PROJECT).release()
+        self.assertEqual(len(self.repo.tags), 2)
+
+    def test_fails_if_tag_exists(self) -> None:
+        self.repo.create_tag("B/v2.0.0")
+
+        with self.assertRaisesRegex(ConditionFailedException, "B/v2.0.0"):
+            self.release().release()
+        self.assertEqual(self.repo.head.commit.hexsha, self.head)
+
+    def test_fails_on_duplicate_subproject(self) -> None:
+        jobs = [ReleaseJob("sub/a", "1.1.0"), ReleaseJob("sub/a/", "1.2.0")]
+
+        with self.assertRaisesRegex(ConditionFailedException, "more than once"):
+            MonorepoRelease(self.path, jobs, repo=self.repo).plan()
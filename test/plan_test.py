@@ -0,0 +1,130 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest.mock import MagicMock
+
+from release_tool.cmake import CMakeProject
+from release_tool.plan import PlanException
+from release_tool.release_cycle import (
+    ChangelogStep,
+    CommitAndTagStep,
+    PreconditionStep,
+    PushStep,
+    ReleaseCycle,
+    SetNextVersion,
+    TagPreconditionStep,
+    UpdateVersionStep,
+)
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase
+
+
+class TestReleasePlan(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.head = self.repo.head.commit.hexsha
+        changelog = ChangelogStep()
+        steps = [PreconditionStep(), TagPreconditionStep(), UpdateVersionStep()]
+        steps += [changelog, CommitAndTagStep(changelog=changelog)]
+        steps.append(SetNextVersion("0.3.0-dev"))
+        self.cycle = ReleaseCycle(CMakeProject(self.path), self.repo, steps)
+
+    def __read(self, filename: str) -> str | None:
+        try:
+            with open(os.path.join(self.path, filename), encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def test_plan_does_not_change_anything(self) -> None:
+        plan = self.cycle.plan_release("0.2.0")
+
+        self.assertEqual(self.repo.head.commit.hexsha, self.head)
+        self.assertEqual(self.repo.tags, [])
+        self.assertEqual(self.__read("CMakeLists.txt"), CMAKE_CONTENT.format("0.1.0"))
+        self.assertIsNone(self.__read("CHANGELOG.md"))
+        self.assertFalse(self.repo.is_dirty(untracked_files=True))
+        self.assertFalse(self.repo.odb.has_object(bytes.fromhex(plan.commits[0].sha)))
+
+        self.assertEqual(
+            [commit.message for commit in plan.commits],
+            ["Release v0.2.0", "Prepare next iteration"],
+        )
+        self.assertEqual(
+            [commit.paths for commit in plan.commits],
+            [["CMakeLists.txt", "CHANGELOG.md"], ["CMakeLists.txt"]],
+        )
+        self.assertEqual(
+            [(tag.name, tag.target) for tag in plan.tags],
+            [("v0.2.0", plan.commits[0].sha)],
+        )
+
+    def test_format_lists_changes(self) -> None:
+        text = self.cycle.plan_release("0.2.0").format()
+
+        self.assertIn("--- a/CMakeLists.txt", text)
+        self.assertIn("-project(TestProj VERSION 0.1.0)", text)
+        self.assertIn("+project(TestProj VERSION 0.3.0-dev)", text)
+        self.assertIn("--- /dev/null\n+++ b/CHANGELOG.md", text)
+        self.assertIn("tag v0.2.0", text)
+        self.assertIn(f"update {self.repo.head.ref.path} {self.head[:7]}", text)
+
+    def test_apply_updates_repository(self) -> None:
+        plan = self.cycle.plan_release("0.2.0")
+        self.cycle.apply_plan(plan, "0.2.0")
+
+        self.assertEqual(self.repo.head.commit.hexsha, plan.head)
+        self.assertEqual(self.repo.head.commit.message, "Prepare next iteration")
+        tag = self.repo.tags["v0.2.0"]
+        self.assertEqual(tag.commit.hexsha, plan.commits[0].sha)
+        self.assertEqual(tag.tag.message, "Release v0.2.0")
+        self.assertEqual(
+            tag.commit.tree["CMakeLists.txt"].data_stream.read().decode(),
+            CMAKE_CONTENT.format("0.2.0"),
+        )
+        self.assertEqual(
+            self.__read("CMakeLists.txt"), CMAKE_CONTENT.format("0.3.0-dev")
+        )
+        self.assertFalse(self.repo.is_dirty(untracked_files=True))
+
+    def test_apply_runs_deferred_steps_without_journal(self) -> None:
+        step = MagicMock(spec=PushStep)
+        step.plan.side_effect = lambda *args: args[-1].defer(step)
+        cycle = ReleaseCycle.from_path(
+            self.path, [UpdateVersionStep(), CommitAndTagStep(), step], journal=True
+        )
+
+        cycle.apply_plan(cycle.plan_release("0.2.0"), "0.2.0")
+
+        step.execute.assert_called_once_with(cycle.project, self.repo, "0.2.0")
+        self.assertIn("v0.2.0", self.repo.tags)
+
+    def test_apply_fails_without_changes_if_refs_moved(self) -> None:
+        plan = self.cycle.plan_release("0.2.0")
+        self.repo.create_tag("v0.2.0")
+
+        with self.assertRaises(PlanException):
+            self.cycle.apply_plan(plan, "0.2.0")
+        self.assertEqual(self.repo.head.commit.hexsha, self.head)
+        self.assertEqual(self.__read("CMakeLists.txt"), CMAKE_CONTENT.format("0.1.0"))
+
+    def test_push_is_deferred(self) -> None:
+        push = PushStep("origin")
+        cycle = ReleaseCycle(CMakeProject(self.path), self.repo, [push])
+
+        self.assertEqual(cycle.plan_release("0.2.0").deferred, [push])
@@ -0,0 +1,128 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from git.cmd import Git
+
+from release_tool.profiling import Profiler
+from release_tool.release_cycle import ReleaseCycle
+
+
+class TestProfiler(unittest.TestCase):
+    def test_span_records_event(self) -> None:
+        profiler = Profiler()
+
+        with profiler.span("abc", "step"):
+            pass
+
+        self.assertEqual(1, len(profiler.events))
+        self.assertEqual(("abc", "step"), profiler.events[0][:2])
+        self.assertGreaterEqual(profiler.events[0].duration, 0.0)
+
+    def test_span_records_event_on_exception(self) -> None:
+        profiler = Profiler()
+
+        with self.assertRaises(ValueError), profiler.span("abc", "step"):
+            raise ValueError()
+
+        self.assertEqual(1, len(profiler.events))
+
+    def test_trace_git_records_and_restores_execute(self) -> None:
+        profiler = Profiler()
+        original = Git.execute
+
+        with patch.object(Git, "execute", return_value="out") as execute:
+            with profiler.trace_git():
+                self.assertEqual("out", Git().execute(["git", "diff", "--cached"]))
+            self.assertIs(execute, Git.execute)
+        self.assertIs(original, Git.execute)
+
+        self.assertEqual([("git diff", "git")], [e[:2] for e in profiler.events])
+
+    def test_overlapping_traces_record_own_calls(self) -> None:
+        first, second = Profiler(), Profiler()
+        original = Git.execute
+        started, finished = threading.Event(), threading.Event()
+
+        def trace_second() -> None:
+            with second.trace_git():
+                started.set()
+                finished.wait()
+                Git().execute(["git", "status"])
+
+        with patch.object(Git, "execute", return_value="out") as execute:
+            thread = threading.Thread(target=trace_second)
+            with first.trace_git():
+                thread.start()
+                started.wait()
+                Git().execute(["git", "diff"])
+            finished.set()
+            thread.join()
+            Git().execute(["git", "log"])
+            self.assertIs(execute, Git.execute)
+        self.assertIs(original, Git.execute)
+
+        self.assertEqual([("git diff", "git")], [e[:2] for e in first.events])
+        self.assertEqual([("git status", "git")], [e[:2] for e in second.events])
+
+    def test_summary_aggregates_calls(self) -> None:
+        profiler = Profiler()
+        for _ in range(3):
+            with profiler.span("git diff", "git"):
+                pass
+
+        lines = profiler.summary().splitlines()
+
+        self.assertEqual(2, len(lines))
+        self.assertEqual(["git", "git", "diff", "3"], lines[1].split()[:4])
+
+    def test_write_chrome_trace(self) -> None:
+        profiler = Profiler()
+        with profiler.span("PreconditionStep", "step"):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "trace.json")
+            profiler.write_chrome_trace(filename)
+            with open(filename, "r", encoding="utf-8") as file:
+                trace = json.load(file)
+
+        event = trace["traceEvents"][0]
+        self.assertEqual("PreconditionStep", event["name"])
+        self.assertEqual("step", event["cat"])
+        self.assertEqual("X", event["ph"])
+
+
+class TestProfiledReleaseCycle(unittest.TestCase):
+    def test_steps_are_timed(self) -> None:
+        profiler = Profiler()
+        step = MagicMock()
+        cycle = ReleaseCycle(MagicMock(), MagicMock(), [step, step], profiler)
+
+        cycle.create_release("1.0.0")
+
+        self.assertEqual(2, step.execute.call_count)
+        self.assertEqual(
+            [("MagicMock", "step"), ("MagicMock", "step")],
+            [e[:2] for e in profiler.events],
+        )
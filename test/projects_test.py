@@ -0,0 +1,94 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+from importlib.metadata import EntryPoint
+from typing import NamedTuple
+from unittest.mock import patch
+
+from release_tool.cmake import CMakeProject
+from release_tool.projects import (
+    ENTRY_POINT_GROUP,
+    ProjectHandler,
+    ProjectRegistry,
+    UnsupportedProjectException,
+)
+
+from .git_helper import CMAKE_CONTENT, write_file
+
+
+class FakeProject(NamedTuple):
+    directory: str
+
+
+MESON = EntryPoint("meson.build", f"{__name__}:FakeProject", ENTRY_POINT_GROUP)
+
+
+class TestProjectRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    @patch("importlib.metadata.entry_points")
+    def test_builtin_handler_skips_plugins(self, mock_entry_points) -> None:
+        write_file(self.path, "CMakeLists.txt", CMAKE_CONTENT.format("1.2.3"))
+        write_file(self.path, "meson.build", "")
+
+        proj = ProjectRegistry().open(self.path)
+
+        self.assertIsInstance(proj, CMakeProject)
+        self.assertEqual(proj.version, "1.2.3")
+        mock_entry_points.assert_not_called()
+
+    @patch("importlib.metadata.entry_points", return_value=[MESON])
+    def test_plugin_handler(self, mock_entry_points) -> None:
+        write_file(self.path, "meson.build", "")
+        registry = ProjectRegistry()
+
+        proj = registry.open(self.path)
+        registry.open(self.path)
+
+        self.assertIsInstance(proj, FakeProject)
+        self.assertEqual(proj.directory, self.path)
+        mock_entry_points.assert_called_once_with(group=ENTRY_POINT_GROUP)
+
+    def test_detection_is_cached_by_directory_mtime(self) -> None:
+        write_file(self.path, "CMakeLists.txt", "")
+        registry = ProjectRegistry(builtin=(ProjectHandler("a.txt", "x:A"),))
+        registry.plugins()
+
+        with patch("os.listdir", wraps=os.listdir) as mock_listdir:
+            self.assertIsNone(registry.detect(self.path))
+            self.assertIsNone(registry.detect(self.path))
+            mock_listdir.assert_called_once()
+
+            write_file(self.path, "a.txt", "")
+            os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+            self.assertEqual(registry.detect(self.path), ProjectHandler("a.txt", "x:A"))
+            self.assertEqual(mock_listdir.call_count, 2)
+
+    def test_unsupported_project_raises(self) -> None:
+        with (
+            patch("importlib.metadata.entry_points", return_value=[]),
+            self.assertRaises(UnsupportedProjectException),
+        ):
+            ProjectRegistry().open(self.path)
@@ -0,0 +1,102 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import git
+
+from release_tool.cmake import CMakeProject
+from release_tool.release_cycle import (
+    CommitAndTagStep,
+    ConditionFailedException,
+    PushFailedException,
+    PushStep,
+    ReleaseCycle,
+    SetNextVersion,
+    UpdateVersionStep,
+)
+
+from .git_helper import RepositoryTestCase
+
+
+class TestPushStep(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.remote = git.Repo.init(
+            os.path.join(self.tmp.name, "remote.git"), bare=True
+        )
+        self.repo.create_remote("upstream", self.remote.git_dir)
+        self.repo.git.push("upstream", "HEAD")
+        self.branch = self.repo.active_branch.name
+
+    def tearDown(self) -> None:
+        self.remote.close()
+        super().tearDown()
+
+    def repository_path(self) -> str:
+        return os.path.join(self.tmp.name, "work")
+
+    def release(self, push: PushStep) -> None:
+        steps = [UpdateVersionStep(), CommitAndTagStep(), SetNextVersion("0.3.0"), push]
+        ReleaseCycle(CMakeProject(self.path), self.repo, steps).create_release("0.2.0")
+
+    def test_pushes_branch_and_tag(self) -> None:
+        push = PushStep("upstream")
+
+        self.release(push)
+
+        self.assertEqual(
+            self.repo.head.commit.hexsha, self.remote.commit(self.branch).hexsha
+        )
+        self.assertEqual(
+            self.repo.tags["v0.2.0"].commit, self.remote.tags["v0.2.0"].commit
+        )
+        self.assertEqual(
+            [f"refs/heads/{self.branch}", "refs/tags/v0.2.0"],
+            [result.ref for result in push.results],
+        )
+        self.assertEqual(["*"], [result.flag for result in push.results][1:])
+        self.assertTrue(all(result.success for result in push.results))
+        self.assertGreater(push.duration, 0)
+        self.assertIn("refs/tags/v0.2.0: [new tag]", push.report())
+
+    def test_rejected_push_publishes_nothing(self) -> None:
+        other = git.Repo.clone_from(
+            self.remote.git_dir, os.path.join(self.tmp.name, "o")
+        )
+        other.index.commit("Concurrent change")
+        other.git.push("origin", "HEAD")
+        other.close()
+        remote_head = self.remote.commit(self.branch).hexsha
+        push = PushStep("upstream")
+
+        with self.assertRaisesRegex(PushFailedException, "rejected"):
+            self.release(push)
+
+        self.assertEqual(remote_head, self.remote.commit(self.branch).hexsha)
+        self.assertEqual([], self.remote.tags)
+        self.assertEqual(["!", "!"], [result.flag for result in push.results])
+
+    def test_unknown_remote_fails(self) -> None:
+        with self.assertRaises(PushFailedException):
+            self.release(PushStep("missing"))
+
+    def test_detached_head_fails(self) -> None:
+        self.repo.git.checkout("--detach")
+
+        with self.assertRaisesRegex(ConditionFailedException, "detached"):
+            PushStep("upstream").execute(None, self.repo, "0.1.0")
@@ -15,6 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, Mock, call, patch
 
@@ -22,37 +25,63 @@ import git
 
 from release_tool.cmake import CMakeProject
 from release_tool.release_cycle import (
+    ChangelogStep,
     CommitAndTagStep,
     ConditionFailedException,
     PreconditionStep,
     ReleaseCycle,
     SetNextVersion,
+    Step,
+    TagPreconditionStep,
     UnsupportedProjectException,
     UpdateVersionStep,
 )
+from release_tool.worktree import DirtyCheckScope
+
+from .git_helper import CMAKE_CONTENT, write_file
 
 
 class TestReleaseCycle(unittest.TestCase):
-    @patch("os.path.isfile", return_value=True)
-    def test_project_and_repository_from_path(self, mock) -> None:
+    def test_project_and_repository_from_path(self) -> None:
         with (
+            tempfile.TemporaryDirectory() as tmp,
             patch.object(git.Repo, "__init__", lambda p0, p1: None),
             patch.object(CMakeProject, "__init__", lambda p0, p1: None),
         ):
-            cycle = ReleaseCycle.from_path("/tmp/cmake_project", [MagicMock()])
-            mock.assert_called_once_with("/tmp/cmake_project/CMakeLists.txt")
+            write_file(tmp, "CMakeLists.txt", "")
+            cycle = ReleaseCycle.from_path(tmp, [MagicMock()])
             self.assertIsInstance(cycle.project, CMakeProject)
             self.assertIsInstance(cycle.repository, git.Repo)
             self.assertEqual(1, cycle.number_of_steps())
 
-    @patch("os.path.isfile", return_value=False)
-    def test_from_path_throws_if_no_project_file(self, mock) -> None:
+    def test_close_closes_opened_repository(self) -> None:
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(git, "Repo") as repo_class,
+        ):
+            write_file(tmp, "CMakeLists.txt", CMAKE_CONTENT.format("1.0.0"))
+            with ReleaseCycle.from_path(tmp, []) as cycle:
+                repo_class.return_value.close.assert_not_called()
+            cycle.close()
+
+        repo_class.return_value.close.assert_called_once()
+
+    def test_close_keeps_passed_repository(self) -> None:
+        repo = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp:
+            write_file(tmp, "CMakeLists.txt", CMAKE_CONTENT.format("1.0.0"))
+            with ReleaseCycle.from_path(tmp, [], repo=repo):
+                pass
+
+        repo.close.assert_not_called()
+
+    def test_from_path_throws_if_no_project_file(self) -> None:
         with (
+            tempfile.TemporaryDirectory() as tmp,
             patch.object(git.Repo, "__init__", lambda p0, p1: None),
             self.assertRaises(UnsupportedProjectException),
         ):
-            ReleaseCycle.from_path("/tmp/cmake_project", [MagicMock()])
-        mock.assert_called_once_with("/tmp/cmake_project/CMakeLists.txt")
+            ReleaseCycle.from_path(tmp, [MagicMock()])
 
     def test_step_executed(self) -> None:
         proj, repo = _create_mocks("0.1.0")
@@ -98,6 +127,70 @@ class TestReleaseCycle(unittest.TestCase):
         step.execute.assert_called_once_with(proj, repo, "0.3.4")
 
 
+class ReadOnlyStep(Step):
+    read_only = True
+
+    def __init__(self, events: list[str], name: str, error: bool = False) -> None:
+        self.__events = events
+        self.__name = name
+        self.__error = error
+
+    def execute(self, proj, repo, new_version: str) -> None:
+        raise AssertionError("executed synchronously")
+
+    async def execute_async(self, proj, repo, new_version: str) -> None:
+        self.__events.append(f"start {self.__name}")
+        await asyncio.sleep(0.1 if self.__name == "slow" else 0.05)
+        self.__events.append(f"end {self.__name}")
+        if self.__error:
+            raise ConditionFailedException(self.__name)
+
+
+class TestConcurrentSteps(unittest.TestCase):
+    def test_read_only_steps_run_concurrently(self) -> None:
+        proj, repo = _create_mocks("0.1.0")
+        events: list[str] = []
+        steps = [ReadOnlyStep(events, "slow"), ReadOnlyStep(events, "fast")]
+
+        start = time.perf_counter()
+        ReleaseCycle(proj, repo, steps).create_release("0.2.0")
+
+        self.assertLess(time.perf_counter() - start, 0.15)
+        self.assertEqual(["start slow", "start fast"], events[:2])
+
+    def test_mutating_steps_run_after_read_only_steps(self) -> None:
+        proj, repo = _create_mocks("0.1.0")
+        events: list[str] = []
+        mutating = MagicMock()
+        mutating.execute.side_effect = lambda *args: events.append("mutating")
+        steps = [ReadOnlyStep(events, "slow"), ReadOnlyStep(events, "fast"), mutating]
+
+        ReleaseCycle(proj, repo, steps).create_release("0.2.0")
+
+        self.assertEqual("mutating", events[-1])
+        self.assertEqual(5, len(events))
+
+    def test_first_error_in_declared_order_is_raised(self) -> None:
+        proj, repo = _create_mocks("0.1.0")
+        events: list[str] = []
+        mutating = MagicMock()
+        steps = [
+            ReadOnlyStep(events, "slow", error=True),
+            ReadOnlyStep(events, "fast", error=True),
+            mutating,
+        ]
+
+        with self.assertRaisesRegex(ConditionFailedException, "slow"):
+            ReleaseCycle(proj, repo, steps).create_release("0.2.0")
+        mutating.execute.assert_not_called()
+
+    def test_precondition_steps_are_read_only(self) -> None:
+        self.assertTrue(PreconditionStep.read_only)
+        self.assertTrue(TagPreconditionStep.read_only)
+        self.assertFalse(UpdateVersionStep.read_only)
+        self.assertFalse(CommitAndTagStep.read_only)
+
+
 class TestPreconditionStep(unittest.TestCase):
     def test_passes_if_repo_not_dirty(self) -> None:
         proj, repo = _create_mocks("0.1.2")
@@ -129,6 +222,52 @@ class TestPreconditionStep(unittest.TestCase):
         with self.assertRaises(ConditionFailedException):
             step.execute(proj, repo, "0.1.2")
 
+    def test_project_scope_checks_project_directory(self) -> None:
+        proj, repo = _create_mocks("0.1.2")
+        proj.directory = "/tmp/repo/sub/proj"
+        repo.working_tree_dir = "/tmp/repo"
+        repo.is_dirty = MagicMock(return_value=False)
+
+        step = PreconditionStep(DirtyCheckScope.PROJECT)
+        step.execute(proj, repo, "0.1.3")
+        repo.is_dirty.assert_called_once_with(path="sub/proj")
+
+    def test_files_scope_checks_project_config(self) -> None:
+        proj, repo = _create_mocks("0.1.2")
+        proj.directory = "/tmp/repo/proj"
+        proj.PROJECT_CONFIG = "CMakeLists.txt"
+        repo.working_tree_dir = "/tmp/repo"
+
+        with patch("release_tool.release_cycle.CleanSnapshot") as snapshot:
+            snapshot.return_value.is_clean.return_value = False
+            step = PreconditionStep(DirtyCheckScope.FILES)
+            with self.assertRaises(ConditionFailedException):
+                step.execute(proj, repo, "0.1.3")
+
+        snapshot.return_value.is_clean.assert_called_once_with(["proj/CMakeLists.txt"])
+        repo.is_dirty.assert_not_called()
+
+
+class TestTagPreconditionStep(unittest.TestCase):
+    @patch("release_tool.release_cycle.TagIndex")
+    def test_passes_if_tag_does_not_exist(self, mock_index) -> None:
+        proj, repo = _create_mocks("0.1.2")
+        mock_index.for_git_dir.return_value.has_version.return_value = False
+
+        step = TagPreconditionStep()
+        step.execute(proj, repo, "0.1.3")
+        mock_index.for_git_dir.assert_called_once_with(repo.common_dir)
+        mock_index.for_git_dir.return_value.has_version.assert_called_once_with("0.1.3")
+
+    @patch("release_tool.release_cycle.TagIndex")
+    def test_fails_if_tag_exists(self, mock_index) -> None:
+        proj, repo = _create_mocks("0.1.2")
+        mock_index.for_git_dir.return_value.has_version.return_value = True
+
+        step = TagPreconditionStep()
+        with self.assertRaises(ConditionFailedException):
+            step.execute(proj, repo, "0.1.3")
+
 
 class TestUpdateVersionStep(unittest.TestCase):
     def test_sets_new_version(self) -> None:
@@ -138,6 +277,16 @@ class TestUpdateVersionStep(unittest.TestCase):
         step.execute(proj, repo, "0.1.3")
         proj.set_new_version.assert_called_once_with("0.1.3")
 
+    def test_updates_version_files(self) -> None:
+        proj, repo = _create_mocks("0.1.2")
+        version_files = MagicMock()
+
+        step = UpdateVersionStep(version_files)
+        step.execute(proj, repo, "0.1.3")
+
+        proj.set_new_version.assert_called_once_with("0.1.3")
+        version_files.update.assert_called_once_with(proj, repo, "0.1.2", "0.1.3")
+
 
 class TestCommitAndTagStep(unittest.TestCase):
     def test_commits_changes_and_creates_tag(self) -> None:
@@ -160,6 +309,64 @@ class TestCommitAndTagStep(unittest.TestCase):
             "v1.2.3", message="Custom message for version '1.2.3'"
         )
 
+    @patch("release_tool.release_cycle.commit_working_tree_files")
+    def test_direct_commit_bypasses_index(self, mock_commit) -> None:
+        proj, repo = _create_mocks("1.2.3")
+        proj.directory = "/tmp/repo"
+        proj.PROJECT_CONFIG = "CMakeLists.txt"
+        repo.working_tree_dir = "/tmp/repo"
+
+        step = CommitAndTagStep(direct=True)
+        step.execute(proj, repo, "1.2.3")
+        mock_commit.assert_called_once_with(repo, ["CMakeLists.txt"], "Release v1.2.3")
+        repo.index.add.assert_not_called()
+        repo.create_tag.assert_called_once_with("v1.2.3", message="Release v1.2.3")
+
+    def test_commits_changelog(self) -> None:
+        proj, repo = _create_mocks("1.2.3")
+        changelog = MagicMock()
+        changelog.filename = "CHANGELOG.md"
+        changelog.text = "- fix (abcdef0)"
+
+        step = CommitAndTagStep("Release $v\n\n$changelog", changelog=changelog)
+        step.execute(proj, repo, "1.2.3")
+        repo.index.add.assert_called_once_with([proj.PROJECT_CONFIG, "CHANGELOG.md"])
+        repo.index.commit.assert_called_once_with("Release 1.2.3\n\n- fix (abcdef0)")
+        repo.create_tag.assert_called_once_with(
+            "v1.2.3", message="Release 1.2.3\n\n- fix (abcdef0)"
+        )
+
+    def test_commits_version_files(self) -> None:
+        proj, repo = _create_mocks("1.2.3")
+        version_files = MagicMock()
+        version_files.find.return_value = ["Doxyfile", "vcpkg.json"]
+
+        step = CommitAndTagStep(version_files=version_files)
+        step.execute(proj, repo, "1.2.3")
+        version_files.find.assert_called_once_with(proj, repo, "1.2.3")
+        repo.index.add.assert_called_once_with(
+            [proj.PROJECT_CONFIG, "Doxyfile", "vcpkg.json"]
+        )
+
+
+class TestChangelogStep(unittest.TestCase):
+    @patch("release_tool.release_cycle.prepend_section")
+    @patch("release_tool.release_cycle.iter_commits", return_value=[])
+    @patch("release_tool.release_cycle.previous_release", return_value="v1.0.0")
+    def test_writes_section_since_previous_release(
+        self, _mock_previous, mock_iter_commits, mock_prepend
+    ) -> None:
+        proj, repo = _create_mocks("1.0.0")
+        proj.directory = "/tmp/proj"
+
+        step = ChangelogStep("NEWS.md")
+        step.execute(proj, repo, "1.1.0")
+
+        mock_iter_commits.assert_called_once_with(repo, "v1.0.0..HEAD")
+        self.assertEqual("/tmp/proj/NEWS.md", mock_prepend.call_args.args[0])
+        self.assertTrue(mock_prepend.call_args.args[1].startswith("## v1.1.0 ("))
+        self.assertEqual("", step.text)
+
 
 class TestSetNextVersion(unittest.TestCase):
     def test_sets_next_version_with_commit(self) -> None:
@@ -172,9 +379,22 @@ class TestSetNextVersion(unittest.TestCase):
         repo.index.add.assert_called_once_with([proj.PROJECT_CONFIG])
         repo.index.commit.assert_called_once_with("Prepare next iteration")
 
+    def test_updates_and_commits_version_files(self) -> None:
+        proj, repo = _create_mocks("0.1.3")
+        version_files = MagicMock()
+        version_files.update.return_value = ["vcpkg.json"]
+
+        step = SetNextVersion("0.2.0", version_files=version_files)
+        step.execute(proj, repo, "0.1.3")
+
+        version_files.update.assert_called_once_with(proj, repo, "0.1.3", "0.2.0")
+        repo.index.add.assert_called_once_with([proj.PROJECT_CONFIG, "vcpkg.json"])
+
 
 def _create_mocks(version: str) -> tuple[MagicMock, MagicMock]:
     proj = MagicMock()
     repo = MagicMock()
     proj.version = version
+    proj.PROJECT_CONFIG = "CMakeLists.txt"
+    proj.version_file = proj.PROJECT_CONFIG
     return (proj, repo)
@@ -0,0 +1,117 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from release_tool.repo_pool import PoolStats, RepoPool
+
+
+class TestRepoPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.factory = MagicMock(side_effect=lambda path: MagicMock(path=path))
+
+    def test_repository_is_reused(self) -> None:
+        pool = RepoPool(2, self.factory)
+
+        with pool.acquire("/tmp/a") as first:
+            pass
+        with pool.acquire("/tmp/a/../a") as second:
+            pass
+
+        self.assertIs(first, second)
+        self.factory.assert_called_once_with("/tmp/a")
+        self.assertEqual(1, len(pool))
+
+    def test_least_recently_used_repository_is_closed(self) -> None:
+        pool = RepoPool(2, self.factory)
+
+        with pool.acquire("/tmp/a") as repo_a:
+            pass
+        with pool.acquire("/tmp/b") as repo_b:
+            pass
+        with pool.acquire("/tmp/a"):
+            pass
+        with pool.acquire("/tmp/c"):
+            pass
+
+        repo_b.close.assert_called_once()
+        repo_a.close.assert_not_called()
+        self.assertEqual(2, len(pool))
+
+    def test_repository_in_use_is_not_closed(self) -> None:
+        pool = RepoPool(1, self.factory)
+
+        with pool.acquire("/tmp/a") as repo_a, pool.acquire("/tmp/b") as repo_b:
+            pass
+
+        repo_a.close.assert_not_called()
+        repo_b.close.assert_called_once()
+        self.assertEqual(1, len(pool))
+
+    def test_same_repository_is_serialized(self) -> None:
+        pool = RepoPool(2, self.factory)
+        active = []
+        overlaps = []
+
+        def work(path: str) -> None:
+            with pool.acquire(path):
+                active.append(path)
+                overlaps.append(active.count(path) > 1)
+                time.sleep(0.02)
+                active.remove(path)
+
+        threads = [
+            threading.Thread(target=work, args=(path,))
+            for path in ("/tmp/a", "/tmp/a", "/tmp/b", "/tmp/b")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(4, len(overlaps))
+        self.assertFalse(any(overlaps))
+
+    def test_close_closes_all_repositories(self) -> None:
+        pool = RepoPool(2, self.factory)
+        with pool.acquire("/tmp/a") as repo_a, pool.acquire("/tmp/b") as repo_b:
+            pass
+
+        pool.close()
+
+        repo_a.close.assert_called_once()
+        repo_b.close.assert_called_once()
+        self.assertEqual(0, len(pool))
+
+    def test_stats_count_open_and_closed_repositories(self) -> None:
+        pool = RepoPool(1, self.factory)
+
+        with pool.acquire("/tmp/a"):
+            self.assertEqual(PoolStats(1, 1, 1, 1, 0), pool.stats())
+        with pool.acquire("/tmp/b"):
+            pass
+
+        self.assertEqual(PoolStats(1, 0, 1, 2, 1), pool.stats())
+        pool.close()
+        self.assertEqual(PoolStats(0, 0, 1, 2, 2), pool.stats())
+
+    def test_invalid_capacity(self) -> None:
+        with self.assertRaises(ValueError):
+            RepoPool(0)
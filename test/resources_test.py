@@ -0,0 +1,66 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+from release_tool.release_cycle import ReleaseCycle
+from release_tool.resources import ResourceUsage, format_usage, resource_usage
+
+from .git_helper import create_repository
+
+
+class TestResourceUsage(unittest.TestCase):
+    def test_format_usage(self) -> None:
+        usage = ResourceUsage(10 * 1024 * 1024, 12 * 1024 * 1024, 7, 2)
+
+        self.assertEqual(
+            "rss 10.0 MiB, peak rss 12.0 MiB, 7 open files, 2 child processes",
+            format_usage(usage),
+        )
+
+    def test_format_usage_without_proc(self) -> None:
+        usage = ResourceUsage(None, 12 * 1024 * 1024, None, None)
+
+        self.assertEqual("peak rss 12.0 MiB", format_usage(usage))
+
+    def test_current_usage(self) -> None:
+        usage = resource_usage()
+
+        self.assertGreater(usage.peak_rss, 0)
+        if usage.rss is not None:
+            self.assertLessEqual(usage.rss, usage.peak_rss * 2)
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "requires procfs")
+    def test_release_cycles_do_not_leak_handles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, str(index)) for index in range(30)]
+            for path in paths:
+                create_repository(path).close()
+
+            def open_cycles(paths: list[str]) -> ResourceUsage:
+                for path in paths:
+                    with ReleaseCycle.from_path(path, []) as cycle:
+                        self.assertTrue(cycle.repository.head.commit.message)
+                return resource_usage()
+
+            before = open_cycles(paths[:5])
+            after = open_cycles(paths[5:])
+
+        self.assertEqual(before.open_files, after.open_files)
+        self.assertEqual(before.child_processes, after.child_processes)
@@ -0,0 +1,76 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import ast
+import os
+import subprocess
+import sys
+import unittest
+
+# Modules that dominate the startup time of the command line and are only needed
+# once a release runs. lzma isn't listed: argparse imports shutil, which loads it.
+DEFERRED_MODULES = ("git", "tarfile", "zipfile", "gzip", "asyncio")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def _loaded_modules(*cli_args: str) -> list[str]:
+    script = (
+        "import sys\n"
+        "from release_tool.__main__ import parse_args\n"
+        "try:\n"
+        f"    parse_args({list(cli_args)!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([name for name in {DEFERRED_MODULES!r} if name in sys.modules])\n"
+    )
+    result = _run_python("-c", script)
+    return ast.literal_eval(result.stdout.splitlines()[-1])
+
+
+class TestStartup(unittest.TestCase):
+    def test_argument_handling_defers_heavy_imports(self) -> None:
+        for cli_args in (
+            ["--help"],
+            ["--version"],
+            ["-r", "1.2.3", "path"],
+            ["--invalid-option"],
+            [],
+        ):
+            with self.subTest(cli_args=cli_args):
+                self.assertEqual([], _loaded_modules(*cli_args))
+
+    def test_client_does_not_import_git(self) -> None:
+        script = (
+            "import sys\n"
+            "from release_tool.client import create_request\n"
+            "create_request(['-r', '1.2.3'])\n"
+            "print('git' in sys.modules)\n"
+        )
+        result = _run_python("-c", script)
+
+        self.assertEqual("False", result.stdout.splitlines()[-1])
@@ -0,0 +1,168 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from release_tool import status
+from release_tool.status import (
+    ProjectCache,
+    RepoStatus,
+    find_repositories,
+    repository_status,
+    scan,
+)
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, create_repository, write_file
+
+
+class TestStatus(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.root = self.tmp.name
+        self.repo.create_tag("v0.1.0")
+        write_file(self.path, "file.txt", "a")
+        self.repo.index.add(["file.txt"])
+        self.repo.index.commit("Add file")
+
+    def repository_path(self) -> str:
+        return os.path.join(self.tmp.name, "group", "project")
+
+    def test_find_repositories(self) -> None:
+        create_repository(os.path.join(self.root, "other")).close()
+        create_repository(os.path.join(self.root, ".hidden")).close()
+        os.makedirs(os.path.join(self.path, "nested", ".git"))
+
+        self.assertEqual(
+            [self.path, os.path.join(self.root, "other")],
+            list(find_repositories(self.root)),
+        )
+
+    def test_repository_status(self) -> None:
+        self.assertEqual(
+            RepoStatus(self.path, "TestProj", "0.1.0", "v0.1.0", 1, False),
+            repository_status(self.path, ProjectCache()),
+        )
+
+    def test_dirty_repository(self) -> None:
+        write_file(self.path, "file.txt", "b")
+
+        self.assertTrue(repository_status(self.path, ProjectCache()).dirty)
+
+    def test_repository_without_project(self) -> None:
+        os.remove(os.path.join(self.path, "CMakeLists.txt"))
+
+        result = repository_status(self.path, ProjectCache())
+
+        self.assertIsNone(result.name)
+        self.assertEqual("v0.1.0", result.latest_tag)
+        self.assertTrue(result.dirty)
+
+    def test_worktree_uses_common_tags(self) -> None:
+        worktree = os.path.join(self.root, "worktree")
+        self.repo.git.worktree("add", "--detach", worktree, "v0.1.0")
+
+        result = repository_status(worktree, ProjectCache())
+
+        self.assertEqual("v0.1.0", result.latest_tag)
+        self.assertEqual(0, result.commits_since_tag)
+
+    def test_error_is_reported(self) -> None:
+        write_file(self.path, "CMakeLists.txt", "project(\n")
+
+        self.assertIsNotNone(repository_status(self.path, ProjectCache()).error)
+
+    def test_main_streams_json_lines(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status.main([self.root, "--no-cache"])
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(1, len(records))
+        self.assertEqual("0.1.0", records[0]["version"])
+
+
+class TestProjectCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self.tmp.name, "cache", "status.json")
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("1.2.3"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_unchanged_project_is_not_parsed(self) -> None:
+        cache = ProjectCache(self.filename)
+        self.assertEqual(("TestProj", "1.2.3"), cache.project(self.tmp.name))
+        cache.save()
+
+        with patch(
+            "release_tool.status.CMakeProject", PROJECT_CONFIG="CMakeLists.txt"
+        ) as mock_project:
+            cached = ProjectCache(self.filename).project(self.tmp.name)
+            mock_project.assert_not_called()
+        self.assertEqual(("TestProj", "1.2.3"), cached)
+
+    def test_touched_file_with_same_content_is_not_parsed(self) -> None:
+        cache = ProjectCache()
+        cache.project(self.tmp.name)
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("1.2.3"))
+        os.utime(os.path.join(self.tmp.name, "CMakeLists.txt"), ns=(1, 1))
+
+        with patch(
+            "release_tool.status.CMakeProject", PROJECT_CONFIG="CMakeLists.txt"
+        ) as mock_project:
+            cache.project(self.tmp.name)
+            mock_project.assert_not_called()
+
+    def test_changed_file_is_parsed(self) -> None:
+        cache = ProjectCache()
+        cache.project(self.tmp.name)
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("1.2.40"))
+
+        self.assertEqual(("TestProj", "1.2.40"), cache.project(self.tmp.name))
+
+
+class TestScan(unittest.TestCase):
+    def test_pending_work_is_bounded(self) -> None:
+        lock = threading.Lock()
+        counters = {"submitted": 0, "finished": 0, "max_pending": 0}
+
+        def paths():
+            for index in range(50):
+                with lock:
+                    counters["submitted"] += 1
+                    pending = counters["submitted"] - counters["finished"]
+                    counters["max_pending"] = max(counters["max_pending"], pending)
+                yield str(index)
+
+        def fake_status(path, _cache):
+            with lock:
+                counters["finished"] += 1
+            return RepoStatus(path)
+
+        with patch("release_tool.status.repository_status", fake_status):
+            results = list(scan(paths(), ProjectCache(), jobs=2))
+
+        self.assertEqual(50, len(results))
+        self.assertLessEqual(counters["max_pending"], 5)
@@ -0,0 +1,115 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from release_tool.tags import TagIndex, version_key
+
+from .git_helper import RepositoryTestCase, create_repository
+
+
+class TestVersionKey(unittest.TestCase):
+    def test_semantic_version_order(self) -> None:
+        versions = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+            "1.0.1+build.5",
+            "1.2",
+            "1.10.0",
+            "2.0.0",
+        ]
+
+        self.assertEqual(
+            versions,
+            sorted(versions[6:] + versions[:6], key=lambda v: version_key(v) or ()),
+        )
+
+    def test_invalid_version(self) -> None:
+        self.assertIsNone(version_key("release-1"))
+        self.assertIsNone(version_key("1.0.x"))
+
+
+class TestTagIndex(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for tag in ("v0.9.0", "v1.0.0-rc.1", "v1.0.0", "v1.10.0", "v1.2.0", "other"):
+            self.repo.create_tag(tag, message=tag)
+        self.repo.git.pack_refs("--all")
+        self.repo.create_tag("v2.0.0-beta")
+        self.repo.create_tag("nested/v9.9.9")
+
+    def test_reads_packed_and_loose_tags(self) -> None:
+        index = TagIndex(self.repo.git_dir)
+
+        self.assertEqual(8, len(index))
+        self.assertIn("v1.0.0", index)
+        self.assertIn("v2.0.0-beta", index)
+        self.assertIn("nested/v9.9.9", index)
+        self.assertTrue(index.has_version("1.10.0"))
+        self.assertFalse(index.has_version("1.1.0"))
+        self.assertEqual(self.repo.tags["v1.2.0"].object.hexsha, index.sha("v1.2.0"))
+
+    def test_latest_version(self) -> None:
+        index = TagIndex(self.repo.git_dir)
+
+        self.assertEqual("1.10.0", index.latest_version())
+        self.assertEqual("2.0.0-beta", index.latest_version(prereleases=True))
+        self.assertEqual("1.2.0", index.latest_version(below="1.10.0"))
+        self.assertEqual("0.9.0", index.latest_version(below="1.0.0"))
+        self.assertEqual(
+            "1.0.0-rc.1", index.latest_version(below="1.0.0", prereleases=True)
+        )
+        self.assertIsNone(index.latest_version(below="0.1.0"))
+
+    def test_cached_index_is_refreshed_on_change(self) -> None:
+        index = TagIndex.for_git_dir(self.repo.git_dir)
+        self.assertIs(index, TagIndex.for_git_dir(self.repo.git_dir))
+
+        self.repo.create_tag("v3.0.0")
+
+        refreshed = TagIndex.for_git_dir(self.repo.git_dir)
+        self.assertIsNot(index, refreshed)
+        self.assertEqual("3.0.0", refreshed.latest_version())
+
+    @patch("release_tool.tags.CACHE_SIZE", 1)
+    def test_cache_evicts_least_recently_used_index(self) -> None:
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            create_repository(tmp) as other,
+        ):
+            index = TagIndex.for_git_dir(self.repo.git_dir)
+            TagIndex.for_git_dir(other.git_dir)
+
+            self.assertIsNot(index, TagIndex.for_git_dir(self.repo.git_dir))
+
+    def test_repository_without_tags(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = create_repository(tmp)
+            index = TagIndex(os.path.join(tmp, ".git"))
+            repo.close()
+
+        self.assertEqual(0, len(index))
+        self.assertIsNone(index.latest_version())
@@ -0,0 +1,94 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from release_tool.tree_commit import TreeCommitException, commit_working_tree_files
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, write_file
+
+
+class TestCommitWorkingTreeFiles(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        write_file(self.tmp.name, "a/b/CMakeLists.txt", CMAKE_CONTENT.format("1.0"))
+        write_file(self.tmp.name, "a/other.txt", "other")
+        write_file(self.tmp.name, "z.sh", "#!/bin/sh\n")
+        os.chmod(os.path.join(self.tmp.name, "z.sh"), 0o755)
+        self.repo.git.add(".")
+        self.repo.git.commit("-m", "Add files")
+
+    def test_commits_only_given_files(self) -> None:
+        parent = self.repo.head.commit
+        write_file(self.tmp.name, "a/b/CMakeLists.txt", CMAKE_CONTENT.format("2.0"))
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("2.0"))
+        write_file(self.tmp.name, "a/other.txt", "not committed")
+
+        commit = commit_working_tree_files(
+            self.repo, ["a/b/CMakeLists.txt", "CMakeLists.txt"], "Release v2.0"
+        )
+
+        self.assertEqual(commit, self.repo.head.commit)
+        self.assertEqual([parent], commit.parents)
+        self.assertEqual("Release v2.0", commit.message)
+        self.assertEqual(
+            {"CMakeLists.txt", "a/b/CMakeLists.txt"},
+            set(self.repo.git.diff("--name-only", parent, commit).splitlines()),
+        )
+        self.assertEqual(
+            CMAKE_CONTENT.format("2.0"),
+            self.repo.git.show(f"{commit.hexsha}:a/b/CMakeLists.txt") + "\n",
+        )
+        self.assertEqual(" M a/other.txt", self.repo.git.status("--porcelain"))
+
+    def test_tree_matches_git_and_keeps_modes(self) -> None:
+        write_file(self.tmp.name, "z.sh", "#!/bin/sh\nexit 0\n")
+
+        commit = commit_working_tree_files(self.repo, ["z.sh"], "Update")
+
+        self.repo.git.read_tree(commit.hexsha)
+        self.assertEqual(commit.tree.hexsha, self.repo.git.write_tree())
+        self.assertTrue(
+            self.repo.git.ls_tree(commit.hexsha, "z.sh").startswith("100755")
+        )
+        self.assertEqual("", self.repo.git.status("--porcelain"))
+
+    def test_adds_new_files(self) -> None:
+        write_file(self.tmp.name, "CHANGELOG.md", "## v2.0\n")
+
+        commit = commit_working_tree_files(self.repo, ["CHANGELOG.md"], "Release")
+
+        self.assertEqual("## v2.0", self.repo.git.show(f"{commit.hexsha}:CHANGELOG.md"))
+        self.assertEqual("", self.repo.git.status("--porcelain"))
+
+    def test_applies_git_filters(self) -> None:
+        with self.repo.config_writer() as config:
+            config.set_value("core", "autocrlf", "true")
+        write_file(self.tmp.name, "a/other.txt", "line\r\n")
+
+        commit = commit_working_tree_files(self.repo, ["a/other.txt"], "Update")
+
+        tree = self.repo.commit(commit.hexsha).tree
+        self.assertEqual(b"line\n", tree["a/other.txt"].data_stream.read())
+        self.assertEqual("", self.repo.git.status("--porcelain"))
+
+    def test_git_failure_raises_release_exception(self) -> None:
+        head = self.repo.head.commit
+
+        with self.assertRaises(TreeCommitException):
+            commit_working_tree_files(self.repo, ["missing.txt"], "Update")
+        self.assertEqual(head, self.repo.head.commit)
@@ -0,0 +1,125 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest.mock import patch
+
+from release_tool.cmake import CMakeProject
+from release_tool.release_cycle import (
+    CommitAndTagStep,
+    ReleaseCycle,
+    SetNextVersion,
+    UpdateVersionStep,
+)
+from release_tool.version_files import DEFAULT_HANDLERS, VersionFiles
+
+from .git_helper import CMAKE_CONTENT, RepositoryTestCase, write_file
+
+VERSION_FILES = {
+    "vcpkg.json": '{{\n  "name": "test",\n  "version-semver": "{}"\n}}\n',
+    "conanfile.py": 'class Test:\n    name = "test"\n    version = "{}"\n',
+    "include/version.h.in": '#define TEST_VERSION "{}"\n#define TEST_NAME "x"\n',
+    "docs/Doxyfile": 'PROJECT_NAME = "test"\nPROJECT_NUMBER = {}\n',
+    "lib/CMakeLists.txt": CMAKE_CONTENT,
+}
+
+
+def _read(path: str, filename: str) -> str:
+    with open(os.path.join(path, filename), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+class TestVersionFiles(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for filename, content in VERSION_FILES.items():
+            write_file(self.path, filename, content.format("0.1.0"))
+        write_file(self.path, "other/vcpkg.json", '{"version": "0.1.01"}')
+        write_file(self.path, "third_party/conanfile.py", 'version = "7.0"\n')
+        self.repo.git.add(".")
+        self.repo.git.commit("-m", "Add version files")
+        write_file(self.path, "build/vcpkg.json", '{"version": "0.1.0"}')
+        self.proj = CMakeProject(self.path)
+
+    def test_handlers_have_unique_names(self) -> None:
+        names = [handler.name for handler in DEFAULT_HANDLERS]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_finds_tracked_files_with_current_version(self) -> None:
+        self.assertEqual(
+            sorted(VERSION_FILES),
+            VersionFiles().find(self.proj, self.repo, "0.1.0"),
+        )
+
+    def test_update_rewrites_all_sites(self) -> None:
+        updated = VersionFiles().update(self.proj, self.repo, "0.1.0", "0.2.0")
+
+        self.assertEqual(sorted(VERSION_FILES), updated)
+        for filename, content in VERSION_FILES.items():
+            with self.subTest(filename=filename):
+                self.assertEqual(content.format("0.2.0"), _read(self.path, filename))
+        self.assertEqual('{"version": "0.1.01"}', _read(self.path, "other/vcpkg.json"))
+
+    def test_index_is_reused(self) -> None:
+        VersionFiles().find(self.proj, self.repo, "0.1.0")
+
+        with patch("release_tool.version_files._tracked_files") as mock_tracked:
+            self.assertEqual(
+                sorted(VERSION_FILES),
+                VersionFiles().find(self.proj, self.repo, "0.1.0"),
+            )
+            mock_tracked.assert_not_called()
+
+    def test_index_follows_update(self) -> None:
+        VersionFiles().update(self.proj, self.repo, "0.1.0", "0.2.0")
+
+        with patch("release_tool.version_files._tracked_files") as mock_tracked:
+            VersionFiles().find(self.proj, self.repo, "0.2.0")
+            mock_tracked.assert_not_called()
+
+    def test_modified_file_invalidates_index(self) -> None:
+        VersionFiles().find(self.proj, self.repo, "0.1.0")
+        write_file(self.path, "conanfile.py", 'version = "0.0.9"\n')
+
+        self.assertNotIn(
+            "conanfile.py", VersionFiles().find(self.proj, self.repo, "0.1.0")
+        )
+
+    def test_newly_tracked_file_invalidates_index(self) -> None:
+        VersionFiles().find(self.proj, self.repo, "0.1.0")
+        self.repo.git.add("build/vcpkg.json")
+
+        self.assertIn(
+            "build/vcpkg.json", VersionFiles().find(self.proj, self.repo, "0.1.0")
+        )
+
+    def test_release_commits_all_sites_together(self) -> None:
+        version_files = VersionFiles()
+        steps = [
+            UpdateVersionStep(version_files),
+            CommitAndTagStep(version_files=version_files),
+            SetNextVersion("0.3.0", version_files=version_files),
+        ]
+
+        ReleaseCycle(self.proj, self.repo, steps).create_release("0.2.0")
+
+        self.assertFalse(self.repo.is_dirty())
+        release = self.repo.tags["v0.2.0"].commit
+        self.assertEqual(
+            sorted(["CMakeLists.txt", *VERSION_FILES]), sorted(release.stats.files)
+        )
+        self.assertIn('"0.3.0"', _read(self.path, "vcpkg.json"))
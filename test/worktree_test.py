@@ -0,0 +1,118 @@
+# release-tool - Tool to create project releases
+#
+# Copyright (C) 2019-2026  offa
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from release_tool.worktree import (
+    CleanSnapshot,
+    FileOverlay,
+    atomic_write,
+    is_dirty,
+    overlay,
+    read_file,
+    replace_file,
+)
+
+from .git_helper import (
+    CMAKE_CONTENT,
+    RepositoryTestCase,
+    commit_file,
+    write_file,
+)
+
+
+class TestIsDirty(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        commit_file(self.repo, "sub/file.txt", "a", "Add file")
+
+    def test_clean_repository(self) -> None:
+        self.assertFalse(is_dirty(self.repo, ["CMakeLists.txt", "sub"]))
+
+    def test_changes_outside_paths_are_ignored(self) -> None:
+        write_file(self.tmp.name, "sub/file.txt", "b")
+
+        self.assertFalse(is_dirty(self.repo, ["CMakeLists.txt"]))
+        self.assertTrue(is_dirty(self.repo, ["sub"]))
+
+    def test_staged_changes_are_dirty(self) -> None:
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("0.2.0"))
+        self.repo.git.add("CMakeLists.txt")
+
+        self.assertTrue(is_dirty(self.repo, ["CMakeLists.txt"]))
+
+
+class TestCleanSnapshot(RepositoryTestCase):
+    def test_unchanged_files_skip_git(self) -> None:
+        self.assertTrue(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+
+        with patch("release_tool.worktree.is_dirty") as mock_is_dirty:
+            self.assertTrue(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+            mock_is_dirty.assert_not_called()
+
+    def test_modified_file_is_checked_again(self) -> None:
+        self.assertTrue(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("0.10.0"))
+
+        self.assertFalse(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+
+    def test_dirty_state_is_not_cached(self) -> None:
+        write_file(self.tmp.name, "CMakeLists.txt", CMAKE_CONTENT.format("0.10.0"))
+
+        self.assertFalse(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.repo.git_dir, "release-tool", CleanSnapshot.FILENAME)
+            )
+        )
+
+    def test_snapshot_is_not_saved_in_overlay(self) -> None:
+        with overlay(FileOverlay()):
+            self.assertTrue(CleanSnapshot(self.repo).is_clean(["CMakeLists.txt"]))
+
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.repo.git_dir, "release-tool", CleanSnapshot.FILENAME)
+            )
+        )
+
+
+class TestFileOverlay(unittest.TestCase):
+    def test_writes_stay_in_memory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "file.txt")
+            write_file(tmp, "file.txt", "disk")
+
+            with overlay(FileOverlay()) as files:
+                replace_file(filename, "replaced")
+                self.assertEqual(read_file(filename), "replaced")
+                with atomic_write(os.path.join(tmp, "new.txt")) as out:
+                    out.write("new\r\n")
+
+            self.assertEqual(read_file(filename), "disk")
+            self.assertEqual(sorted(os.listdir(tmp)), ["file.txt"])
+            self.assertEqual(
+                files.files,
+                {
+                    os.path.realpath(filename): "replaced",
+                    os.path.realpath(os.path.join(tmp, "new.txt")): "new\r\n",
+                },
+            )